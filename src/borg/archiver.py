@@ -10,7 +10,6 @@
     import faulthandler
     import functools
     import hashlib
-    import inspect
     import itertools
     import json
     import logging
@@ -21,13 +20,13 @@
     import signal
     import stat
     import subprocess
-    import tarfile
     import textwrap
     import time
     from binascii import unhexlify, hexlify
     from contextlib import contextmanager
     from datetime import datetime, timedelta
     from io import TextIOWrapper
+    from operator import itemgetter
 
     from .logger import create_logger, setup_logging
 
@@ -46,7 +45,6 @@
     from .compress import CompressionSpec
     from .crypto.key import key_creator, key_argument_names, tam_required_file, tam_required
     from .crypto.key import RepoKey, KeyfileKey, Blake2RepoKey, Blake2KeyfileKey
-    from .crypto.keymanager import KeyManager
     from .helpers import EXIT_SUCCESS, EXIT_WARNING, EXIT_ERROR, EXIT_SIGNAL_BASE
     from .helpers import Error, NoManifestError, set_ec
     from .helpers import positive_int_validator, location_validator, archivename_validator, ChunkerParams, Location
@@ -85,8 +83,6 @@
     from .platform import uid2user, gid2group
     from .remote import RepositoryServer, RemoteRepository, cache_if_remote
     from .repository import Repository, LIST_SCAN_LIMIT, TAG_PUT, TAG_DELETE, TAG_COMMIT
-    from .selftest import selftest
-    from .upgrader import AtticRepositoryUpgrader, BorgRepositoryUpgrader
 except BaseException:
     # an unhandled exception in the try-block would cause the borg cli command to exit with rc 1 due to python's
     # default behavior, see issue #4424.
@@ -207,6 +203,41 @@ def parse_storage_quota(storage_quota):
     return parsed
 
 
+# You can use :ref:`xyz` in the following usage pages. However, for plain-text view,
+# e.g. through "borg ... --help", define a substitution for the reference here.
+# It will replace the entire :ref:`foo` verbatim.
+rst_plain_text_references = {
+    'a_status_oddity': '"I am seeing ‘A’ (added) status for a unchanged file!?"',
+    'separate_compaction': '"Separate compaction"',
+    'list_item_flags': '"Item flags"',
+    'borg_patterns': '"borg help patterns"',
+    'borg_placeholders': '"borg help placeholders"',
+    'key_files': 'Internals -> Data structures and file formats -> Key files',
+    'borg_key_export': 'borg key export --help',
+}
+
+
+def process_epilog(epilog):
+    try:
+        mode = borg.doc_mode
+    except AttributeError:
+        mode = 'command-line'
+    return _process_epilog(epilog, mode)
+
+
+@functools.lru_cache(maxsize=None)
+def _process_epilog(epilog, mode):
+    # the epilogs are constants, so they only need to be processed once per process (and doc mode),
+    # no matter how often the parser gets built.
+    epilog = epilog.splitlines()
+    if mode in ('command-line', 'build_usage'):
+        epilog = [line for line in epilog if not line.startswith('.. man')]
+    epilog = '\n'.join(epilog)
+    if mode == 'command-line':
+        epilog = rst_to_terminal(epilog, rst_plain_text_references)
+    return epilog
+
+
 def get_func(args):
     # This works around https://bugs.python.org/issue9351
     # func is used at the leaf parsers of the argparse parser tree,
@@ -227,6 +258,1189 @@ def __call__(self, parser, namespace, values, option_string=None):
         setattr(namespace, self.dest, values)
 
 
+class LazySubParsersAction(argparse._SubParsersAction):
+    """
+    subparsers action that only builds the parser of a subcommand when it is needed
+
+    Only one subcommand is run per invocation, so building the parsers (and adding
+    the arguments) of all other subcommands is wasted time. A subcommand is registered
+    via lazy_parser, which takes the same arguments as add_parser and decorates the
+    function defining the arguments of the subcommand parser. The parser gets built
+    when it is looked up, e.g. for parsing or when displaying its help.
+    """
+
+    class DeferredParser:
+        """stands in for a subcommand parser until it is looked up"""
+
+        def __init__(self, parser_class, define_parser, kwargs):
+            self.parser_class = parser_class
+            self.define_parser = define_parser
+            self.kwargs = kwargs
+
+        def build(self):
+            parser = self.parser_class(**self.kwargs)
+            self.define_parser(parser)
+            return parser
+
+    class ParserMap(dict):
+        """maps subcommand names (and aliases) to parsers, building deferred parsers on lookup"""
+
+        def __getitem__(self, name):
+            parser = super().__getitem__(name)
+            if isinstance(parser, LazySubParsersAction.DeferredParser):
+                deferred, parser = parser, parser.build()
+                for key in [key for key, value in super().items() if value is deferred]:
+                    self[key] = parser
+            return parser
+
+        def get(self, name, default=None):
+            return self[name] if name in self else default
+
+        def values(self):
+            return [self[name] for name in self]
+
+        def items(self):
+            return [(name, self[name]) for name in self]
+
+    def __init__(self, *args, parser_class, **kwargs):
+        def make_parser(define_parser=None, **kwargs):
+            if define_parser is None:
+                return parser_class(**kwargs)
+            return self.DeferredParser(parser_class, define_parser, kwargs)
+
+        super().__init__(*args, parser_class=make_parser, **kwargs)
+        self._name_parser_map = self.choices = self.ParserMap()
+
+    def lazy_parser(self, name, func=None, **kwargs):
+        """
+        Register subcommand *name*, *kwargs* are passed to add_parser.
+
+        If *func* is given, it is set as the func default of the parser (the command
+        to run) and its docstring is the default description.
+        """
+        if func is not None:
+            kwargs.setdefault('description', func.__doc__)
+
+        def decorator(define_parser):
+            def define(parser):
+                if func is not None:
+                    parser.set_defaults(func=func)
+                define_parser(parser)
+
+            # add_parser only rejects conflicting names since python 3.11
+            for choice in (name, *kwargs.get('aliases', ())):
+                if choice in self.choices:
+                    raise argparse.ArgumentError(self, 'conflicting subparser: %s' % choice)
+            # add_parser takes care of prog, aliases and the help of the choice,
+            # it just gets a DeferredParser instead of the parser.
+            self.add_parser(name, define_parser=define, **kwargs)
+            return define_parser
+        return decorator
+
+
+SORT_BY_DEFAULT = 'timestamp'
+SORT_BY_HELP = ('Comma-separated list of sorting keys; valid keys are: {}; default is: {}'
+                .format(', '.join(AI_HUMAN_SORT_KEYS), SORT_BY_DEFAULT))
+
+
+# epilogs of the borg commands, see Archiver.build_parser()
+
+MOUNT_EPILOG = """
+This command mounts an archive as a FUSE filesystem. This can be useful for
+browsing an archive or restoring individual files. Unless the ``--foreground``
+option is given the command will run in the background until the filesystem
+is ``umounted``.
+
+The command ``borgfs`` provides a wrapper for ``borg mount``. This can also be
+used in fstab entries:
+``/path/to/repo /mnt/point fuse.borgfs defaults,noauto 0 0``
+
+To allow a regular user to use fstab entries, add the ``user`` option:
+``/path/to/repo /mnt/point fuse.borgfs defaults,noauto,user 0 0``
+
+For FUSE configuration and mount options, see the mount.fuse(8) manual page.
+
+Borg's default behavior is to use the archived user and group names of each
+file and map them to the system's respective user and group ids.
+Alternatively, using ``numeric-ids`` will instead use the archived user and
+group ids without any mapping.
+
+The ``uid`` and ``gid`` mount options (implemented by Borg) can be used to
+override the user and group ids of all files (i.e., ``borg mount -o
+uid=1000,gid=1000``).
+
+The man page references ``user_id`` and ``group_id`` mount options
+(implemented by fuse) which specify the user and group id of the mount owner
+(aka, the user who does the mounting). It is set automatically by libfuse (or
+the filesystem if libfuse is not used). However, you should not specify these
+manually. Unlike the ``uid`` and ``gid`` mount options which affect all files,
+``user_id`` and ``group_id`` affect the user and group id of the mounted
+(base) directory.
+
+Additional mount options supported by borg:
+
+- versions: when used with a repository mount, this gives a merged, versioned
+  view of the files in the archives. EXPERIMENTAL, layout may change in future.
+- allow_damaged_files: by default damaged files (where missing chunks were
+  replaced with runs of zeros by borg check ``--repair``) are not readable and
+  return EIO (I/O error). Set this option to read such files.
+- ignore_permissions: for security reasons the "default_permissions" mount
+  option is internally enforced by borg. "ignore_permissions" can be given to
+  not enforce "default_permissions".
+
+The BORG_MOUNT_DATA_CACHE_ENTRIES environment variable is meant for advanced users
+to tweak the performance. It sets the number of cached data chunks; additional
+memory usage can be up to ~8 MiB times this number. The default is the number
+of CPU cores.
+
+When the daemonized process receives a signal or crashes, it does not unmount.
+Unmounting in these cases could cause an active rsync or similar process
+to unintentionally delete data.
+
+When running in the foreground ^C/SIGINT unmounts cleanly, but other
+signals or crashes do not.
+"""
+
+BENCHMARK_EPILOG = "These commands do various benchmarks."
+
+BENCHMARK_CRUD_EPILOG = """
+This command benchmarks borg CRUD (create, read, update, delete) operations.
+
+It creates input data below the given PATH and backups this data into the given REPO.
+The REPO must already exist (it could be a fresh empty repo or an existing repo, the
+command will create / read / update / delete some archives named borg-benchmark-crud\\* there.
+
+Make sure you have free space there, you'll need about 1GB each (+ overhead).
+
+If your repository is encrypted and borg needs a passphrase to unlock the key, use::
+
+    BORG_PASSPHRASE=mysecret borg benchmark crud REPO PATH
+
+Measurements are done with different input file sizes and counts.
+The file contents are very artificial (either all zero or all random),
+thus the measurement results do not necessarily reflect performance with real data.
+Also, due to the kind of content used, no compression is used in these benchmarks.
+
+C- == borg create (1st archive creation, no compression, do not use files cache)
+      C-Z- == all-zero files. full dedup, this is primarily measuring reader/chunker/hasher.
+      C-R- == random files. no dedup, measuring throughput through all processing stages.
+
+R- == borg extract (extract archive, dry-run, do everything, but do not write files to disk)
+      R-Z- == all zero files. Measuring heavily duplicated files.
+      R-R- == random files. No duplication here, measuring throughput through all processing
+      stages, except writing to disk.
+
+U- == borg create (2nd archive creation of unchanged input files, measure files cache speed)
+      The throughput value is kind of virtual here, it does not actually read the file.
+      U-Z- == needs to check the 2 all-zero chunks' existence in the repo.
+      U-R- == needs to check existence of a lot of different chunks in the repo.
+
+D- == borg delete archive (delete last remaining archive, measure deletion + compaction)
+      D-Z- == few chunks to delete / few segments to compact/remove.
+      D-R- == many chunks to delete / many segments to compact/remove.
+
+Please note that there might be quite some variance in these measurements.
+Try multiple measurements and having a otherwise idle machine (and network, if you use it).
+"""
+
+BENCHMARK_CPU_EPILOG = """
+This command benchmarks misc. CPU bound borg operations.
+
+It creates input data in memory, runs the operation and then displays throughput.
+To reduce outside influence on the timings, please make sure to run this with:
+- an otherwise as idle as possible machine
+- enough free memory so there will be no slow down due to paging activity
+"""
+
+BREAK_LOCK_EPILOG = """
+This command breaks the repository and cache locks.
+Please use carefully and only while no borg process (on any machine) is
+trying to access the Cache or the Repository.
+"""
+
+CHECK_EPILOG = """
+The check command verifies the consistency of a repository and the corresponding archives.
+
+check --repair is a potentially dangerous function and might lead to data loss
+(for kinds of corruption it is not capable of dealing with). BE VERY CAREFUL!
+
+Pursuant to the previous warning it is also highly recommended to test the
+reliability of the hardware running this software with stress testing software
+such as memory testers. Unreliable hardware can also lead to data loss especially
+when this command is run in repair mode.
+
+First, the underlying repository data files are checked:
+
+- For all segments, the segment magic header is checked.
+- For all objects stored in the segments, all metadata (e.g. CRC and size) and
+  all data is read. The read data is checked by size and CRC. Bit rot and other
+  types of accidental damage can be detected this way.
+- In repair mode, if an integrity error is detected in a segment, try to recover
+  as many objects from the segment as possible.
+- In repair mode, make sure that the index is consistent with the data stored in
+  the segments.
+- If checking a remote repo via ``ssh:``, the repo check is executed on the server
+  without causing significant network traffic.
+- The repository check can be skipped using the ``--archives-only`` option.
+- A repository check can be time consuming. Partial checks are possible with the
+  ``--max-duration`` option.
+
+Second, the consistency and correctness of the archive metadata is verified:
+
+- Is the repo manifest present? If not, it is rebuilt from archive metadata
+  chunks (this requires reading and decrypting of all metadata and data).
+- Check if archive metadata chunk is present; if not, remove archive from manifest.
+- For all files (items) in the archive, for all chunks referenced by these
+  files, check if chunk is present. In repair mode, if a chunk is not present,
+  replace it with a same-size replacement chunk of zeroes. If a previously lost
+  chunk reappears (e.g. via a later backup), in repair mode the all-zero replacement
+  chunk will be replaced by the correct chunk. This requires reading of archive and
+  file metadata, but not data.
+- In repair mode, when all the archives were checked, orphaned chunks are deleted
+  from the repo. One cause of orphaned chunks are input file related errors (like
+  read errors) in the archive creation process.
+- In verify-data mode, a complete cryptographic verification of the archive data
+  integrity is performed. This conflicts with ``--repository-only`` as this mode
+  only makes sense if the archive checks are enabled. The full details of this mode
+  are documented below.
+- If checking a remote repo via ``ssh:``, the archive check is executed on the
+  client machine because it requires decryption, and this is always done client-side
+  as key access is needed.
+- The archive checks can be time consuming; they can be skipped using the
+  ``--repository-only`` option.
+
+The ``--max-duration`` option can be used to split a long-running repository check
+into multiple partial checks. After the given number of seconds the check is
+interrupted. The next partial check will continue where the previous one stopped,
+until the complete repository has been checked. Example: Assuming a full check took 7
+hours, then running a daily check with --max-duration=3600 (1 hour) resulted in one
+full check per week.
+
+Attention: Partial checks can only do way less checking than a full check (only the
+CRC32 checks on segment file entries are done), and cannot be combined with the
+``--repair`` option. Partial checks may therefore be useful only with very large
+repositories where a full check took too long. Doing a full repository check aborts a
+partial check; the next partial check will restart from the beginning.
+
+The ``--verify-data`` option will perform a full integrity verification (as opposed to
+checking the CRC32 of the segment) of data, which means reading the data from the
+repository, decrypting and decompressing it. This is a cryptographic verification,
+which will detect (accidental) corruption. For encrypted repositories it is
+tamper-resistant as well, unless the attacker has access to the keys. It is also very
+slow.
+"""
+
+COMPACT_EPILOG = """
+This command frees repository space by compacting segments.
+
+Use this regularly to avoid running out of space - you do not need to use this
+after each borg command though. It is especially useful after deleting archives,
+because only compaction will really free repository space.
+
+borg compact does not need a key, so it is possible to invoke it from the
+client or also from the server.
+
+Depending on the amount of segments that need compaction, it may take a while,
+so consider using the ``--progress`` option.
+
+A segment is compacted if the amount of saved space is above the percentage value
+given by the ``--threshold`` option. If omitted, a threshold of 10% is used.
+When using ``--verbose``, borg will output an estimate of the freed space.
+
+After upgrading borg (server) to 1.2+, you can use ``borg compact --cleanup-commits``
+to clean up the numerous 17byte commit-only segments that borg 1.1 did not clean up
+due to a bug. It is enough to do that once per repository.
+
+See :ref:`separate_compaction` in Additional Notes for more details.
+"""
+
+CONFIG_EPILOG = """
+This command gets and sets options in a local repository or cache config file.
+For security reasons, this command only works on local repositories.
+
+To delete a config value entirely, use ``--delete``. To list the values
+of the configuration file or the default values, use ``--list``.  To get and existing
+key, pass only the key name. To set a key, pass both the key name and
+the new value. Keys can be specified in the format "section.name" or
+simply "name"; the section will default to "repository" and "cache" for
+the repo and cache configs, respectively.
+
+
+By default, borg config manipulates the repository config file. Using ``--cache``
+edits the repository cache's config file instead.
+"""
+
+CREATE_EPILOG = """
+This command creates a backup archive containing all files found while recursively
+traversing all paths specified. Paths are added to the archive as they are given,
+that means if relative paths are desired, the command has to be run from the correct
+directory.
+
+When giving '-' as path, borg will read data from standard input and create a
+file 'stdin' in the created archive from that data. In some cases it's more
+appropriate to use --content-from-command, however. See section *Reading from
+stdin* below for details.
+
+The archive will consume almost no disk space for files or parts of files that
+have already been stored in other archives.
+
+The archive name needs to be unique. It must not end in '.checkpoint' or
+'.checkpoint.N' (with N being a number), because these names are used for
+checkpoints and treated in special ways.
+
+In the archive name, you may use the following placeholders:
+{now}, {utcnow}, {fqdn}, {hostname}, {user} and some others.
+
+Backup speed is increased by not reprocessing files that are already part of
+existing archives and weren't modified. The detection of unmodified files is
+done by comparing multiple file metadata values with previous values kept in
+the files cache.
+
+This comparison can operate in different modes as given by ``--files-cache``:
+
+- ctime,size,inode (default)
+- mtime,size,inode (default behaviour of borg versions older than 1.1.0rc4)
+- ctime,size (ignore the inode number)
+- mtime,size (ignore the inode number)
+- rechunk,ctime (all files are considered modified - rechunk, cache ctime)
+- rechunk,mtime (all files are considered modified - rechunk, cache mtime)
+- disabled (disable the files cache, all files considered modified - rechunk)
+
+inode number: better safety, but often unstable on network filesystems
+
+Normally, detecting file modifications will take inode information into
+consideration to improve the reliability of file change detection.
+This is problematic for files located on sshfs and similar network file
+systems which do not provide stable inode numbers, such files will always
+be considered modified. You can use modes without `inode` in this case to
+improve performance, but reliability of change detection might be reduced.
+
+ctime vs. mtime: safety vs. speed
+
+- ctime is a rather safe way to detect changes to a file (metadata and contents)
+  as it can not be set from userspace. But, a metadata-only change will already
+  update the ctime, so there might be some unnecessary chunking/hashing even
+  without content changes. Some filesystems do not support ctime (change time).
+  E.g. doing a chown or chmod to a file will change its ctime.
+- mtime usually works and only updates if file contents were changed. But mtime
+  can be arbitrarily set from userspace, e.g. to set mtime back to the same value
+  it had before a content change happened. This can be used maliciously as well as
+  well-meant, but in both cases mtime based cache modes can be problematic.
+
+The mount points of filesystems or filesystem snapshots should be the same for every
+creation of a new archive to ensure fast operation. This is because the file cache that
+is used to determine changed files quickly uses absolute filenames.
+If this is not possible, consider creating a bind mount to a stable location.
+
+The ``--progress`` option shows (from left to right) Original, Compressed and Deduplicated
+(O, C and D, respectively), then the Number of files (N) processed so far, followed by
+the currently processed path.
+
+When using ``--stats``, you will get some statistics about how much data was
+added - the "This Archive" deduplicated size there is most interesting as that is
+how much your repository will grow. Please note that the "All archives" stats refer to
+the state after creation. Also, the ``--stats`` and ``--dry-run`` options are mutually
+exclusive because the data is not actually compressed and deduplicated during a dry run.
+
+For more help on include/exclude patterns, see the :ref:`borg_patterns` command output.
+
+For more help on placeholders, see the :ref:`borg_placeholders` command output.
+
+.. man NOTES
+
+The ``--exclude`` patterns are not like tar. In tar ``--exclude`` .bundler/gems will
+exclude foo/.bundler/gems. In borg it will not, you need to use ``--exclude``
+'\\*/.bundler/gems' to get the same effect.
+
+In addition to using ``--exclude`` patterns, it is possible to use
+``--exclude-if-present`` to specify the name of a filesystem object (e.g. a file
+or folder name) which, when contained within another folder, will prevent the
+containing folder from being backed up.  By default, the containing folder and
+all of its contents will be omitted from the backup.  If, however, you wish to
+only include the objects specified by ``--exclude-if-present`` in your backup,
+and not include any other contents of the containing folder, this can be enabled
+through using the ``--keep-exclude-tags`` option.
+
+The ``-x`` or ``--one-file-system`` option excludes directories, that are mountpoints (and everything in them).
+It detects mountpoints by comparing the device number from the output of ``stat()`` of the directory and its
+parent directory. Specifically, it excludes directories for which ``stat()`` reports a device number different
+from the device number of their parent. Be aware that in Linux (and possibly elsewhere) there are directories
+with device number different from their parent, which the kernel does not consider a mountpoint and also the
+other way around. Examples are bind mounts (possibly same device number, but always a mountpoint) and ALL
+subvolumes of a btrfs (different device number from parent but not necessarily a mountpoint). Therefore when
+using ``--one-file-system``, one should make doubly sure that the backup works as intended especially when using
+btrfs. This is even more important, if the btrfs layout was created by someone else, e.g. a distribution
+installer.
+
+
+.. _list_item_flags:
+
+Item flags
+++++++++++
+
+``--list`` outputs a list of all files, directories and other
+file system items it considered (no matter whether they had content changes
+or not). For each item, it prefixes a single-letter flag that indicates type
+and/or status of the item.
+
+If you are interested only in a subset of that output, you can give e.g.
+``--filter=AME`` and it will only show regular files with A, M or E status (see
+below).
+
+A uppercase character represents the status of a regular file relative to the
+"files" cache (not relative to the repo -- this is an issue if the files cache
+is not used). Metadata is stored in any case and for 'A' and 'M' also new data
+chunks are stored. For 'U' all data chunks refer to already existing chunks.
+
+- 'A' = regular file, added (see also :ref:`a_status_oddity` in the FAQ)
+- 'M' = regular file, modified
+- 'U' = regular file, unchanged
+- 'C' = regular file, it changed while we backed it up
+- 'E' = regular file, an error happened while accessing/reading *this* file
+
+A lowercase character means a file type other than a regular file,
+borg usually just stores their metadata:
+
+- 'd' = directory
+- 'b' = block device
+- 'c' = char device
+- 'h' = regular file, hardlink (to already seen inodes)
+- 's' = symlink
+- 'f' = fifo
+
+Other flags used include:
+
+- 'i' = backup data was read from standard input (stdin)
+- '-' = dry run, item was *not* backed up
+- 'x' = excluded, item was *not* backed up
+- '?' = missing status code (if you see this, please file a bug report!)
+
+Reading from stdin
+++++++++++++++++++
+
+There are two methods to read from stdin. Either specify ``-`` as path and
+pipe directly to borg::
+
+    backup-vm --id myvm --stdout | borg create REPO::ARCHIVE -
+
+Or use ``--content-from-command`` to have Borg manage the execution of the
+command and piping. If you do so, the first PATH argument is interpreted
+as command to execute and any further arguments are treated as arguments
+to the command::
+
+    borg create --content-from-command REPO::ARCHIVE -- backup-vm --id myvm --stdout
+
+``--`` is used to ensure ``--id`` and ``--stdout`` are **not** considered
+arguments to ``borg`` but rather ``backup-vm``.
+
+The difference between the two approaches is that piping to borg creates an
+archive even if the command piping to borg exits with a failure. In this case,
+**one can end up with truncated output being backed up**. Using
+``--content-from-command``, in contrast, borg is guaranteed to fail without
+creating an archive should the command fail. The command is considered failed
+when it returned a non-zero exit code.
+
+Reading from stdin yields just a stream of data without file metadata
+associated with it, and the files cache is not needed at all. So it is
+safe to disable it via ``--files-cache disabled`` and speed up backup
+creation a bit.
+
+By default, the content read from stdin is stored in a file called 'stdin'.
+Use ``--stdin-name`` to change the name.
+"""
+
+DEBUG_EPILOG = """
+These commands are not intended for normal use and potentially very
+dangerous if used incorrectly.
+
+They exist to improve debugging capabilities without direct system access, e.g.
+in case you ever run into some severe malfunction. Use them only if you know
+what you are doing or if a trusted developer tells you what to do."""
+
+DEBUG_INFO_EPILOG = """
+This command displays some system information that might be useful for bug
+reports and debugging problems. If a traceback happens, this information is
+already appended at the end of the traceback.
+"""
+
+DEBUG_DUMP_ARCHIVE_ITEMS_EPILOG = """
+This command dumps raw (but decrypted and decompressed) archive items (only metadata) to files.
+"""
+
+DEBUG_DUMP_ARCHIVE_EPILOG = """
+This command dumps all metadata of an archive in a decoded form to a file.
+"""
+
+DEBUG_DUMP_MANIFEST_EPILOG = """
+This command dumps manifest metadata of a repository in a decoded form to a file.
+"""
+
+DEBUG_DUMP_REPO_OBJS_EPILOG = """
+This command dumps raw (but decrypted and decompressed) repo objects to files.
+"""
+
+DEBUG_SEARCH_REPO_OBJS_EPILOG = """
+This command searches raw (but decrypted and decompressed) repo objects for a specific bytes sequence.
+"""
+
+DEBUG_GET_OBJ_EPILOG = """
+This command gets an object from the repository.
+"""
+
+DEBUG_PUT_OBJ_EPILOG = """
+This command puts objects into the repository.
+"""
+
+DEBUG_DELETE_OBJ_EPILOG = """
+This command deletes objects from the repository.
+"""
+
+DEBUG_REFCOUNT_OBJ_EPILOG = """
+This command displays the reference count for objects from the repository.
+"""
+
+DEBUG_DUMP_HINTS_EPILOG = """
+This command dumps the repository hints data.
+"""
+
+DEBUG_CONVERT_PROFILE_EPILOG = """
+Convert a Borg profile to a Python cProfile compatible profile.
+"""
+
+DELETE_EPILOG = """
+This command deletes an archive from the repository or the complete repository.
+
+Important: When deleting archives, repository disk space is **not** freed until
+you run ``borg compact``.
+
+When you delete a complete repository, the security info and local cache for it
+(if any) are also deleted. Alternatively, you can delete just the local cache
+with the ``--cache-only`` option, or keep the security info with the
+``--keep-security-info`` option.
+
+When in doubt, use ``--dry-run --list`` to see what would be deleted.
+
+When using ``--stats``, you will get some statistics about how much data was
+deleted - the "Deleted data" deduplicated size there is most interesting as
+that is how much your repository will shrink.
+Please note that the "All archives" stats refer to the state after deletion.
+
+You can delete multiple archives by specifying their common prefix, if they
+have one, using the ``--prefix PREFIX`` option. You can also specify a shell
+pattern to match multiple archives using the ``--glob-archives GLOB`` option
+(for more info on these patterns, see :ref:`borg_patterns`). Note that these
+two options are mutually exclusive.
+
+To avoid accidentally deleting archives, especially when using glob patterns,
+it might be helpful to use the ``--dry-run`` to test out the command without
+actually making any changes to the repository.
+"""
+
+DIFF_EPILOG = """
+This command finds differences (file contents, user/group/mode) between archives.
+
+A repository location and an archive name must be specified for REPO::ARCHIVE1.
+ARCHIVE2 is just another archive name in same repository (no repository location
+allowed).
+
+For archives created with Borg 1.1 or newer diff automatically detects whether
+the archives are created with the same chunker params. If so, only chunk IDs
+are compared, which is very fast.
+
+For archives prior to Borg 1.1 chunk contents are compared by default.
+If you did not create the archives with different chunker params,
+pass ``--same-chunker-params``.
+Note that the chunker params changed from Borg 0.xx to 1.0.
+
+For more help on include/exclude patterns, see the :ref:`borg_patterns` command output.
+"""
+
+EXPORT_TAR_EPILOG = """
+This command creates a tarball from an archive.
+
+When giving '-' as the output FILE, Borg will write a tar stream to standard output.
+
+By default (``--tar-filter=auto``) Borg will detect whether the FILE should be compressed
+based on its file extension and pipe the tarball through an appropriate filter
+before writing it to FILE:
+
+- .tar.gz or .tgz: gzip
+- .tar.bz2 or .tbz: bzip2
+- .tar.xz or .txz: xz
+- .tar.zstd: zstd
+- .tar.lz4: lz4
+
+Alternatively, a ``--tar-filter`` program may be explicitly specified. It should
+read the uncompressed tar stream from stdin and write a compressed/filtered
+tar stream to stdout.
+
+The generated tarball uses the GNU tar format.
+
+export-tar is a lossy conversion:
+BSD flags, ACLs, extended attributes (xattrs), atime and ctime are not exported.
+Timestamp resolution is limited to whole seconds, not the nanosecond resolution
+otherwise supported by Borg.
+
+A ``--sparse`` option (as found in borg extract) is not supported.
+
+By default the entire archive is extracted but a subset of files and directories
+can be selected by passing a list of ``PATHs`` as arguments.
+The file selection can further be restricted by using the ``--exclude`` option.
+
+For more help on include/exclude patterns, see the :ref:`borg_patterns` command output.
+
+``--progress`` can be slower than no progress display, since it makes one additional
+pass over the archive metadata.
+"""
+
+EXTRACT_EPILOG = """
+This command extracts the contents of an archive. By default the entire
+archive is extracted but a subset of files and directories can be selected
+by passing a list of ``PATHs`` as arguments. The file selection can further
+be restricted by using the ``--exclude`` option.
+
+For more help on include/exclude patterns, see the :ref:`borg_patterns` command output.
+
+By using ``--dry-run``, you can do all extraction steps except actually writing the
+output data: reading metadata and data chunks from the repo, checking the hash/hmac,
+decrypting, decompressing.
+
+``--progress`` can be slower than no progress display, since it makes one additional
+pass over the archive metadata.
+
+.. note::
+
+    Currently, extract always writes into the current working directory ("."),
+    so make sure you ``cd`` to the right place before calling ``borg extract``.
+
+    When parent directories are not extracted (because of using file/directory selection
+    or any other reason), borg can not restore parent directories' metadata, e.g. owner,
+    group, permission, etc.
+"""
+
+INFO_EPILOG = """
+This command displays detailed information about the specified archive or repository.
+
+Please note that the deduplicated sizes of the individual archives do not add
+up to the deduplicated size of the repository ("all archives"), because the two
+are meaning different things:
+
+This archive / deduplicated size = amount of data stored ONLY for this archive
+= unique chunks of this archive.
+All archives / deduplicated size = amount of data stored in the repo
+= all chunks in the repository.
+
+Borg archives can only contain a limited amount of file metadata.
+The size of an archive relative to this limit depends on a number of factors,
+mainly the number of files, the lengths of paths and other metadata stored for files.
+This is shown as *utilization of maximum supported archive size*.
+"""
+
+INIT_EPILOG = """
+This command initializes an empty repository. A repository is a filesystem
+directory containing the deduplicated data from zero or more archives.
+
+Encryption mode TLDR
+++++++++++++++++++++
+
+The encryption mode can only be configured when creating a new repository -
+you can neither configure it on a per-archive basis nor change the
+encryption mode of an existing repository.
+
+Use ``repokey``::
+
+    borg init --encryption repokey /path/to/repo
+
+Or ``repokey-blake2`` depending on which is faster on your client machines (see below)::
+
+    borg init --encryption repokey-blake2 /path/to/repo
+
+Borg will:
+
+1. Ask you to come up with a passphrase.
+2. Create a borg key (which contains 3 random secrets. See :ref:`key_files`).
+3. Encrypt the key with your passphrase.
+4. Store the encrypted borg key inside the repository directory (in the repo config).
+   This is why it is essential to use a secure passphrase.
+5. Encrypt and sign your backups to prevent anyone from reading or forging them unless they
+   have the key and know the passphrase. Make sure to keep a backup of
+   your key **outside** the repository - do not lock yourself out by
+   "leaving your keys inside your car" (see :ref:`borg_key_export`).
+   For remote backups the encryption is done locally - the remote machine
+   never sees your passphrase, your unencrypted key or your unencrypted files.
+   Chunking and id generation are also based on your key to improve
+   your privacy.
+6. Use the key when extracting files to decrypt them and to verify that the contents of
+   the backups have not been accidentally or maliciously altered.
+
+Picking a passphrase
+++++++++++++++++++++
+
+Make sure you use a good passphrase. Not too short, not too simple. The real
+encryption / decryption key is encrypted with / locked by your passphrase.
+If an attacker gets your key, he can't unlock and use it without knowing the
+passphrase.
+
+Be careful with special or non-ascii characters in your passphrase:
+
+- Borg processes the passphrase as unicode (and encodes it as utf-8),
+  so it does not have problems dealing with even the strangest characters.
+- BUT: that does not necessarily apply to your OS / VM / keyboard configuration.
+
+So better use a long passphrase made from simple ascii chars than one that
+includes non-ascii stuff or characters that are hard/impossible to enter on
+a different keyboard layout.
+
+You can change your passphrase for existing repos at any time, it won't affect
+the encryption/decryption key or other secrets.
+
+More encryption modes
++++++++++++++++++++++
+
+Only use ``--encryption none`` if you are OK with anyone who has access to
+your repository being able to read your backups and tamper with their
+contents without you noticing.
+
+If you want "passphrase and having-the-key" security, use ``--encryption keyfile``.
+The key will be stored in your home directory (in ``~/.config/borg/keys``).
+
+If you do **not** want to encrypt the contents of your backups, but still
+want to detect malicious tampering use ``--encryption authenticated``.
+
+If ``BLAKE2b`` is faster than ``SHA-256`` on your hardware, use ``--encryption authenticated-blake2``,
+``--encryption repokey-blake2`` or ``--encryption keyfile-blake2``. Note: for remote backups
+the hashing is done on your local machine.
+
+.. nanorst: inline-fill
+
++----------+---------------+------------------------+--------------------------+
+| Hash/MAC | Not encrypted | Not encrypted,         | Encrypted (AEAD w/ AES)  |
+|          | no auth       | but authenticated      | and authenticated        |
++----------+---------------+------------------------+--------------------------+
+| SHA-256  | none          | `authenticated`        | repokey                  |
+|          |               |                        | keyfile                  |
++----------+---------------+------------------------+--------------------------+
+| BLAKE2b  | n/a           | `authenticated-blake2` | `repokey-blake2`         |
+|          |               |                        | `keyfile-blake2`         |
++----------+---------------+------------------------+--------------------------+
+
+.. nanorst: inline-replace
+
+Modes `marked like this` in the above table are new in Borg 1.1 and are not
+backwards-compatible with Borg 1.0.x.
+
+On modern Intel/AMD CPUs (except very cheap ones), AES is usually
+hardware-accelerated.
+BLAKE2b is faster than SHA256 on Intel/AMD 64-bit CPUs
+(except AMD Ryzen and future CPUs with SHA extensions),
+which makes `authenticated-blake2` faster than `none` and `authenticated`.
+
+On modern ARM CPUs, NEON provides hardware acceleration for SHA256 making it faster
+than BLAKE2b-256 there. NEON accelerates AES as well.
+
+Hardware acceleration is always used automatically when available.
+
+`repokey` and `keyfile` use AES-CTR-256 for encryption and HMAC-SHA256 for
+authentication in an encrypt-then-MAC (EtM) construction. The chunk ID hash
+is HMAC-SHA256 as well (with a separate key).
+These modes are compatible with Borg 1.0.x.
+
+`repokey-blake2` and `keyfile-blake2` are also authenticated encryption modes,
+but use BLAKE2b-256 instead of HMAC-SHA256 for authentication. The chunk ID
+hash is a keyed BLAKE2b-256 hash.
+These modes are new and *not* compatible with Borg 1.0.x.
+
+`authenticated` mode uses no encryption, but authenticates repository contents
+through the same HMAC-SHA256 hash as the `repokey` and `keyfile` modes (it uses it
+as the chunk ID hash). The key is stored like `repokey`.
+This mode is new and *not* compatible with Borg 1.0.x.
+
+`authenticated-blake2` is like `authenticated`, but uses the keyed BLAKE2b-256 hash
+from the other blake2 modes.
+This mode is new and *not* compatible with Borg 1.0.x.
+
+`none` mode uses no encryption and no authentication. It uses SHA256 as chunk
+ID hash. This mode is not recommended, you should rather consider using an authenticated
+or authenticated/encrypted mode. This mode has possible denial-of-service issues
+when running ``borg create`` on contents controlled by an attacker.
+Use it only for new repositories where no encryption is wanted **and** when compatibility
+with 1.0.x is important. If compatibility with 1.0.x is not important, use
+`authenticated-blake2` or `authenticated` instead.
+This mode is compatible with Borg 1.0.x.
+"""
+
+KEY_EXPORT_EPILOG = """
+If repository encryption is used, the repository is inaccessible
+without the key. This command allows one to backup this essential key.
+Note that the backup produced does not include the passphrase itself
+(i.e. the exported key stays encrypted). In order to regain access to a
+repository, one needs both the exported key and the original passphrase.
+
+There are three backup formats. The normal backup format is suitable for
+digital storage as a file. The ``--paper`` backup format is optimized
+for printing and typing in while importing, with per line checks to
+reduce problems with manual input. The ``--qr-html`` creates a printable
+HTML template with a QR code and a copy of the ``--paper``-formatted key.
+
+For repositories using keyfile encryption the key is saved locally
+on the system that is capable of doing backups. To guard against loss
+of this key, the key needs to be backed up independently of the main
+data backup.
+
+For repositories using the repokey encryption the key is saved in the
+repository in the config file. A backup is thus not strictly needed,
+but guards against the repository becoming inaccessible if the file
+is damaged for some reason.
+
+Examples::
+
+    borg key export /path/to/repo > encrypted-key-backup
+    borg key export --paper /path/to/repo > encrypted-key-backup.txt
+    borg key export --qr-html /path/to/repo > encrypted-key-backup.html
+    # Or pass the output file as an argument instead of redirecting stdout:
+    borg key export /path/to/repo encrypted-key-backup
+    borg key export --paper /path/to/repo encrypted-key-backup.txt
+    borg key export --qr-html /path/to/repo encrypted-key-backup.html
+
+
+"""
+
+KEY_IMPORT_EPILOG = """
+This command restores a key previously backed up with the export command.
+
+If the ``--paper`` option is given, the import will be an interactive
+process in which each line is checked for plausibility before
+proceeding to the next line. For this format PATH must not be given.
+
+For repositories using keyfile encryption, the key file which ``borg key
+import`` writes to depends on several factors. If the ``BORG_KEY_FILE``
+environment variable is set and non-empty, ``borg key import`` creates
+or overwrites that file named by ``$BORG_KEY_FILE``. Otherwise, ``borg
+key import`` searches in the ``$BORG_KEYS_DIR`` directory for a key file
+associated with the repository. If a key file is found in
+``$BORG_KEYS_DIR``, ``borg key import`` overwrites it; otherwise, ``borg
+key import`` creates a new key file in ``$BORG_KEYS_DIR``.
+"""
+
+KEY_CHANGE_PASSPHRASE_EPILOG = """
+The key files used for repository encryption are optionally passphrase
+protected. This command can be used to change this passphrase.
+
+Please note that this command only changes the passphrase, but not any
+secret protected by it (like e.g. encryption/MAC keys or chunker seed).
+Thus, changing the passphrase after passphrase and borg key got compromised
+does not protect future (nor past) backups to the same repository.
+"""
+
+KEY_CHANGE_LOCATION_EPILOG = """
+Change the location of a borg key. The key can be stored at different locations:
+
+keyfile: locally, usually in the home directory
+repokey: inside the repo (in the repo config)
+
+Note: this command does NOT change the crypto algorithms, just the key location,
+      thus you must ONLY give the key location (keyfile or repokey).
+"""
+
+LIST_EPILOG = """
+This command lists the contents of a repository or an archive.
+
+For more help on include/exclude patterns, see the :ref:`borg_patterns` command output.
+
+.. man NOTES
+
+The FORMAT specifier syntax
++++++++++++++++++++++++++++
+
+The ``--format`` option uses python's `format string syntax
+<https://docs.python.org/3.9/library/string.html#formatstrings>`_.
+
+Examples:
+::
+
+    $ borg list --format '{archive}{NL}' /path/to/repo
+    ArchiveFoo
+    ArchiveBar
+    ...
+
+    # {VAR:NUMBER} - pad to NUMBER columns.
+    # Strings are left-aligned, numbers are right-aligned.
+    # Note: time columns except ``isomtime``, ``isoctime`` and ``isoatime`` cannot be padded.
+    $ borg list --format '{archive:36} {time} [{id}]{NL}' /path/to/repo
+    ArchiveFoo                           Thu, 2021-12-09 10:22:28 [0b8e9a312bef3f2f6e2d0fc110c196827786c15eba0188738e81697a7fa3b274]
+    $ borg list --format '{mode} {user:6} {group:6} {size:8} {mtime} {path}{extra}{NL}' /path/to/repo::ArchiveFoo
+    -rw-rw-r-- user   user       1024 Thu, 2021-12-09 10:22:17 file-foo
+    ...
+
+    # {VAR:<NUMBER} - pad to NUMBER columns left-aligned.
+    # {VAR:>NUMBER} - pad to NUMBER columns right-aligned.
+    $ borg list --format '{mode} {user:>6} {group:>6} {size:<8} {mtime} {path}{extra}{NL}' /path/to/repo::ArchiveFoo
+    -rw-rw-r--   user   user 1024     Thu, 2021-12-09 10:22:17 file-foo
+    ...
+
+The following keys are always available:
+
+
+"""
+
+PRUNE_EPILOG = """
+The prune command prunes a repository by deleting all archives not matching
+any of the specified retention options.
+
+Important: Repository disk space is **not** freed until you run ``borg compact``.
+
+This command is normally used by automated backup scripts wanting to keep a
+certain number of historic backups. This retention policy is commonly referred to as
+`GFS <https://en.wikipedia.org/wiki/Backup_rotation_scheme#Grandfather-father-son>`_
+(Grandfather-father-son) backup rotation scheme.
+
+Also, prune automatically removes checkpoint archives (incomplete archives left
+behind by interrupted backup runs) except if the checkpoint is the latest
+archive (and thus still needed). Checkpoint archives are not considered when
+comparing archive counts against the retention limits (``--keep-X``).
+
+If a prefix is set with -P, then only archives that start with the prefix are
+considered for deletion and only those archives count towards the totals
+specified by the rules.
+Otherwise, *all* archives in the repository are candidates for deletion!
+There is no automatic distinction between archives representing different
+contents. These need to be distinguished by specifying matching prefixes.
+
+If you have multiple sequences of archives with different data sets (e.g.
+from different machines) in one shared repository, use one prune call per
+data set that matches only the respective archives using the -P option.
+
+The ``--keep-within`` option takes an argument of the form "<int><char>",
+where char is "H", "d", "w", "m", "y". For example, ``--keep-within 2d`` means
+to keep all archives that were created within the past 48 hours.
+"1m" is taken to mean "31d". The archives kept with this option do not
+count towards the totals specified by any other options.
+
+A good procedure is to thin out more and more the older your backups get.
+As an example, ``--keep-daily 7`` means to keep the latest backup on each day,
+up to 7 most recent days with backups (days without backups do not count).
+The rules are applied from secondly to yearly, and backups selected by previous
+rules do not count towards those of later rules. The time that each backup
+starts is used for pruning purposes. Dates and times are interpreted in
+the local timezone, and weeks go from Monday to Sunday. Specifying a
+negative number of archives to keep means that there is no limit. As of borg
+1.2.0, borg will retain the oldest archive if any of the secondly, minutely,
+hourly, daily, weekly, monthly, or yearly rules was not otherwise able to meet
+its retention target. This enables the first chronological archive to continue
+aging until it is replaced by a newer archive that meets the retention criteria.
+
+The ``--keep-last N`` option is doing the same as ``--keep-secondly N`` (and it will
+keep the last N archives under the assumption that you do not create more than one
+backup archive in the same second).
+
+When using ``--stats``, you will get some statistics about how much data was
+deleted - the "Deleted data" deduplicated size there is most interesting as
+that is how much your repository will shrink.
+Please note that the "All archives" stats refer to the state after pruning.
+"""
+
+RECREATE_EPILOG = """
+Recreate the contents of existing archives.
+
+recreate is a potentially dangerous function and might lead to data loss
+(if used wrongly). BE VERY CAREFUL!
+
+Important: Repository disk space is **not** freed until you run ``borg compact``.
+
+``--exclude``, ``--exclude-from``, ``--exclude-if-present``, ``--keep-exclude-tags``
+and PATH have the exact same semantics as in "borg create", but they only check
+for files in the archives and not in the local file system. If PATHs are specified,
+the resulting archives will only contain files from these PATHs.
+
+Note that all paths in an archive are relative, therefore absolute patterns/paths
+will *not* match (``--exclude``, ``--exclude-from``, PATHs).
+
+``--recompress`` allows one to change the compression of existing data in archives.
+Due to how Borg stores compressed size information this might display
+incorrect information for archives that were not recreated at the same time.
+There is no risk of data loss by this.
+
+``--chunker-params`` will re-chunk all files in the archive, this can be
+used to have upgraded Borg 0.xx or Attic archives deduplicate with
+Borg 1.x archives.
+
+**USE WITH CAUTION.**
+Depending on the PATHs and patterns given, recreate can be used to permanently
+delete files from archives.
+When in doubt, use ``--dry-run --verbose --list`` to see how patterns/PATHS are
+interpreted. See :ref:`list_item_flags` in ``borg create`` for details.
+
+The archive being recreated is only removed after the operation completes. The
+archive that is built during the operation exists at the same time at
+"<ARCHIVE>.recreate". The new archive will have a different archive ID.
+
+With ``--target`` the original archive is not replaced, instead a new archive is created.
+
+When rechunking (or recompressing), space usage can be substantial - expect
+at least the entire deduplicated size of the archives using the previous
+chunker (or compression) params.
+
+If you recently ran borg check --repair and it had to fix lost chunks with all-zero
+replacement chunks, please first run another backup for the same data and re-run
+borg check --repair afterwards to heal any archives that had lost chunks which are
+still generated from the input data.
+
+Important: running borg recreate to re-chunk will remove the chunks_healthy
+metadata of all items with replacement chunks, so healing will not be possible
+any more after re-chunking (it is also unlikely it would ever work: due to the
+change of chunking parameters, the missing chunk likely will never be seen again
+even if you still have the data that produced it).
+"""
+
+RENAME_EPILOG = """
+This command renames an archive in the repository.
+
+This results in a different archive ID.
+"""
+
+SERVE_EPILOG = """
+This command starts a repository server process. This command is usually not used manually.
+"""
+
+UMOUNT_EPILOG = """
+This command un-mounts a FUSE filesystem that was mounted with ``borg mount``.
+
+This is a convenience wrapper that just calls the platform-specific shell
+command - usually this is either umount or fusermount -u.
+"""
+
+UPGRADE_EPILOG = """
+Upgrade an existing, local Borg repository.
+
+When you do not need borg upgrade
++++++++++++++++++++++++++++++++++
+
+Not every change requires that you run ``borg upgrade``.
+
+You do **not** need to run it when:
+
+- moving your repository to a different place
+- upgrading to another point release (like 1.0.x to 1.0.y),
+  except when noted otherwise in the changelog
+- upgrading from 1.0.x to 1.1.x,
+  except when noted otherwise in the changelog
+
+Borg 1.x.y upgrades
++++++++++++++++++++
+
+Use ``borg upgrade --tam REPO`` to require manifest authentication
+introduced with Borg 1.0.9 to address security issues. This means
+that modifying the repository after doing this with a version prior
+to 1.0.9 will raise a validation error, so only perform this upgrade
+after updating all clients using the repository to 1.0.9 or newer.
+
+This upgrade should be done on each client for safety reasons.
+
+If a repository is accidentally modified with a pre-1.0.9 client after
+this upgrade, use ``borg upgrade --tam --force REPO`` to remedy it.
+
+If you routinely do this you might not want to enable this upgrade
+(which will leave you exposed to the security issue). You can
+reverse the upgrade by issuing ``borg upgrade --disable-tam REPO``.
+
+See
+https://borgbackup.readthedocs.io/en/stable/changes.html#pre-1-0-9-manifest-spoofing-vulnerability
+for details.
+
+Attic and Borg 0.xx to Borg 1.x
++++++++++++++++++++++++++++++++
+
+This currently supports converting an Attic repository to Borg and also
+helps with converting Borg 0.xx to 1.0.
+
+Currently, only LOCAL repositories can be upgraded (issue #465).
+
+Please note that ``borg create`` (since 1.0.0) uses bigger chunks by
+default than old borg or attic did, so the new chunks won't deduplicate
+with the old chunks in the upgraded repository.
+See ``--chunker-params`` option of ``borg create`` and ``borg recreate``.
+
+``borg upgrade`` will change the magic strings in the repository's
+segments to match the new Borg magic strings. The keyfiles found in
+$ATTIC_KEYS_DIR or ~/.attic/keys/ will also be converted and
+copied to $BORG_KEYS_DIR or ~/.config/borg/keys.
+
+The cache files are converted, from $ATTIC_CACHE_DIR or
+~/.cache/attic to $BORG_CACHE_DIR or ~/.cache/borg, but the
+cache layout between Borg and Attic changed, so it is possible
+the first backup after the conversion takes longer than expected
+due to the cache resync.
+
+Upgrade should be able to resume if interrupted, although it
+will still iterate over all segments. If you want to start
+from scratch, use `borg delete` over the copied repository to
+make sure the cache files are also removed::
+
+    borg delete borg
+
+Unless ``--inplace`` is specified, the upgrade process first creates a backup
+copy of the repository, in REPOSITORY.before-upgrade-DATETIME, using hardlinks.
+This requires that the repository and its parent directory reside on same
+filesystem so the hardlink copy can work.
+This takes longer than in place upgrades, but is much safer and gives
+progress information (as opposed to ``cp -al``). Once you are satisfied
+with the conversion, you can safely destroy the backup copy.
+
+WARNING: Running the upgrade in place will make the current
+copy unusable with older version, with no way of going back
+to previous versions. This can PERMANENTLY DAMAGE YOUR
+REPOSITORY!  Attic CAN NOT READ BORG REPOSITORIES, as the
+magic strings have changed. You have been warned."""
+
+WITH_LOCK_EPILOG = """
+This command runs a user-specified command while the repository lock is held.
+
+It will first try to acquire the lock (make sure that no other operation is
+running in the repo), then execute the given command as a subprocess and wait
+for its termination, release the lock and return the user command's return
+code as borg's return code.
+
+.. note::
+
+    If you copy a repository with the lock held, the lock will be present in
+    the copy. Thus, before using borg on the copy from a different host,
+    you need to use "borg break-lock" on the copied repository, because
+    Borg is cautious and does not automatically remove stale locks made by a different host.
+"""
+
+IMPORT_TAR_EPILOG = """
+This command creates a backup archive from a tarball.
+
+When giving '-' as path, Borg will read a tar stream from standard input.
+
+By default (--tar-filter=auto) Borg will detect whether the file is compressed
+based on its file extension and pipe the file through an appropriate filter:
+
+- .tar.gz or .tgz: gzip -d
+- .tar.bz2 or .tbz: bzip2 -d
+- .tar.xz or .txz: xz -d
+- .tar.zstd: zstd -d
+- .tar.lz4: lz4 -d
+
+Alternatively, a --tar-filter program may be explicitly specified. It should
+read compressed data from stdin and output an uncompressed tar stream on
+stdout.
+
+Most documentation of borg create applies. Note that this command does not
+support excluding files.
+
+import-tar is a lossy conversion:
+BSD flags, ACLs, extended attributes (xattrs), atime and ctime are not exported.
+Timestamp resolution is limited to whole seconds, not the nanosecond resolution
+otherwise supported by Borg.
+
+A ``--sparse`` option (as found in borg create) is not supported.
+
+import-tar reads POSIX.1-1988 (ustar), POSIX.1-2001 (pax), GNU tar, UNIX V7 tar
+and SunOS tar with extended attributes.
+"""
+
+
 class Archiver:
 
     def __init__(self, lock_wait=None, prog=None):
@@ -423,6 +1637,7 @@ def do_change_location(self, args, repository, manifest, key, cache):
     @with_repository(lock=False, exclusive=False, manifest=False, cache=False)
     def do_key_export(self, args, repository):
         """Export the repository key for backup"""
+        from .crypto.keymanager import KeyManager
         manager = KeyManager(repository)
         manager.load_keyblob()
         if args.paper:
@@ -441,6 +1656,7 @@ def do_key_export(self, args, repository):
     @with_repository(lock=False, exclusive=False, manifest=False, cache=False)
     def do_key_import(self, args, repository):
         """Import the repository key from backup"""
+        from .crypto.keymanager import KeyManager
         manager = KeyManager(repository)
         if args.paper:
             if args.path:
@@ -1106,6 +2322,7 @@ def do_export_tar(self, args, repository, manifest, key, archive):
         return self.exit_code
 
     def _export_tar(self, args, archive, tarstream):
+        import tarfile
         matcher = self.build_matcher(args.patterns, args.paths)
 
         progress = args.progress
@@ -1274,7 +2491,8 @@ def print_text_output(diff, path):
         diffs = ((path, diff.changes()) for path, diff in diffs if not diff.equal)
 
         if args.sort:
-            diffs = sorted(diffs)
+            # sort by path only, comparing the changes of equal paths is not needed (and not always possible)
+            diffs = sorted(diffs, key=itemgetter(0))
 
         for path, diff in diffs:
             print_output(diff, path)
@@ -1746,6 +2964,7 @@ def do_upgrade(self, args, repository, manifest=None, key=None):
         else:
             # mainly for upgrades from Attic repositories,
             # but also supports borg 0.xx -> 1.0 upgrade.
+            from .upgrader import AtticRepositoryUpgrader, BorgRepositoryUpgrader
 
             repo = AtticRepositoryUpgrader(args.location.path, create=False)
             try:
@@ -1819,6 +3038,7 @@ def do_import_tar(self, args, repository, manifest, key, cache):
         return self.exit_code
 
     def _import_tar(self, args, repository, manifest, key, cache, tarstream):
+        import tarfile
         t0 = datetime.utcnow()
         t0_monotonic = time.monotonic()
 
@@ -2361,373 +3581,373 @@ def do_break_lock(self, args, repository):
         return self.exit_code
 
     helptext = collections.OrderedDict()
-    helptext['patterns'] = textwrap.dedent('''
-        The path/filenames used as input for the pattern matching start from the
-        currently active recursion root. You usually give the recursion root(s)
-        when invoking borg and these can be either relative or absolute paths.
-
-        So, when you give `relative/` as root, the paths going into the matcher
-        will look like `relative/.../file.ext`. When you give `/absolute/` as
-        root, they will look like `/absolute/.../file.ext`.
-
-        File paths in Borg archives are always stored normalized and relative.
-        This means that e.g. ``borg create /path/to/repo ../some/path`` will
-        store all files as `some/path/.../file.ext` and ``borg create
-        /path/to/repo /home/user`` will store all files as
-        `home/user/.../file.ext`.
-
-        A directory exclusion pattern can end either with or without a slash ('/').
-        If it ends with a slash, such as `some/path/`, the directory will be
-        included but not its content. If it does not end with a slash, such as
-        `some/path`, both the directory and content will be excluded.
-
-        File patterns support these styles: fnmatch, shell, regular expressions,
-        path prefixes and path full-matches. By default, fnmatch is used for
-        ``--exclude`` patterns and shell-style is used for the ``--pattern``
-        option. For commands that support patterns in their ``PATH`` argument
-        like (``borg list``), the default pattern is path prefix.
-
-        Starting with Borg 1.2, for all but regular expression pattern matching
-        styles, all paths are treated as relative, meaning that a leading path
-        separator is removed after normalizing and before matching. This allows
-        you to use absolute or relative patterns arbitrarily.
-
-        If followed by a colon (':') the first two characters of a pattern are
-        used as a style selector. Explicit style selection is necessary when a
-        non-default style is desired or when the desired pattern starts with
-        two alphanumeric characters followed by a colon (i.e. `aa:something/*`).
-
-        `Fnmatch <https://docs.python.org/3/library/fnmatch.html>`_, selector `fm:`
-            This is the default style for ``--exclude`` and ``--exclude-from``.
-            These patterns use a variant of shell pattern syntax, with '\\*' matching
-            any number of characters, '?' matching any single character, '[...]'
-            matching any single character specified, including ranges, and '[!...]'
-            matching any character not specified. For the purpose of these patterns,
-            the path separator (backslash for Windows and '/' on other systems) is not
-            treated specially. Wrap meta-characters in brackets for a literal
-            match (i.e. `[?]` to match the literal character `?`). For a path
-            to match a pattern, the full path must match, or it must match
-            from the start of the full path to just before a path separator. Except
-            for the root path, paths will never end in the path separator when
-            matching is attempted.  Thus, if a given pattern ends in a path
-            separator, a '\\*' is appended before matching is attempted. A leading
-            path separator is always removed.
-
-        Shell-style patterns, selector `sh:`
-            This is the default style for ``--pattern`` and ``--patterns-from``.
-            Like fnmatch patterns these are similar to shell patterns. The difference
-            is that the pattern may include `**/` for matching zero or more directory
-            levels, `*` for matching zero or more arbitrary characters with the
-            exception of any path separator. A leading path separator is always removed.
-
-        Regular expressions, selector `re:`
-            Regular expressions similar to those found in Perl are supported. Unlike
-            shell patterns regular expressions are not required to match the full
-            path and any substring match is sufficient. It is strongly recommended to
-            anchor patterns to the start ('^'), to the end ('$') or both. Path
-            separators (backslash for Windows and '/' on other systems) in paths are
-            always normalized to a forward slash ('/') before applying a pattern. The
-            regular expression syntax is described in the `Python documentation for
-            the re module <https://docs.python.org/3/library/re.html>`_.
-
-        Path prefix, selector `pp:`
-            This pattern style is useful to match whole sub-directories. The pattern
-            `pp:root/somedir` matches `root/somedir` and everything therein. A leading
-            path separator is always removed.
-
-        Path full-match, selector `pf:`
-            This pattern style is (only) useful to match full paths.
-            This is kind of a pseudo pattern as it can not have any variable or
-            unspecified parts - the full path must be given. `pf:root/file.ext` matches
-            `root/file.ext` only. A leading path separator is always removed.
-
-            Implementation note: this is implemented via very time-efficient O(1)
-            hashtable lookups (this means you can have huge amounts of such patterns
-            without impacting performance much).
-            Due to that, this kind of pattern does not respect any context or order.
-            If you use such a pattern to include a file, it will always be included
-            (if the directory recursion encounters it).
-            Other include/exclude patterns that would normally match will be ignored.
-            Same logic applies for exclude.
-
-        .. note::
-
-            `re:`, `sh:` and `fm:` patterns are all implemented on top of the Python SRE
-            engine. It is very easy to formulate patterns for each of these types which
-            requires an inordinate amount of time to match paths. If untrusted users
-            are able to supply patterns, ensure they cannot supply `re:` patterns.
-            Further, ensure that `sh:` and `fm:` patterns only contain a handful of
-            wildcards at most.
-
-        Exclusions can be passed via the command line option ``--exclude``. When used
-        from within a shell, the patterns should be quoted to protect them from
-        expansion.
-
-        The ``--exclude-from`` option permits loading exclusion patterns from a text
-        file with one pattern per line. Lines empty or starting with the number sign
-        ('#') after removing whitespace on both ends are ignored. The optional style
-        selector prefix is also supported for patterns loaded from a file. Due to
-        whitespace removal, paths with whitespace at the beginning or end can only be
-        excluded using regular expressions.
-
-        To test your exclusion patterns without performing an actual backup you can
-        run ``borg create --list --dry-run ...``.
-
-        Examples::
-
-            # Exclude '/home/user/file.o' but not '/home/user/file.odt':
-            $ borg create -e '*.o' backup /
-
-            # Exclude '/home/user/junk' and '/home/user/subdir/junk' but
-            # not '/home/user/importantjunk' or '/etc/junk':
-            $ borg create -e '/home/*/junk' backup /
-
-            # Exclude the contents of '/home/user/cache' but not the directory itself:
-            $ borg create -e home/user/cache/ backup /
-
-            # The file '/home/user/cache/important' is *not* backed up:
-            $ borg create -e /home/user/cache/ backup / /home/user/cache/important
-
-            # The contents of directories in '/home' are not backed up when their name
-            # ends in '.tmp'
-            $ borg create --exclude 're:^/home/[^/]+\\.tmp/' backup /
-
-            # Load exclusions from file
-            $ cat >exclude.txt <<EOF
-            # Comment line
-            /home/*/junk
-            *.tmp
-            fm:aa:something/*
-            re:^/home/[^/]+\\.tmp/
-            sh:/home/*/.thumbnails
-            # Example with spaces, no need to escape as it is processed by borg
-            some file with spaces.txt
-            EOF
-            $ borg create --exclude-from exclude.txt backup /
-
-        A more general and easier to use way to define filename matching patterns exists
-        with the ``--pattern`` and ``--patterns-from`` options. Using these, you may
-        specify the backup roots (starting points) and patterns for inclusion/exclusion.
-        A root path starts with the prefix `R`, followed by a path (a plain path, not a
-        file pattern). An include rule starts with the prefix +, an exclude rule starts
-        with the prefix -, an exclude-norecurse rule starts with !, all followed by a pattern.
-
-        .. note::
-
-            Via ``--pattern`` or ``--patterns-from`` you can define BOTH inclusion and exclusion
-            of files using pattern prefixes ``+`` and ``-``. With ``--exclude`` and
-            ``--exclude-from`` ONLY excludes are defined.
-
-        Inclusion patterns are useful to include paths that are contained in an excluded
-        path. The first matching pattern is used so if an include pattern matches before
-        an exclude pattern, the file is backed up. If an exclude-norecurse pattern matches
-        a directory, it won't recurse into it and won't discover any potential matches for
-        include rules below that directory.
-
-        .. note::
-
-            It's possible that a sub-directory/file is matched while parent directories are not.
-            In that case, parent directories are not backed up thus their user, group, permission,
-            etc. can not be restored.
-
-        Note that the default pattern style for ``--pattern`` and ``--patterns-from`` is
-        shell style (`sh:`), so those patterns behave similar to rsync include/exclude
-        patterns. The pattern style can be set via the `P` prefix.
-
-        Patterns (``--pattern``) and excludes (``--exclude``) from the command line are
-        considered first (in the order of appearance). Then patterns from ``--patterns-from``
-        are added. Exclusion patterns from ``--exclude-from`` files are appended last.
-
-        Examples::
-
-            # backup pics, but not the ones from 2018, except the good ones:
-            # note: using = is essential to avoid cmdline argument parsing issues.
-            borg create --pattern=+pics/2018/good --pattern=-pics/2018 repo::arch pics
-
-            # use a file with patterns:
-            borg create --patterns-from patterns.lst repo::arch
-
-        The patterns.lst file could look like that::
-
-            # "sh:" pattern style is the default, so the following line is not needed:
-            P sh
-            R /
-            # can be rebuild
-            - /home/*/.cache
-            # they're downloads for a reason
-            - /home/*/Downloads
-            # susan is a nice person
-            # include susans home
-            + /home/susan
-            # also back up this exact file
-            + pf:/home/bobby/specialfile.txt
-            # don't backup the other home directories
-            - /home/*
-            # don't even look in /proc
-            ! /proc
+    helptext['patterns'] = '''
+The path/filenames used as input for the pattern matching start from the
+currently active recursion root. You usually give the recursion root(s)
+when invoking borg and these can be either relative or absolute paths.
+
+So, when you give `relative/` as root, the paths going into the matcher
+will look like `relative/.../file.ext`. When you give `/absolute/` as
+root, they will look like `/absolute/.../file.ext`.
+
+File paths in Borg archives are always stored normalized and relative.
+This means that e.g. ``borg create /path/to/repo ../some/path`` will
+store all files as `some/path/.../file.ext` and ``borg create
+/path/to/repo /home/user`` will store all files as
+`home/user/.../file.ext`.
+
+A directory exclusion pattern can end either with or without a slash ('/').
+If it ends with a slash, such as `some/path/`, the directory will be
+included but not its content. If it does not end with a slash, such as
+`some/path`, both the directory and content will be excluded.
+
+File patterns support these styles: fnmatch, shell, regular expressions,
+path prefixes and path full-matches. By default, fnmatch is used for
+``--exclude`` patterns and shell-style is used for the ``--pattern``
+option. For commands that support patterns in their ``PATH`` argument
+like (``borg list``), the default pattern is path prefix.
+
+Starting with Borg 1.2, for all but regular expression pattern matching
+styles, all paths are treated as relative, meaning that a leading path
+separator is removed after normalizing and before matching. This allows
+you to use absolute or relative patterns arbitrarily.
+
+If followed by a colon (':') the first two characters of a pattern are
+used as a style selector. Explicit style selection is necessary when a
+non-default style is desired or when the desired pattern starts with
+two alphanumeric characters followed by a colon (i.e. `aa:something/*`).
+
+`Fnmatch <https://docs.python.org/3/library/fnmatch.html>`_, selector `fm:`
+    This is the default style for ``--exclude`` and ``--exclude-from``.
+    These patterns use a variant of shell pattern syntax, with '\\*' matching
+    any number of characters, '?' matching any single character, '[...]'
+    matching any single character specified, including ranges, and '[!...]'
+    matching any character not specified. For the purpose of these patterns,
+    the path separator (backslash for Windows and '/' on other systems) is not
+    treated specially. Wrap meta-characters in brackets for a literal
+    match (i.e. `[?]` to match the literal character `?`). For a path
+    to match a pattern, the full path must match, or it must match
+    from the start of the full path to just before a path separator. Except
+    for the root path, paths will never end in the path separator when
+    matching is attempted.  Thus, if a given pattern ends in a path
+    separator, a '\\*' is appended before matching is attempted. A leading
+    path separator is always removed.
+
+Shell-style patterns, selector `sh:`
+    This is the default style for ``--pattern`` and ``--patterns-from``.
+    Like fnmatch patterns these are similar to shell patterns. The difference
+    is that the pattern may include `**/` for matching zero or more directory
+    levels, `*` for matching zero or more arbitrary characters with the
+    exception of any path separator. A leading path separator is always removed.
+
+Regular expressions, selector `re:`
+    Regular expressions similar to those found in Perl are supported. Unlike
+    shell patterns regular expressions are not required to match the full
+    path and any substring match is sufficient. It is strongly recommended to
+    anchor patterns to the start ('^'), to the end ('$') or both. Path
+    separators (backslash for Windows and '/' on other systems) in paths are
+    always normalized to a forward slash ('/') before applying a pattern. The
+    regular expression syntax is described in the `Python documentation for
+    the re module <https://docs.python.org/3/library/re.html>`_.
+
+Path prefix, selector `pp:`
+    This pattern style is useful to match whole sub-directories. The pattern
+    `pp:root/somedir` matches `root/somedir` and everything therein. A leading
+    path separator is always removed.
+
+Path full-match, selector `pf:`
+    This pattern style is (only) useful to match full paths.
+    This is kind of a pseudo pattern as it can not have any variable or
+    unspecified parts - the full path must be given. `pf:root/file.ext` matches
+    `root/file.ext` only. A leading path separator is always removed.
+
+    Implementation note: this is implemented via very time-efficient O(1)
+    hashtable lookups (this means you can have huge amounts of such patterns
+    without impacting performance much).
+    Due to that, this kind of pattern does not respect any context or order.
+    If you use such a pattern to include a file, it will always be included
+    (if the directory recursion encounters it).
+    Other include/exclude patterns that would normally match will be ignored.
+    Same logic applies for exclude.
+
+.. note::
+
+    `re:`, `sh:` and `fm:` patterns are all implemented on top of the Python SRE
+    engine. It is very easy to formulate patterns for each of these types which
+    requires an inordinate amount of time to match paths. If untrusted users
+    are able to supply patterns, ensure they cannot supply `re:` patterns.
+    Further, ensure that `sh:` and `fm:` patterns only contain a handful of
+    wildcards at most.
+
+Exclusions can be passed via the command line option ``--exclude``. When used
+from within a shell, the patterns should be quoted to protect them from
+expansion.
+
+The ``--exclude-from`` option permits loading exclusion patterns from a text
+file with one pattern per line. Lines empty or starting with the number sign
+('#') after removing whitespace on both ends are ignored. The optional style
+selector prefix is also supported for patterns loaded from a file. Due to
+whitespace removal, paths with whitespace at the beginning or end can only be
+excluded using regular expressions.
+
+To test your exclusion patterns without performing an actual backup you can
+run ``borg create --list --dry-run ...``.
+
+Examples::
+
+    # Exclude '/home/user/file.o' but not '/home/user/file.odt':
+    $ borg create -e '*.o' backup /
+
+    # Exclude '/home/user/junk' and '/home/user/subdir/junk' but
+    # not '/home/user/importantjunk' or '/etc/junk':
+    $ borg create -e '/home/*/junk' backup /
+
+    # Exclude the contents of '/home/user/cache' but not the directory itself:
+    $ borg create -e home/user/cache/ backup /
+
+    # The file '/home/user/cache/important' is *not* backed up:
+    $ borg create -e /home/user/cache/ backup / /home/user/cache/important
+
+    # The contents of directories in '/home' are not backed up when their name
+    # ends in '.tmp'
+    $ borg create --exclude 're:^/home/[^/]+\\.tmp/' backup /
+
+    # Load exclusions from file
+    $ cat >exclude.txt <<EOF
+    # Comment line
+    /home/*/junk
+    *.tmp
+    fm:aa:something/*
+    re:^/home/[^/]+\\.tmp/
+    sh:/home/*/.thumbnails
+    # Example with spaces, no need to escape as it is processed by borg
+    some file with spaces.txt
+    EOF
+    $ borg create --exclude-from exclude.txt backup /
+
+A more general and easier to use way to define filename matching patterns exists
+with the ``--pattern`` and ``--patterns-from`` options. Using these, you may
+specify the backup roots (starting points) and patterns for inclusion/exclusion.
+A root path starts with the prefix `R`, followed by a path (a plain path, not a
+file pattern). An include rule starts with the prefix +, an exclude rule starts
+with the prefix -, an exclude-norecurse rule starts with !, all followed by a pattern.
+
+.. note::
+
+    Via ``--pattern`` or ``--patterns-from`` you can define BOTH inclusion and exclusion
+    of files using pattern prefixes ``+`` and ``-``. With ``--exclude`` and
+    ``--exclude-from`` ONLY excludes are defined.
+
+Inclusion patterns are useful to include paths that are contained in an excluded
+path. The first matching pattern is used so if an include pattern matches before
+an exclude pattern, the file is backed up. If an exclude-norecurse pattern matches
+a directory, it won't recurse into it and won't discover any potential matches for
+include rules below that directory.
+
+.. note::
+
+    It's possible that a sub-directory/file is matched while parent directories are not.
+    In that case, parent directories are not backed up thus their user, group, permission,
+    etc. can not be restored.
+
+Note that the default pattern style for ``--pattern`` and ``--patterns-from`` is
+shell style (`sh:`), so those patterns behave similar to rsync include/exclude
+patterns. The pattern style can be set via the `P` prefix.
+
+Patterns (``--pattern``) and excludes (``--exclude``) from the command line are
+considered first (in the order of appearance). Then patterns from ``--patterns-from``
+are added. Exclusion patterns from ``--exclude-from`` files are appended last.
+
+Examples::
+
+    # backup pics, but not the ones from 2018, except the good ones:
+    # note: using = is essential to avoid cmdline argument parsing issues.
+    borg create --pattern=+pics/2018/good --pattern=-pics/2018 repo::arch pics
+
+    # use a file with patterns:
+    borg create --patterns-from patterns.lst repo::arch
+
+The patterns.lst file could look like that::
+
+    # "sh:" pattern style is the default, so the following line is not needed:
+    P sh
+    R /
+    # can be rebuild
+    - /home/*/.cache
+    # they're downloads for a reason
+    - /home/*/Downloads
+    # susan is a nice person
+    # include susans home
+    + /home/susan
+    # also back up this exact file
+    + pf:/home/bobby/specialfile.txt
+    # don't backup the other home directories
+    - /home/*
+    # don't even look in /proc
+    ! /proc
 
-        You can specify recursion roots either on the command line or in a patternfile::
+You can specify recursion roots either on the command line or in a patternfile::
 
-            # these two commands do the same thing
-            borg create --exclude /home/bobby/junk repo::arch /home/bobby /home/susan
-            borg create --patterns-from patternfile.lst repo::arch
+    # these two commands do the same thing
+    borg create --exclude /home/bobby/junk repo::arch /home/bobby /home/susan
+    borg create --patterns-from patternfile.lst repo::arch
 
-        The patternfile::
-
-            # note that excludes use fm: by default and patternfiles use sh: by default.
-            # therefore, we need to specify fm: to have the same exact behavior.
-            P fm
-            R /home/bobby
-            R /home/susan
-
-            - /home/bobby/junk
-
-        This allows you to share the same patterns between multiple repositories
-        without needing to specify them on the command line.\n\n''')
-    helptext['placeholders'] = textwrap.dedent('''
-        Repository (or Archive) URLs, ``--prefix``, ``--glob-archives``, ``--comment``
-        and ``--remote-path`` values support these placeholders:
-
-        {hostname}
-            The (short) hostname of the machine.
-
-        {fqdn}
-            The full name of the machine.
-
-        {reverse-fqdn}
-            The full name of the machine in reverse domain name notation.
-
-        {now}
-            The current local date and time, by default in ISO-8601 format.
-            You can also supply your own `format string <https://docs.python.org/3.9/library/datetime.html#strftime-and-strptime-behavior>`_, e.g. {now:%Y-%m-%d_%H:%M:%S}
-
-        {utcnow}
-            The current UTC date and time, by default in ISO-8601 format.
-            You can also supply your own `format string <https://docs.python.org/3.9/library/datetime.html#strftime-and-strptime-behavior>`_, e.g. {utcnow:%Y-%m-%d_%H:%M:%S}
-
-        {user}
-            The user name (or UID, if no name is available) of the user running borg.
-
-        {pid}
-            The current process ID.
-
-        {borgversion}
-            The version of borg, e.g.: 1.0.8rc1
-
-        {borgmajor}
-            The version of borg, only the major version, e.g.: 1
-
-        {borgminor}
-            The version of borg, only major and minor version, e.g.: 1.0
-
-        {borgpatch}
-            The version of borg, only major, minor and patch version, e.g.: 1.0.8
-
-        If literal curly braces need to be used, double them for escaping::
-
-            borg create /path/to/repo::{{literal_text}}
-
-        Examples::
-
-            borg create /path/to/repo::{hostname}-{user}-{utcnow} ...
-            borg create /path/to/repo::{hostname}-{now:%Y-%m-%d_%H:%M:%S} ...
-            borg prune --prefix '{hostname}-' ...
-
-        .. note::
-            systemd uses a difficult, non-standard syntax for command lines in unit files (refer to
-            the `systemd.unit(5)` manual page).
-
-            When invoking borg from unit files, pay particular attention to escaping,
-            especially when using the now/utcnow placeholders, since systemd performs its own
-            %-based variable replacement even in quoted text. To avoid interference from systemd,
-            double all percent signs (``{hostname}-{now:%Y-%m-%d_%H:%M:%S}``
-            becomes ``{hostname}-{now:%%Y-%%m-%%d_%%H:%%M:%%S}``).\n\n''')
-    helptext['compression'] = textwrap.dedent('''
-        It is no problem to mix different compression methods in one repo,
-        deduplication is done on the source data chunks (not on the compressed
-        or encrypted data).
-
-        If some specific chunk was once compressed and stored into the repo, creating
-        another backup that also uses this chunk will not change the stored chunk.
-        So if you use different compression specs for the backups, whichever stores a
-        chunk first determines its compression. See also borg recreate.
-
-        Compression is lz4 by default. If you want something else, you have to specify what you want.
-
-        Valid compression specifiers are:
-
-        none
-            Do not compress.
-
-        lz4
-            Use lz4 compression. Very high speed, very low compression. (default)
-
-        zstd[,L]
-            Use zstd ("zstandard") compression, a modern wide-range algorithm.
-            If you do not explicitly give the compression level L (ranging from 1
-            to 22), it will use level 3.
-            Archives compressed with zstd are not compatible with borg < 1.1.4.
-
-        zlib[,L]
-            Use zlib ("gz") compression. Medium speed, medium compression.
-            If you do not explicitly give the compression level L (ranging from 0
-            to 9), it will use level 6.
-            Giving level 0 (means "no compression", but still has zlib protocol
-            overhead) is usually pointless, you better use "none" compression.
-
-        lzma[,L]
-            Use lzma ("xz") compression. Low speed, high compression.
-            If you do not explicitly give the compression level L (ranging from 0
-            to 9), it will use level 6.
-            Giving levels above 6 is pointless and counterproductive because it does
-            not compress better due to the buffer size used by borg - but it wastes
-            lots of CPU cycles and RAM.
-
-        auto,C[,L]
-            Use a built-in heuristic to decide per chunk whether to compress or not.
-            The heuristic tries with lz4 whether the data is compressible.
-            For incompressible data, it will not use compression (uses "none").
-            For compressible data, it uses the given C[,L] compression - with C[,L]
-            being any valid compression specifier.
-
-        obfuscate,SPEC,C[,L]
-            Use compressed-size obfuscation to make fingerprinting attacks based on
-            the observable stored chunk size more difficult.
-            Note:
-            - you must combine this with encryption or it won't make any sense.
-            - your repo size will be bigger, of course.
-
-            The SPEC value will determine how the size obfuscation will work:
-
-            Relative random reciprocal size variation:
-            Size will increase by a factor, relative to the compressed data size.
-            Smaller factors are often used, larger factors rarely.
-            1: factor 0.01 .. 100.0
-            2: factor 0.1 .. 1000.0
-            3: factor 1.0 .. 10000.0
-            4: factor 10.0 .. 100000.0
-            5: factor 100.0 .. 1000000.0
-            6: factor 1000.0 .. 10000000.0
-
-            Add a randomly sized padding up to the given size:
-            110: 1kiB
-            ...
-            120: 1MiB
-            ...
-            123: 8MiB (max.)
-
-        Examples::
-
-            borg create --compression lz4 REPO::ARCHIVE data
-            borg create --compression zstd REPO::ARCHIVE data
-            borg create --compression zstd,10 REPO::ARCHIVE data
-            borg create --compression zlib REPO::ARCHIVE data
-            borg create --compression zlib,1 REPO::ARCHIVE data
-            borg create --compression auto,lzma,6 REPO::ARCHIVE data
-            borg create --compression auto,lzma ...
-            borg create --compression obfuscate,3,none ...
-            borg create --compression obfuscate,3,auto,zstd,10 ...
-            borg create --compression obfuscate,2,zstd,6 ...\n\n''')
+The patternfile::
+
+    # note that excludes use fm: by default and patternfiles use sh: by default.
+    # therefore, we need to specify fm: to have the same exact behavior.
+    P fm
+    R /home/bobby
+    R /home/susan
+
+    - /home/bobby/junk
+
+This allows you to share the same patterns between multiple repositories
+without needing to specify them on the command line.\n\n'''
+    helptext['placeholders'] = '''
+Repository (or Archive) URLs, ``--prefix``, ``--glob-archives``, ``--comment``
+and ``--remote-path`` values support these placeholders:
+
+{hostname}
+    The (short) hostname of the machine.
+
+{fqdn}
+    The full name of the machine.
+
+{reverse-fqdn}
+    The full name of the machine in reverse domain name notation.
+
+{now}
+    The current local date and time, by default in ISO-8601 format.
+    You can also supply your own `format string <https://docs.python.org/3.9/library/datetime.html#strftime-and-strptime-behavior>`_, e.g. {now:%Y-%m-%d_%H:%M:%S}
+
+{utcnow}
+    The current UTC date and time, by default in ISO-8601 format.
+    You can also supply your own `format string <https://docs.python.org/3.9/library/datetime.html#strftime-and-strptime-behavior>`_, e.g. {utcnow:%Y-%m-%d_%H:%M:%S}
+
+{user}
+    The user name (or UID, if no name is available) of the user running borg.
+
+{pid}
+    The current process ID.
+
+{borgversion}
+    The version of borg, e.g.: 1.0.8rc1
+
+{borgmajor}
+    The version of borg, only the major version, e.g.: 1
+
+{borgminor}
+    The version of borg, only major and minor version, e.g.: 1.0
+
+{borgpatch}
+    The version of borg, only major, minor and patch version, e.g.: 1.0.8
+
+If literal curly braces need to be used, double them for escaping::
+
+    borg create /path/to/repo::{{literal_text}}
+
+Examples::
+
+    borg create /path/to/repo::{hostname}-{user}-{utcnow} ...
+    borg create /path/to/repo::{hostname}-{now:%Y-%m-%d_%H:%M:%S} ...
+    borg prune --prefix '{hostname}-' ...
+
+.. note::
+    systemd uses a difficult, non-standard syntax for command lines in unit files (refer to
+    the `systemd.unit(5)` manual page).
+
+    When invoking borg from unit files, pay particular attention to escaping,
+    especially when using the now/utcnow placeholders, since systemd performs its own
+    %-based variable replacement even in quoted text. To avoid interference from systemd,
+    double all percent signs (``{hostname}-{now:%Y-%m-%d_%H:%M:%S}``
+    becomes ``{hostname}-{now:%%Y-%%m-%%d_%%H:%%M:%%S}``).\n\n'''
+    helptext['compression'] = '''
+It is no problem to mix different compression methods in one repo,
+deduplication is done on the source data chunks (not on the compressed
+or encrypted data).
+
+If some specific chunk was once compressed and stored into the repo, creating
+another backup that also uses this chunk will not change the stored chunk.
+So if you use different compression specs for the backups, whichever stores a
+chunk first determines its compression. See also borg recreate.
+
+Compression is lz4 by default. If you want something else, you have to specify what you want.
+
+Valid compression specifiers are:
+
+none
+    Do not compress.
+
+lz4
+    Use lz4 compression. Very high speed, very low compression. (default)
+
+zstd[,L]
+    Use zstd ("zstandard") compression, a modern wide-range algorithm.
+    If you do not explicitly give the compression level L (ranging from 1
+    to 22), it will use level 3.
+    Archives compressed with zstd are not compatible with borg < 1.1.4.
+
+zlib[,L]
+    Use zlib ("gz") compression. Medium speed, medium compression.
+    If you do not explicitly give the compression level L (ranging from 0
+    to 9), it will use level 6.
+    Giving level 0 (means "no compression", but still has zlib protocol
+    overhead) is usually pointless, you better use "none" compression.
+
+lzma[,L]
+    Use lzma ("xz") compression. Low speed, high compression.
+    If you do not explicitly give the compression level L (ranging from 0
+    to 9), it will use level 6.
+    Giving levels above 6 is pointless and counterproductive because it does
+    not compress better due to the buffer size used by borg - but it wastes
+    lots of CPU cycles and RAM.
+
+auto,C[,L]
+    Use a built-in heuristic to decide per chunk whether to compress or not.
+    The heuristic tries with lz4 whether the data is compressible.
+    For incompressible data, it will not use compression (uses "none").
+    For compressible data, it uses the given C[,L] compression - with C[,L]
+    being any valid compression specifier.
+
+obfuscate,SPEC,C[,L]
+    Use compressed-size obfuscation to make fingerprinting attacks based on
+    the observable stored chunk size more difficult.
+    Note:
+    - you must combine this with encryption or it won't make any sense.
+    - your repo size will be bigger, of course.
+
+    The SPEC value will determine how the size obfuscation will work:
+
+    Relative random reciprocal size variation:
+    Size will increase by a factor, relative to the compressed data size.
+    Smaller factors are often used, larger factors rarely.
+    1: factor 0.01 .. 100.0
+    2: factor 0.1 .. 1000.0
+    3: factor 1.0 .. 10000.0
+    4: factor 10.0 .. 100000.0
+    5: factor 100.0 .. 1000000.0
+    6: factor 1000.0 .. 10000000.0
+
+    Add a randomly sized padding up to the given size:
+    110: 1kiB
+    ...
+    120: 1MiB
+    ...
+    123: 8MiB (max.)
+
+Examples::
+
+    borg create --compression lz4 REPO::ARCHIVE data
+    borg create --compression zstd REPO::ARCHIVE data
+    borg create --compression zstd,10 REPO::ARCHIVE data
+    borg create --compression zlib REPO::ARCHIVE data
+    borg create --compression zlib,1 REPO::ARCHIVE data
+    borg create --compression auto,lzma,6 REPO::ARCHIVE data
+    borg create --compression auto,lzma ...
+    borg create --compression obfuscate,3,none ...
+    borg create --compression obfuscate,3,auto,zstd,10 ...
+    borg create --compression obfuscate,2,zstd,6 ...\n\n'''
 
     def do_help(self, parser, commands, args):
         if not args.topic:
@@ -2902,32 +4122,6 @@ def resolve(self, args: argparse.Namespace):  # Namespace has "in" but otherwise
                 setattr(args, dest, option_value)
 
     def build_parser(self):
-        # You can use :ref:`xyz` in the following usage pages. However, for plain-text view,
-        # e.g. through "borg ... --help", define a substitution for the reference here.
-        # It will replace the entire :ref:`foo` verbatim.
-        rst_plain_text_references = {
-            'a_status_oddity': '"I am seeing ‘A’ (added) status for a unchanged file!?"',
-            'separate_compaction': '"Separate compaction"',
-            'list_item_flags': '"Item flags"',
-            'borg_patterns': '"borg help patterns"',
-            'borg_placeholders': '"borg help placeholders"',
-            'key_files': 'Internals -> Data structures and file formats -> Key files',
-            'borg_key_export': 'borg key export --help',
-        }
-
-        def process_epilog(epilog):
-            epilog = textwrap.dedent(epilog).splitlines()
-            try:
-                mode = borg.doc_mode
-            except AttributeError:
-                mode = 'command-line'
-            if mode in ('command-line', 'build_usage'):
-                epilog = [line for line in epilog if not line.startswith('.. man')]
-            epilog = '\n'.join(epilog)
-            if mode == 'command-line':
-                epilog = rst_to_terminal(epilog, rst_plain_text_references)
-            return epilog
-
         def define_common_options(add_common_option):
             add_common_option('-h', '--help', action='help', help='show this help message and exit')
             add_common_option('--critical', dest='log_level',
@@ -3012,6 +4206,16 @@ def define_exclude_and_patterns(add_option, *, tag_files=False, strip_components
                            help='Remove the specified number of leading path elements. '
                                 'Paths with fewer elements will be silently skipped.')
 
+        def define_numeric_ids_options(add_option, help):
+            add_option('--numeric-owner', dest='numeric_ids', action='store_true',
+                       help='deprecated, use ``--numeric-ids`` instead')
+            add_option('--numeric-ids', dest='numeric_ids', action='store_true', help=help)
+
+        def define_noflags_options(add_option, help):
+            add_option('--nobsdflags', dest='nobsdflags', action='store_true',
+                       help='deprecated, use ``--noflags`` instead')
+            add_option('--noflags', dest='noflags', action='store_true', help=help)
+
         def define_exclusion_group(subparser, **kwargs):
             exclude_group = subparser.add_argument_group('Exclusion options')
             define_exclude_and_patterns(exclude_group.add_argument, **kwargs)
@@ -3030,11 +4234,9 @@ def define_archive_filters_group(subparser, *, sort_by=True, first_last=True):
                                     '``--prefix`` and ``--glob-archives`` are mutually exclusive.')
 
             if sort_by:
-                sort_by_default = 'timestamp'
                 filters_group.add_argument('--sort-by', metavar='KEYS', dest='sort_by',
-                                           type=SortBySpec, default=sort_by_default,
-                                           help='Comma-separated list of sorting keys; valid keys are: {}; default is: {}'
-                                           .format(', '.join(AI_HUMAN_SORT_KEYS), sort_by_default))
+                                           type=SortBySpec, default=SORT_BY_DEFAULT,
+                                           help=SORT_BY_HELP)
 
             if first_last:
                 group = filters_group.add_mutually_exclusive_group()
@@ -3056,10 +4258,8 @@ def define_borg_mount(parser):
                                 help='stay in foreground, do not daemonize')
             parser.add_argument('-o', dest='options', type=str, action=Highlander,
                                 help='Extra mount options')
-            parser.add_argument('--numeric-owner', dest='numeric_ids', action='store_true',
-                                  help='deprecated, use ``--numeric-ids`` instead')
-            parser.add_argument('--numeric-ids', dest='numeric_ids', action='store_true',
-                                  help='use numeric user and group identifiers from archive(s)')
+            define_numeric_ids_options(parser.add_argument,
+                                       help='use numeric user and group identifiers from archive(s)')
             define_archive_filters_group(parser)
             parser.add_argument('paths', metavar='PATH', nargs='*', type=str,
                                    help='paths to extract; patterns are supported')
@@ -3076,1944 +4276,888 @@ def define_borg_mount(parser):
                             help='show version number and exit')
         parser.common_options.add_common_group(parser, '_maincommand', provide_defaults=True)
 
-        common_parser = argparse.ArgumentParser(add_help=False, prog=self.prog)
-        common_parser.set_defaults(paths=[], patterns=[])
-        parser.common_options.add_common_group(common_parser, '_subcommand')
-
-        mid_common_parser = argparse.ArgumentParser(add_help=False, prog=self.prog)
-        mid_common_parser.set_defaults(paths=[], patterns=[])
-        parser.common_options.add_common_group(mid_common_parser, '_midcommand')
-
         # borg mount
-        mount_epilog = process_epilog("""
-        This command mounts an archive as a FUSE filesystem. This can be useful for
-        browsing an archive or restoring individual files. Unless the ``--foreground``
-        option is given the command will run in the background until the filesystem
-        is ``umounted``.
-
-        The command ``borgfs`` provides a wrapper for ``borg mount``. This can also be
-        used in fstab entries:
-        ``/path/to/repo /mnt/point fuse.borgfs defaults,noauto 0 0``
-
-        To allow a regular user to use fstab entries, add the ``user`` option:
-        ``/path/to/repo /mnt/point fuse.borgfs defaults,noauto,user 0 0``
-
-        For FUSE configuration and mount options, see the mount.fuse(8) manual page.
-
-        Borg's default behavior is to use the archived user and group names of each
-        file and map them to the system's respective user and group ids.
-        Alternatively, using ``numeric-ids`` will instead use the archived user and
-        group ids without any mapping.
-
-        The ``uid`` and ``gid`` mount options (implemented by Borg) can be used to
-        override the user and group ids of all files (i.e., ``borg mount -o
-        uid=1000,gid=1000``).
-
-        The man page references ``user_id`` and ``group_id`` mount options
-        (implemented by fuse) which specify the user and group id of the mount owner
-        (aka, the user who does the mounting). It is set automatically by libfuse (or
-        the filesystem if libfuse is not used). However, you should not specify these
-        manually. Unlike the ``uid`` and ``gid`` mount options which affect all files,
-        ``user_id`` and ``group_id`` affect the user and group id of the mounted
-        (base) directory.
-
-        Additional mount options supported by borg:
-
-        - versions: when used with a repository mount, this gives a merged, versioned
-          view of the files in the archives. EXPERIMENTAL, layout may change in future.
-        - allow_damaged_files: by default damaged files (where missing chunks were
-          replaced with runs of zeros by borg check ``--repair``) are not readable and
-          return EIO (I/O error). Set this option to read such files.
-        - ignore_permissions: for security reasons the "default_permissions" mount
-          option is internally enforced by borg. "ignore_permissions" can be given to
-          not enforce "default_permissions".
-
-        The BORG_MOUNT_DATA_CACHE_ENTRIES environment variable is meant for advanced users
-        to tweak the performance. It sets the number of cached data chunks; additional
-        memory usage can be up to ~8 MiB times this number. The default is the number
-        of CPU cores.
-
-        When the daemonized process receives a signal or crashes, it does not unmount.
-        Unmounting in these cases could cause an active rsync or similar process
-        to unintentionally delete data.
-
-        When running in the foreground ^C/SIGINT unmounts cleanly, but other
-        signals or crashes do not.
-        """)
-
         if parser.prog == 'borgfs':
             parser.description = self.do_mount.__doc__
-            parser.epilog = mount_epilog
+            parser.epilog = process_epilog(MOUNT_EPILOG)
             parser.formatter_class = argparse.RawDescriptionHelpFormatter
             parser.help = 'mount repository'
             define_borg_mount(parser)
             return parser
 
-        subparsers = parser.add_subparsers(title='required arguments', metavar='<command>')
+        # the common options of each level are defined once, on these parents: argparse adds the
+        # parent's actions by reference to every subcommand parser using parents=[...].
+        common_parser = argparse.ArgumentParser(add_help=False, prog=self.prog)
+        common_parser.set_defaults(paths=[], patterns=[])
+        parser.common_options.add_common_group(common_parser, '_subcommand')
+
+        mid_common_parser = argparse.ArgumentParser(add_help=False, prog=self.prog)
+        mid_common_parser.set_defaults(paths=[], patterns=[])
+        parser.common_options.add_common_group(mid_common_parser, '_midcommand')
+
+        subparsers = parser.add_subparsers(title='required arguments', metavar='<command>',
+                                           action=LazySubParsersAction)
 
         # borg benchmark
-        benchmark_epilog = process_epilog("These commands do various benchmarks.")
-
-        subparser = subparsers.add_parser('benchmark', parents=[mid_common_parser], add_help=False,
-                                          description='benchmark command',
-                                          epilog=benchmark_epilog,
-                                          formatter_class=argparse.RawDescriptionHelpFormatter,
-                                          help='benchmark command')
-
-        benchmark_parsers = subparser.add_subparsers(title='required arguments', metavar='<command>')
-        subparser.set_defaults(fallback_func=functools.partial(self.do_subcommand_help, subparser))
-
-        bench_crud_epilog = process_epilog("""
-        This command benchmarks borg CRUD (create, read, update, delete) operations.
-
-        It creates input data below the given PATH and backups this data into the given REPO.
-        The REPO must already exist (it could be a fresh empty repo or an existing repo, the
-        command will create / read / update / delete some archives named borg-benchmark-crud\\* there.
-
-        Make sure you have free space there, you'll need about 1GB each (+ overhead).
-
-        If your repository is encrypted and borg needs a passphrase to unlock the key, use::
-
-            BORG_PASSPHRASE=mysecret borg benchmark crud REPO PATH
-
-        Measurements are done with different input file sizes and counts.
-        The file contents are very artificial (either all zero or all random),
-        thus the measurement results do not necessarily reflect performance with real data.
-        Also, due to the kind of content used, no compression is used in these benchmarks.
-
-        C- == borg create (1st archive creation, no compression, do not use files cache)
-              C-Z- == all-zero files. full dedup, this is primarily measuring reader/chunker/hasher.
-              C-R- == random files. no dedup, measuring throughput through all processing stages.
-
-        R- == borg extract (extract archive, dry-run, do everything, but do not write files to disk)
-              R-Z- == all zero files. Measuring heavily duplicated files.
-              R-R- == random files. No duplication here, measuring throughput through all processing
-              stages, except writing to disk.
-
-        U- == borg create (2nd archive creation of unchanged input files, measure files cache speed)
-              The throughput value is kind of virtual here, it does not actually read the file.
-              U-Z- == needs to check the 2 all-zero chunks' existence in the repo.
-              U-R- == needs to check existence of a lot of different chunks in the repo.
-
-        D- == borg delete archive (delete last remaining archive, measure deletion + compaction)
-              D-Z- == few chunks to delete / few segments to compact/remove.
-              D-R- == many chunks to delete / many segments to compact/remove.
-
-        Please note that there might be quite some variance in these measurements.
-        Try multiple measurements and having a otherwise idle machine (and network, if you use it).
-        """)
-        subparser = benchmark_parsers.add_parser('crud', parents=[common_parser], add_help=False,
-                                                 description=self.do_benchmark_crud.__doc__,
-                                                 epilog=bench_crud_epilog,
-                                                 formatter_class=argparse.RawDescriptionHelpFormatter,
-                                                 help='benchmarks borg CRUD (create, extract, update, delete).')
-        subparser.set_defaults(func=self.do_benchmark_crud)
-
-        subparser.add_argument('location', metavar='REPOSITORY',
-                               type=location_validator(archive=False),
-                               help='repository to use for benchmark (must exist)')
-
-        subparser.add_argument('path', metavar='PATH', help='path were to create benchmark input data')
-
-        bench_cpu_epilog = process_epilog("""
-        This command benchmarks misc. CPU bound borg operations.
-
-        It creates input data in memory, runs the operation and then displays throughput.
-        To reduce outside influence on the timings, please make sure to run this with:
-        - an otherwise as idle as possible machine
-        - enough free memory so there will be no slow down due to paging activity
-        """)
-        subparser = benchmark_parsers.add_parser('cpu', parents=[common_parser], add_help=False,
-                                                 description=self.do_benchmark_cpu.__doc__,
-                                                 epilog=bench_cpu_epilog,
-                                                 formatter_class=argparse.RawDescriptionHelpFormatter,
-                                                 help='benchmarks borg CPU bound operations.')
-        subparser.set_defaults(func=self.do_benchmark_cpu)
+        @subparsers.lazy_parser('benchmark', parents=[mid_common_parser], add_help=False,
+                                description='benchmark command',
+                                epilog=process_epilog(BENCHMARK_EPILOG),
+                                formatter_class=argparse.RawDescriptionHelpFormatter,
+                                help='benchmark command')
+        def define_borg_benchmark(subparser):
+            benchmark_parsers = subparser.add_subparsers(title='required arguments', metavar='<command>',
+                                                         action=LazySubParsersAction)
+            subparser.set_defaults(fallback_func=functools.partial(self.do_subcommand_help, subparser))
+
+            @benchmark_parsers.lazy_parser('crud', parents=[common_parser], add_help=False,
+                                           func=self.do_benchmark_crud,
+                                           epilog=process_epilog(BENCHMARK_CRUD_EPILOG),
+                                           formatter_class=argparse.RawDescriptionHelpFormatter,
+                                           help='benchmarks borg CRUD (create, extract, update, delete).')
+            def define_borg_benchmark_crud(subparser):
+
+                subparser.add_argument('location', metavar='REPOSITORY',
+                                       type=location_validator(archive=False),
+                                       help='repository to use for benchmark (must exist)')
+
+                subparser.add_argument('path', metavar='PATH', help='path were to create benchmark input data')
+
+            @benchmark_parsers.lazy_parser('cpu', parents=[common_parser], add_help=False,
+                                           func=self.do_benchmark_cpu,
+                                           epilog=process_epilog(BENCHMARK_CPU_EPILOG),
+                                           formatter_class=argparse.RawDescriptionHelpFormatter,
+                                           help='benchmarks borg CPU bound operations.')
+            def define_borg_benchmark_cpu(subparser):
+                pass  # only the common options
 
         # borg break-lock
-        break_lock_epilog = process_epilog("""
-        This command breaks the repository and cache locks.
-        Please use carefully and only while no borg process (on any machine) is
-        trying to access the Cache or the Repository.
-        """)
-        subparser = subparsers.add_parser('break-lock', parents=[common_parser], add_help=False,
-                                          description=self.do_break_lock.__doc__,
-                                          epilog=break_lock_epilog,
-                                          formatter_class=argparse.RawDescriptionHelpFormatter,
-                                          help='break repository and cache locks')
-        subparser.set_defaults(func=self.do_break_lock)
-        subparser.add_argument('location', metavar='REPOSITORY', nargs='?', default='',
-                               type=location_validator(archive=False),
-                               help='repository for which to break the locks')
+        @subparsers.lazy_parser('break-lock', parents=[common_parser], add_help=False,
+                                func=self.do_break_lock,
+                                epilog=process_epilog(BREAK_LOCK_EPILOG),
+                                formatter_class=argparse.RawDescriptionHelpFormatter,
+                                help='break repository and cache locks')
+        def define_borg_break_lock(subparser):
+            subparser.add_argument('location', metavar='REPOSITORY', nargs='?', default='',
+                                   type=location_validator(archive=False),
+                                   help='repository for which to break the locks')
 
         # borg check
-        check_epilog = process_epilog("""
-        The check command verifies the consistency of a repository and the corresponding archives.
-
-        check --repair is a potentially dangerous function and might lead to data loss
-        (for kinds of corruption it is not capable of dealing with). BE VERY CAREFUL!
-
-        Pursuant to the previous warning it is also highly recommended to test the
-        reliability of the hardware running this software with stress testing software
-        such as memory testers. Unreliable hardware can also lead to data loss especially
-        when this command is run in repair mode.
-
-        First, the underlying repository data files are checked:
-
-        - For all segments, the segment magic header is checked.
-        - For all objects stored in the segments, all metadata (e.g. CRC and size) and
-          all data is read. The read data is checked by size and CRC. Bit rot and other
-          types of accidental damage can be detected this way.
-        - In repair mode, if an integrity error is detected in a segment, try to recover
-          as many objects from the segment as possible.
-        - In repair mode, make sure that the index is consistent with the data stored in
-          the segments.
-        - If checking a remote repo via ``ssh:``, the repo check is executed on the server
-          without causing significant network traffic.
-        - The repository check can be skipped using the ``--archives-only`` option.
-        - A repository check can be time consuming. Partial checks are possible with the
-          ``--max-duration`` option.
-
-        Second, the consistency and correctness of the archive metadata is verified:
-
-        - Is the repo manifest present? If not, it is rebuilt from archive metadata
-          chunks (this requires reading and decrypting of all metadata and data).
-        - Check if archive metadata chunk is present; if not, remove archive from manifest.
-        - For all files (items) in the archive, for all chunks referenced by these
-          files, check if chunk is present. In repair mode, if a chunk is not present,
-          replace it with a same-size replacement chunk of zeroes. If a previously lost
-          chunk reappears (e.g. via a later backup), in repair mode the all-zero replacement
-          chunk will be replaced by the correct chunk. This requires reading of archive and
-          file metadata, but not data.
-        - In repair mode, when all the archives were checked, orphaned chunks are deleted
-          from the repo. One cause of orphaned chunks are input file related errors (like
-          read errors) in the archive creation process.
-        - In verify-data mode, a complete cryptographic verification of the archive data
-          integrity is performed. This conflicts with ``--repository-only`` as this mode
-          only makes sense if the archive checks are enabled. The full details of this mode
-          are documented below.
-        - If checking a remote repo via ``ssh:``, the archive check is executed on the
-          client machine because it requires decryption, and this is always done client-side
-          as key access is needed.
-        - The archive checks can be time consuming; they can be skipped using the
-          ``--repository-only`` option.
-
-        The ``--max-duration`` option can be used to split a long-running repository check
-        into multiple partial checks. After the given number of seconds the check is
-        interrupted. The next partial check will continue where the previous one stopped,
-        until the complete repository has been checked. Example: Assuming a full check took 7
-        hours, then running a daily check with --max-duration=3600 (1 hour) resulted in one
-        full check per week.
-
-        Attention: Partial checks can only do way less checking than a full check (only the
-        CRC32 checks on segment file entries are done), and cannot be combined with the
-        ``--repair`` option. Partial checks may therefore be useful only with very large
-        repositories where a full check took too long. Doing a full repository check aborts a
-        partial check; the next partial check will restart from the beginning.
-
-        The ``--verify-data`` option will perform a full integrity verification (as opposed to
-        checking the CRC32 of the segment) of data, which means reading the data from the
-        repository, decrypting and decompressing it. This is a cryptographic verification,
-        which will detect (accidental) corruption. For encrypted repositories it is
-        tamper-resistant as well, unless the attacker has access to the keys. It is also very
-        slow.
-        """)
-        subparser = subparsers.add_parser('check', parents=[common_parser], add_help=False,
-                                          description=self.do_check.__doc__,
-                                          epilog=check_epilog,
-                                          formatter_class=argparse.RawDescriptionHelpFormatter,
-                                          help='verify repository')
-        subparser.set_defaults(func=self.do_check)
-        subparser.add_argument('location', metavar='REPOSITORY_OR_ARCHIVE', nargs='?', default='',
-                               type=location_validator(),
-                               help='repository or archive to check consistency of')
-        subparser.add_argument('--repository-only', dest='repo_only', action='store_true',
-                               help='only perform repository checks')
-        subparser.add_argument('--archives-only', dest='archives_only', action='store_true',
-                               help='only perform archives checks')
-        subparser.add_argument('--verify-data', dest='verify_data', action='store_true',
-                               help='perform cryptographic archive data integrity verification '
-                                    '(conflicts with ``--repository-only``)')
-        subparser.add_argument('--repair', dest='repair', action='store_true',
-                               help='attempt to repair any inconsistencies found')
-        subparser.add_argument('--save-space', dest='save_space', action='store_true',
-                               help='work slower, but using less space')
-        subparser.add_argument('--max-duration', metavar='SECONDS', dest='max_duration',
-                                   type=int, default=0,
-                                   help='do only a partial repo check for max. SECONDS seconds (Default: unlimited)')
-        define_archive_filters_group(subparser)
+        @subparsers.lazy_parser('check', parents=[common_parser], add_help=False,
+                                func=self.do_check,
+                                epilog=process_epilog(CHECK_EPILOG),
+                                formatter_class=argparse.RawDescriptionHelpFormatter,
+                                help='verify repository')
+        def define_borg_check(subparser):
+            subparser.add_argument('location', metavar='REPOSITORY_OR_ARCHIVE', nargs='?', default='',
+                                   type=location_validator(),
+                                   help='repository or archive to check consistency of')
+            subparser.add_argument('--repository-only', dest='repo_only', action='store_true',
+                                   help='only perform repository checks')
+            subparser.add_argument('--archives-only', dest='archives_only', action='store_true',
+                                   help='only perform archives checks')
+            subparser.add_argument('--verify-data', dest='verify_data', action='store_true',
+                                   help='perform cryptographic archive data integrity verification '
+                                        '(conflicts with ``--repository-only``)')
+            subparser.add_argument('--repair', dest='repair', action='store_true',
+                                   help='attempt to repair any inconsistencies found')
+            subparser.add_argument('--save-space', dest='save_space', action='store_true',
+                                   help='work slower, but using less space')
+            subparser.add_argument('--max-duration', metavar='SECONDS', dest='max_duration',
+                                       type=int, default=0,
+                                       help='do only a partial repo check for max. SECONDS seconds (Default: unlimited)')
+            define_archive_filters_group(subparser)
 
         # borg compact
-        compact_epilog = process_epilog("""
-        This command frees repository space by compacting segments.
-
-        Use this regularly to avoid running out of space - you do not need to use this
-        after each borg command though. It is especially useful after deleting archives,
-        because only compaction will really free repository space.
-
-        borg compact does not need a key, so it is possible to invoke it from the
-        client or also from the server.
-
-        Depending on the amount of segments that need compaction, it may take a while,
-        so consider using the ``--progress`` option.
-
-        A segment is compacted if the amount of saved space is above the percentage value
-        given by the ``--threshold`` option. If omitted, a threshold of 10% is used.
-        When using ``--verbose``, borg will output an estimate of the freed space.
-
-        After upgrading borg (server) to 1.2+, you can use ``borg compact --cleanup-commits``
-        to clean up the numerous 17byte commit-only segments that borg 1.1 did not clean up
-        due to a bug. It is enough to do that once per repository.
-
-        See :ref:`separate_compaction` in Additional Notes for more details.
-        """)
-        subparser = subparsers.add_parser('compact', parents=[common_parser], add_help=False,
-                                          description=self.do_compact.__doc__,
-                                          epilog=compact_epilog,
-                                          formatter_class=argparse.RawDescriptionHelpFormatter,
-                                          help='compact segment files / free space in repo')
-        subparser.set_defaults(func=self.do_compact)
-        subparser.add_argument('location', metavar='REPOSITORY', nargs='?', default='',
-                               type=location_validator(archive=False),
-                               help='repository to compact')
-        subparser.add_argument('--cleanup-commits', dest='cleanup_commits', action='store_true',
-                               help='cleanup commit-only 17-byte segment files')
-        subparser.add_argument('--threshold', metavar='PERCENT', dest='threshold',
-                               type=int, default=10,
-                               help='set minimum threshold for saved space in PERCENT (Default: 10)')
+        @subparsers.lazy_parser('compact', parents=[common_parser], add_help=False,
+                                func=self.do_compact,
+                                epilog=process_epilog(COMPACT_EPILOG),
+                                formatter_class=argparse.RawDescriptionHelpFormatter,
+                                help='compact segment files / free space in repo')
+        def define_borg_compact(subparser):
+            subparser.add_argument('location', metavar='REPOSITORY', nargs='?', default='',
+                                   type=location_validator(archive=False),
+                                   help='repository to compact')
+            subparser.add_argument('--cleanup-commits', dest='cleanup_commits', action='store_true',
+                                   help='cleanup commit-only 17-byte segment files')
+            subparser.add_argument('--threshold', metavar='PERCENT', dest='threshold',
+                                   type=int, default=10,
+                                   help='set minimum threshold for saved space in PERCENT (Default: 10)')
 
         # borg config
-        config_epilog = process_epilog("""
-        This command gets and sets options in a local repository or cache config file.
-        For security reasons, this command only works on local repositories.
-
-        To delete a config value entirely, use ``--delete``. To list the values
-        of the configuration file or the default values, use ``--list``.  To get and existing
-        key, pass only the key name. To set a key, pass both the key name and
-        the new value. Keys can be specified in the format "section.name" or
-        simply "name"; the section will default to "repository" and "cache" for
-        the repo and cache configs, respectively.
-
-
-        By default, borg config manipulates the repository config file. Using ``--cache``
-        edits the repository cache's config file instead.
-        """)
-        subparser = subparsers.add_parser('config', parents=[common_parser], add_help=False,
-                                          description=self.do_config.__doc__,
-                                          epilog=config_epilog,
-                                          formatter_class=argparse.RawDescriptionHelpFormatter,
-                                          help='get and set configuration values')
-        subparser.set_defaults(func=self.do_config)
-        subparser.add_argument('-c', '--cache', dest='cache', action='store_true',
-                               help='get and set values from the repo cache')
-
-        group = subparser.add_mutually_exclusive_group()
-        group.add_argument('-d', '--delete', dest='delete', action='store_true',
-                               help='delete the key from the config file')
-        group.add_argument('-l', '--list', dest='list', action='store_true',
-                               help='list the configuration of the repo')
-
-        subparser.add_argument('location', metavar='REPOSITORY', nargs='?', default='',
-                               type=location_validator(archive=False, proto='file'),
-                               help='repository to configure')
-        subparser.add_argument('name', metavar='NAME', nargs='?',
-                               help='name of config key')
-        subparser.add_argument('value', metavar='VALUE', nargs='?',
-                               help='new value for key')
+        @subparsers.lazy_parser('config', parents=[common_parser], add_help=False,
+                                func=self.do_config,
+                                epilog=process_epilog(CONFIG_EPILOG),
+                                formatter_class=argparse.RawDescriptionHelpFormatter,
+                                help='get and set configuration values')
+        def define_borg_config(subparser):
+            subparser.add_argument('-c', '--cache', dest='cache', action='store_true',
+                                   help='get and set values from the repo cache')
+
+            group = subparser.add_mutually_exclusive_group()
+            group.add_argument('-d', '--delete', dest='delete', action='store_true',
+                                   help='delete the key from the config file')
+            group.add_argument('-l', '--list', dest='list', action='store_true',
+                                   help='list the configuration of the repo')
+
+            subparser.add_argument('location', metavar='REPOSITORY', nargs='?', default='',
+                                   type=location_validator(archive=False, proto='file'),
+                                   help='repository to configure')
+            subparser.add_argument('name', metavar='NAME', nargs='?',
+                                   help='name of config key')
+            subparser.add_argument('value', metavar='VALUE', nargs='?',
+                                   help='new value for key')
 
         # borg create
-        create_epilog = process_epilog("""
-        This command creates a backup archive containing all files found while recursively
-        traversing all paths specified. Paths are added to the archive as they are given,
-        that means if relative paths are desired, the command has to be run from the correct
-        directory.
-
-        When giving '-' as path, borg will read data from standard input and create a
-        file 'stdin' in the created archive from that data. In some cases it's more
-        appropriate to use --content-from-command, however. See section *Reading from
-        stdin* below for details.
-
-        The archive will consume almost no disk space for files or parts of files that
-        have already been stored in other archives.
-
-        The archive name needs to be unique. It must not end in '.checkpoint' or
-        '.checkpoint.N' (with N being a number), because these names are used for
-        checkpoints and treated in special ways.
-
-        In the archive name, you may use the following placeholders:
-        {now}, {utcnow}, {fqdn}, {hostname}, {user} and some others.
-
-        Backup speed is increased by not reprocessing files that are already part of
-        existing archives and weren't modified. The detection of unmodified files is
-        done by comparing multiple file metadata values with previous values kept in
-        the files cache.
-
-        This comparison can operate in different modes as given by ``--files-cache``:
-
-        - ctime,size,inode (default)
-        - mtime,size,inode (default behaviour of borg versions older than 1.1.0rc4)
-        - ctime,size (ignore the inode number)
-        - mtime,size (ignore the inode number)
-        - rechunk,ctime (all files are considered modified - rechunk, cache ctime)
-        - rechunk,mtime (all files are considered modified - rechunk, cache mtime)
-        - disabled (disable the files cache, all files considered modified - rechunk)
-
-        inode number: better safety, but often unstable on network filesystems
-
-        Normally, detecting file modifications will take inode information into
-        consideration to improve the reliability of file change detection.
-        This is problematic for files located on sshfs and similar network file
-        systems which do not provide stable inode numbers, such files will always
-        be considered modified. You can use modes without `inode` in this case to
-        improve performance, but reliability of change detection might be reduced.
-
-        ctime vs. mtime: safety vs. speed
-
-        - ctime is a rather safe way to detect changes to a file (metadata and contents)
-          as it can not be set from userspace. But, a metadata-only change will already
-          update the ctime, so there might be some unnecessary chunking/hashing even
-          without content changes. Some filesystems do not support ctime (change time).
-          E.g. doing a chown or chmod to a file will change its ctime.
-        - mtime usually works and only updates if file contents were changed. But mtime
-          can be arbitrarily set from userspace, e.g. to set mtime back to the same value
-          it had before a content change happened. This can be used maliciously as well as
-          well-meant, but in both cases mtime based cache modes can be problematic.
-
-        The mount points of filesystems or filesystem snapshots should be the same for every
-        creation of a new archive to ensure fast operation. This is because the file cache that
-        is used to determine changed files quickly uses absolute filenames.
-        If this is not possible, consider creating a bind mount to a stable location.
-
-        The ``--progress`` option shows (from left to right) Original, Compressed and Deduplicated
-        (O, C and D, respectively), then the Number of files (N) processed so far, followed by
-        the currently processed path.
-
-        When using ``--stats``, you will get some statistics about how much data was
-        added - the "This Archive" deduplicated size there is most interesting as that is
-        how much your repository will grow. Please note that the "All archives" stats refer to
-        the state after creation. Also, the ``--stats`` and ``--dry-run`` options are mutually
-        exclusive because the data is not actually compressed and deduplicated during a dry run.
-
-        For more help on include/exclude patterns, see the :ref:`borg_patterns` command output.
-
-        For more help on placeholders, see the :ref:`borg_placeholders` command output.
-
-        .. man NOTES
-
-        The ``--exclude`` patterns are not like tar. In tar ``--exclude`` .bundler/gems will
-        exclude foo/.bundler/gems. In borg it will not, you need to use ``--exclude``
-        '\\*/.bundler/gems' to get the same effect.
-
-        In addition to using ``--exclude`` patterns, it is possible to use
-        ``--exclude-if-present`` to specify the name of a filesystem object (e.g. a file
-        or folder name) which, when contained within another folder, will prevent the
-        containing folder from being backed up.  By default, the containing folder and
-        all of its contents will be omitted from the backup.  If, however, you wish to
-        only include the objects specified by ``--exclude-if-present`` in your backup,
-        and not include any other contents of the containing folder, this can be enabled
-        through using the ``--keep-exclude-tags`` option.
-
-        The ``-x`` or ``--one-file-system`` option excludes directories, that are mountpoints (and everything in them).
-        It detects mountpoints by comparing the device number from the output of ``stat()`` of the directory and its
-        parent directory. Specifically, it excludes directories for which ``stat()`` reports a device number different
-        from the device number of their parent. Be aware that in Linux (and possibly elsewhere) there are directories
-        with device number different from their parent, which the kernel does not consider a mountpoint and also the
-        other way around. Examples are bind mounts (possibly same device number, but always a mountpoint) and ALL
-        subvolumes of a btrfs (different device number from parent but not necessarily a mountpoint). Therefore when
-        using ``--one-file-system``, one should make doubly sure that the backup works as intended especially when using
-        btrfs. This is even more important, if the btrfs layout was created by someone else, e.g. a distribution
-        installer.
-
-
-        .. _list_item_flags:
-
-        Item flags
-        ++++++++++
-
-        ``--list`` outputs a list of all files, directories and other
-        file system items it considered (no matter whether they had content changes
-        or not). For each item, it prefixes a single-letter flag that indicates type
-        and/or status of the item.
-
-        If you are interested only in a subset of that output, you can give e.g.
-        ``--filter=AME`` and it will only show regular files with A, M or E status (see
-        below).
-
-        A uppercase character represents the status of a regular file relative to the
-        "files" cache (not relative to the repo -- this is an issue if the files cache
-        is not used). Metadata is stored in any case and for 'A' and 'M' also new data
-        chunks are stored. For 'U' all data chunks refer to already existing chunks.
-
-        - 'A' = regular file, added (see also :ref:`a_status_oddity` in the FAQ)
-        - 'M' = regular file, modified
-        - 'U' = regular file, unchanged
-        - 'C' = regular file, it changed while we backed it up
-        - 'E' = regular file, an error happened while accessing/reading *this* file
-
-        A lowercase character means a file type other than a regular file,
-        borg usually just stores their metadata:
-
-        - 'd' = directory
-        - 'b' = block device
-        - 'c' = char device
-        - 'h' = regular file, hardlink (to already seen inodes)
-        - 's' = symlink
-        - 'f' = fifo
-
-        Other flags used include:
-
-        - 'i' = backup data was read from standard input (stdin)
-        - '-' = dry run, item was *not* backed up
-        - 'x' = excluded, item was *not* backed up
-        - '?' = missing status code (if you see this, please file a bug report!)
-
-        Reading from stdin
-        ++++++++++++++++++
-
-        There are two methods to read from stdin. Either specify ``-`` as path and
-        pipe directly to borg::
-
-            backup-vm --id myvm --stdout | borg create REPO::ARCHIVE -
-
-        Or use ``--content-from-command`` to have Borg manage the execution of the
-        command and piping. If you do so, the first PATH argument is interpreted
-        as command to execute and any further arguments are treated as arguments
-        to the command::
-
-            borg create --content-from-command REPO::ARCHIVE -- backup-vm --id myvm --stdout
-
-        ``--`` is used to ensure ``--id`` and ``--stdout`` are **not** considered
-        arguments to ``borg`` but rather ``backup-vm``.
-
-        The difference between the two approaches is that piping to borg creates an
-        archive even if the command piping to borg exits with a failure. In this case,
-        **one can end up with truncated output being backed up**. Using
-        ``--content-from-command``, in contrast, borg is guaranteed to fail without
-        creating an archive should the command fail. The command is considered failed
-        when it returned a non-zero exit code.
-
-        Reading from stdin yields just a stream of data without file metadata
-        associated with it, and the files cache is not needed at all. So it is
-        safe to disable it via ``--files-cache disabled`` and speed up backup
-        creation a bit.
-
-        By default, the content read from stdin is stored in a file called 'stdin'.
-        Use ``--stdin-name`` to change the name.
-        """)
-
-        subparser = subparsers.add_parser('create', parents=[common_parser], add_help=False,
-                                          description=self.do_create.__doc__,
-                                          epilog=create_epilog,
-                                          formatter_class=argparse.RawDescriptionHelpFormatter,
-                                          help='create backup')
-        subparser.set_defaults(func=self.do_create)
-
-        # note: --dry-run and --stats are mutually exclusive, but we do not want to abort when
-        #  parsing, but rather proceed with the dry-run, but without stats (see run() method).
-        subparser.add_argument('-n', '--dry-run', dest='dry_run', action='store_true',
-                               help='do not create a backup archive')
-        subparser.add_argument('-s', '--stats', dest='stats', action='store_true',
-                               help='print statistics for the created archive')
-
-        subparser.add_argument('--list', dest='output_list', action='store_true',
-                               help='output verbose list of items (files, dirs, ...)')
-        subparser.add_argument('--filter', metavar='STATUSCHARS', dest='output_filter', action=Highlander,
-                               help='only display items with the given status characters (see description)')
-        subparser.add_argument('--json', action='store_true',
-                               help='output stats as JSON. Implies ``--stats``.')
-        subparser.add_argument('--no-cache-sync', dest='no_cache_sync', action='store_true',
-                               help='experimental: do not synchronize the cache. Implies not using the files cache.')
-        subparser.add_argument('--stdin-name', metavar='NAME', dest='stdin_name', default='stdin',
-                               help='use NAME in archive for stdin data (default: %(default)r)')
-        subparser.add_argument('--stdin-user', metavar='USER', dest='stdin_user', default=uid2user(0),
-                               help='set user USER in archive for stdin data (default: %(default)r)')
-        subparser.add_argument('--stdin-group', metavar='GROUP', dest='stdin_group', default=gid2group(0),
-                               help='set group GROUP in archive for stdin data (default: %(default)r)')
-        subparser.add_argument('--stdin-mode', metavar='M', dest='stdin_mode', type=lambda s: int(s, 8), default=STDIN_MODE_DEFAULT,
-                              help='set mode to M in archive for stdin data (default: %(default)04o)')
-        subparser.add_argument('--content-from-command', action='store_true',
-                               help='interpret PATH as command and store its stdout. See also section Reading from'
-                                    ' stdin below.')
-        subparser.add_argument('--paths-from-stdin', action='store_true',
-                               help='read DELIM-separated list of paths to backup from stdin. Will not '
-                                    'recurse into directories.')
-        subparser.add_argument('--paths-from-command', action='store_true',
-                               help='interpret PATH as command and treat its output as ``--paths-from-stdin``')
-        subparser.add_argument('--paths-delimiter', metavar='DELIM',
-                               help='set path delimiter for ``--paths-from-stdin`` and ``--paths-from-command`` (default: \\n) ')
-
-        exclude_group = define_exclusion_group(subparser, tag_files=True)
-        exclude_group.add_argument('--exclude-nodump', dest='exclude_nodump', action='store_true',
-                                   help='exclude files flagged NODUMP')
-
-        fs_group = subparser.add_argument_group('Filesystem options')
-        fs_group.add_argument('-x', '--one-file-system', dest='one_file_system', action='store_true',
-                              help='stay in the same file system and do not store mount points of other file systems.  This might behave different from your expectations, see the docs.')
-        fs_group.add_argument('--numeric-owner', dest='numeric_ids', action='store_true',
-                              help='deprecated, use ``--numeric-ids`` instead')
-        fs_group.add_argument('--numeric-ids', dest='numeric_ids', action='store_true',
-                              help='only store numeric user and group identifiers')
-        # --noatime is the default now and the flag is deprecated. args.noatime is not used any more.
-        # use --atime if you want to store the atime (default behaviour before borg 1.2.0a7)..
-        fs_group.add_argument('--noatime', dest='noatime', action='store_true',
-                              help='do not store atime into archive')
-        fs_group.add_argument('--atime', dest='atime', action='store_true',
-                              help='do store atime into archive')
-        fs_group.add_argument('--noctime', dest='noctime', action='store_true',
-                              help='do not store ctime into archive')
-        fs_group.add_argument('--nobirthtime', dest='nobirthtime', action='store_true',
-                              help='do not store birthtime (creation date) into archive')
-        fs_group.add_argument('--nobsdflags', dest='nobsdflags', action='store_true',
-                              help='deprecated, use ``--noflags`` instead')
-        fs_group.add_argument('--noflags', dest='noflags', action='store_true',
-                              help='do not read and store flags (e.g. NODUMP, IMMUTABLE) into archive')
-        fs_group.add_argument('--noacls', dest='noacls', action='store_true',
-                              help='do not read and store ACLs into archive')
-        fs_group.add_argument('--noxattrs', dest='noxattrs', action='store_true',
-                              help='do not read and store xattrs into archive')
-        fs_group.add_argument('--sparse', dest='sparse', action='store_true',
-                               help='detect sparse holes in input (supported only by fixed chunker)')
-        fs_group.add_argument('--files-cache', metavar='MODE', dest='files_cache_mode', action=Highlander,
-                              type=FilesCacheMode, default=DEFAULT_FILES_CACHE_MODE_UI,
-                              help='operate files cache in MODE. default: %s' % DEFAULT_FILES_CACHE_MODE_UI)
-        fs_group.add_argument('--read-special', dest='read_special', action='store_true',
-                              help='open and read block and char device files as well as FIFOs as if they were '
-                                   'regular files. Also follows symlinks pointing to these kinds of files.')
-
-        archive_group = subparser.add_argument_group('Archive options')
-        archive_group.add_argument('--comment', dest='comment', metavar='COMMENT', type=CommentSpec, default='',
-                                   help='add a comment text to the archive')
-        archive_group.add_argument('--timestamp', metavar='TIMESTAMP', dest='timestamp',
-                                   type=timestamp, default=None,
-                                   help='manually specify the archive creation date/time (UTC, yyyy-mm-ddThh:mm:ss format). '
-                                        'Alternatively, give a reference file/directory.')
-        archive_group.add_argument('-c', '--checkpoint-interval', metavar='SECONDS', dest='checkpoint_interval',
-                                   type=int, default=1800,
-                                   help='write checkpoint every SECONDS seconds (Default: 1800)')
-        archive_group.add_argument('--chunker-params', metavar='PARAMS', dest='chunker_params',
-                                   type=ChunkerParams, default=CHUNKER_PARAMS, action=Highlander,
-                                   help='specify the chunker parameters (ALGO, CHUNK_MIN_EXP, CHUNK_MAX_EXP, '
-                                        'HASH_MASK_BITS, HASH_WINDOW_SIZE). default: %s,%d,%d,%d,%d' % CHUNKER_PARAMS)
-        archive_group.add_argument('-C', '--compression', metavar='COMPRESSION', dest='compression',
-                                   type=CompressionSpec, default=CompressionSpec('lz4'),
-                                   help='select compression algorithm, see the output of the '
-                                        '"borg help compression" command for details.')
-
-        subparser.add_argument('location', metavar='ARCHIVE',
-                               type=location_validator(archive=True),
-                               help='name of archive to create (must be also a valid directory name)')
-        subparser.add_argument('paths', metavar='PATH', nargs='*', type=str,
-                               help='paths to archive')
+        @subparsers.lazy_parser('create', parents=[common_parser], add_help=False,
+                                func=self.do_create,
+                                epilog=process_epilog(CREATE_EPILOG),
+                                formatter_class=argparse.RawDescriptionHelpFormatter,
+                                help='create backup')
+        def define_borg_create(subparser):
+
+            # note: --dry-run and --stats are mutually exclusive, but we do not want to abort when
+            #  parsing, but rather proceed with the dry-run, but without stats (see run() method).
+            subparser.add_argument('-n', '--dry-run', dest='dry_run', action='store_true',
+                                   help='do not create a backup archive')
+            subparser.add_argument('-s', '--stats', dest='stats', action='store_true',
+                                   help='print statistics for the created archive')
+
+            subparser.add_argument('--list', dest='output_list', action='store_true',
+                                   help='output verbose list of items (files, dirs, ...)')
+            subparser.add_argument('--filter', metavar='STATUSCHARS', dest='output_filter', action=Highlander,
+                                   help='only display items with the given status characters (see description)')
+            subparser.add_argument('--json', action='store_true',
+                                   help='output stats as JSON. Implies ``--stats``.')
+            subparser.add_argument('--no-cache-sync', dest='no_cache_sync', action='store_true',
+                                   help='experimental: do not synchronize the cache. Implies not using the files cache.')
+            subparser.add_argument('--stdin-name', metavar='NAME', dest='stdin_name', default='stdin',
+                                   help='use NAME in archive for stdin data (default: %(default)r)')
+            subparser.add_argument('--stdin-user', metavar='USER', dest='stdin_user', default=uid2user(0),
+                                   help='set user USER in archive for stdin data (default: %(default)r)')
+            subparser.add_argument('--stdin-group', metavar='GROUP', dest='stdin_group', default=gid2group(0),
+                                   help='set group GROUP in archive for stdin data (default: %(default)r)')
+            subparser.add_argument('--stdin-mode', metavar='M', dest='stdin_mode', type=lambda s: int(s, 8), default=STDIN_MODE_DEFAULT,
+                                  help='set mode to M in archive for stdin data (default: %(default)04o)')
+            subparser.add_argument('--content-from-command', action='store_true',
+                                   help='interpret PATH as command and store its stdout. See also section Reading from'
+                                        ' stdin below.')
+            subparser.add_argument('--paths-from-stdin', action='store_true',
+                                   help='read DELIM-separated list of paths to backup from stdin. Will not '
+                                        'recurse into directories.')
+            subparser.add_argument('--paths-from-command', action='store_true',
+                                   help='interpret PATH as command and treat its output as ``--paths-from-stdin``')
+            subparser.add_argument('--paths-delimiter', metavar='DELIM',
+                                   help='set path delimiter for ``--paths-from-stdin`` and ``--paths-from-command`` (default: \\n) ')
+
+            exclude_group = define_exclusion_group(subparser, tag_files=True)
+            exclude_group.add_argument('--exclude-nodump', dest='exclude_nodump', action='store_true',
+                                       help='exclude files flagged NODUMP')
+
+            fs_group = subparser.add_argument_group('Filesystem options')
+            fs_group.add_argument('-x', '--one-file-system', dest='one_file_system', action='store_true',
+                                  help='stay in the same file system and do not store mount points of other file systems.  This might behave different from your expectations, see the docs.')
+            define_numeric_ids_options(fs_group.add_argument,
+                                       help='only store numeric user and group identifiers')
+            # --noatime is the default now and the flag is deprecated. args.noatime is not used any more.
+            # use --atime if you want to store the atime (default behaviour before borg 1.2.0a7)..
+            fs_group.add_argument('--noatime', dest='noatime', action='store_true',
+                                  help='do not store atime into archive')
+            fs_group.add_argument('--atime', dest='atime', action='store_true',
+                                  help='do store atime into archive')
+            fs_group.add_argument('--noctime', dest='noctime', action='store_true',
+                                  help='do not store ctime into archive')
+            fs_group.add_argument('--nobirthtime', dest='nobirthtime', action='store_true',
+                                  help='do not store birthtime (creation date) into archive')
+            define_noflags_options(fs_group.add_argument,
+                                   help='do not read and store flags (e.g. NODUMP, IMMUTABLE) into archive')
+            fs_group.add_argument('--noacls', dest='noacls', action='store_true',
+                                  help='do not read and store ACLs into archive')
+            fs_group.add_argument('--noxattrs', dest='noxattrs', action='store_true',
+                                  help='do not read and store xattrs into archive')
+            fs_group.add_argument('--sparse', dest='sparse', action='store_true',
+                                   help='detect sparse holes in input (supported only by fixed chunker)')
+            fs_group.add_argument('--files-cache', metavar='MODE', dest='files_cache_mode', action=Highlander,
+                                  type=FilesCacheMode, default=DEFAULT_FILES_CACHE_MODE_UI,
+                                  help='operate files cache in MODE. default: %s' % DEFAULT_FILES_CACHE_MODE_UI)
+            fs_group.add_argument('--read-special', dest='read_special', action='store_true',
+                                  help='open and read block and char device files as well as FIFOs as if they were '
+                                       'regular files. Also follows symlinks pointing to these kinds of files.')
+
+            archive_group = subparser.add_argument_group('Archive options')
+            archive_group.add_argument('--comment', dest='comment', metavar='COMMENT', type=CommentSpec, default='',
+                                       help='add a comment text to the archive')
+            archive_group.add_argument('--timestamp', metavar='TIMESTAMP', dest='timestamp',
+                                       type=timestamp, default=None,
+                                       help='manually specify the archive creation date/time (UTC, yyyy-mm-ddThh:mm:ss format). '
+                                            'Alternatively, give a reference file/directory.')
+            archive_group.add_argument('-c', '--checkpoint-interval', metavar='SECONDS', dest='checkpoint_interval',
+                                       type=int, default=1800,
+                                       help='write checkpoint every SECONDS seconds (Default: 1800)')
+            archive_group.add_argument('--chunker-params', metavar='PARAMS', dest='chunker_params',
+                                       type=ChunkerParams, default=CHUNKER_PARAMS, action=Highlander,
+                                       help='specify the chunker parameters (ALGO, CHUNK_MIN_EXP, CHUNK_MAX_EXP, '
+                                            'HASH_MASK_BITS, HASH_WINDOW_SIZE). default: %s,%d,%d,%d,%d' % CHUNKER_PARAMS)
+            archive_group.add_argument('-C', '--compression', metavar='COMPRESSION', dest='compression',
+                                       type=CompressionSpec, default=CompressionSpec('lz4'),
+                                       help='select compression algorithm, see the output of the '
+                                            '"borg help compression" command for details.')
+
+            subparser.add_argument('location', metavar='ARCHIVE',
+                                   type=location_validator(archive=True),
+                                   help='name of archive to create (must be also a valid directory name)')
+            subparser.add_argument('paths', metavar='PATH', nargs='*', type=str,
+                                   help='paths to archive')
 
         # borg debug
-        debug_epilog = process_epilog("""
-        These commands are not intended for normal use and potentially very
-        dangerous if used incorrectly.
-
-        They exist to improve debugging capabilities without direct system access, e.g.
-        in case you ever run into some severe malfunction. Use them only if you know
-        what you are doing or if a trusted developer tells you what to do.""")
-
-        subparser = subparsers.add_parser('debug', parents=[mid_common_parser], add_help=False,
-                                          description='debugging command (not intended for normal use)',
-                                          epilog=debug_epilog,
-                                          formatter_class=argparse.RawDescriptionHelpFormatter,
-                                          help='debugging command (not intended for normal use)')
-
-        debug_parsers = subparser.add_subparsers(title='required arguments', metavar='<command>')
-        subparser.set_defaults(fallback_func=functools.partial(self.do_subcommand_help, subparser))
-
-        debug_info_epilog = process_epilog("""
-        This command displays some system information that might be useful for bug
-        reports and debugging problems. If a traceback happens, this information is
-        already appended at the end of the traceback.
-        """)
-        subparser = debug_parsers.add_parser('info', parents=[common_parser], add_help=False,
-                                          description=self.do_debug_info.__doc__,
-                                          epilog=debug_info_epilog,
-                                          formatter_class=argparse.RawDescriptionHelpFormatter,
-                                          help='show system infos for debugging / bug reports (debug)')
-        subparser.set_defaults(func=self.do_debug_info)
-
-        debug_dump_archive_items_epilog = process_epilog("""
-        This command dumps raw (but decrypted and decompressed) archive items (only metadata) to files.
-        """)
-        subparser = debug_parsers.add_parser('dump-archive-items', parents=[common_parser], add_help=False,
-                                          description=self.do_debug_dump_archive_items.__doc__,
-                                          epilog=debug_dump_archive_items_epilog,
-                                          formatter_class=argparse.RawDescriptionHelpFormatter,
-                                          help='dump archive items (metadata) (debug)')
-        subparser.set_defaults(func=self.do_debug_dump_archive_items)
-        subparser.add_argument('location', metavar='ARCHIVE',
-                               type=location_validator(archive=True),
-                               help='archive to dump')
-
-        debug_dump_archive_epilog = process_epilog("""
-        This command dumps all metadata of an archive in a decoded form to a file.
-        """)
-        subparser = debug_parsers.add_parser('dump-archive', parents=[common_parser], add_help=False,
-                                          description=self.do_debug_dump_archive.__doc__,
-                                          epilog=debug_dump_archive_epilog,
-                                          formatter_class=argparse.RawDescriptionHelpFormatter,
-                                          help='dump decoded archive metadata (debug)')
-        subparser.set_defaults(func=self.do_debug_dump_archive)
-        subparser.add_argument('location', metavar='ARCHIVE',
-                               type=location_validator(archive=True),
-                               help='archive to dump')
-        subparser.add_argument('path', metavar='PATH', type=str,
-                               help='file to dump data into')
-
-        debug_dump_manifest_epilog = process_epilog("""
-        This command dumps manifest metadata of a repository in a decoded form to a file.
-        """)
-        subparser = debug_parsers.add_parser('dump-manifest', parents=[common_parser], add_help=False,
-                                          description=self.do_debug_dump_manifest.__doc__,
-                                          epilog=debug_dump_manifest_epilog,
-                                          formatter_class=argparse.RawDescriptionHelpFormatter,
-                                          help='dump decoded repository metadata (debug)')
-        subparser.set_defaults(func=self.do_debug_dump_manifest)
-        subparser.add_argument('location', metavar='REPOSITORY',
-                               type=location_validator(archive=False),
-                               help='repository to dump')
-        subparser.add_argument('path', metavar='PATH', type=str,
-                               help='file to dump data into')
-
-        debug_dump_repo_objs_epilog = process_epilog("""
-        This command dumps raw (but decrypted and decompressed) repo objects to files.
-        """)
-        subparser = debug_parsers.add_parser('dump-repo-objs', parents=[common_parser], add_help=False,
-                                          description=self.do_debug_dump_repo_objs.__doc__,
-                                          epilog=debug_dump_repo_objs_epilog,
-                                          formatter_class=argparse.RawDescriptionHelpFormatter,
-                                          help='dump repo objects (debug)')
-        subparser.set_defaults(func=self.do_debug_dump_repo_objs)
-        subparser.add_argument('location', metavar='REPOSITORY',
-                               type=location_validator(archive=False),
-                               help='repository to dump')
-        subparser.add_argument('--ghost', dest='ghost', action='store_true',
-                               help='dump all segment file contents, including deleted/uncommitted objects and commits.')
-
-        debug_search_repo_objs_epilog = process_epilog("""
-        This command searches raw (but decrypted and decompressed) repo objects for a specific bytes sequence.
-        """)
-        subparser = debug_parsers.add_parser('search-repo-objs', parents=[common_parser], add_help=False,
-                                          description=self.do_debug_search_repo_objs.__doc__,
-                                          epilog=debug_search_repo_objs_epilog,
-                                          formatter_class=argparse.RawDescriptionHelpFormatter,
-                                          help='search repo objects (debug)')
-        subparser.set_defaults(func=self.do_debug_search_repo_objs)
-        subparser.add_argument('location', metavar='REPOSITORY',
-                               type=location_validator(archive=False),
-                               help='repository to search')
-        subparser.add_argument('wanted', metavar='WANTED', type=str,
-                               help='term to search the repo for, either 0x1234abcd hex term or a string')
-
-        debug_get_obj_epilog = process_epilog("""
-        This command gets an object from the repository.
-        """)
-        subparser = debug_parsers.add_parser('get-obj', parents=[common_parser], add_help=False,
-                                          description=self.do_debug_get_obj.__doc__,
-                                          epilog=debug_get_obj_epilog,
-                                          formatter_class=argparse.RawDescriptionHelpFormatter,
-                                          help='get object from repository (debug)')
-        subparser.set_defaults(func=self.do_debug_get_obj)
-        subparser.add_argument('location', metavar='REPOSITORY',
-                               type=location_validator(archive=False),
-                               help='repository to use')
-        subparser.add_argument('id', metavar='ID', type=str,
-                               help='hex object ID to get from the repo')
-        subparser.add_argument('path', metavar='PATH', type=str,
-                               help='file to write object data into')
-
-        debug_put_obj_epilog = process_epilog("""
-        This command puts objects into the repository.
-        """)
-        subparser = debug_parsers.add_parser('put-obj', parents=[common_parser], add_help=False,
-                                          description=self.do_debug_put_obj.__doc__,
-                                          epilog=debug_put_obj_epilog,
-                                          formatter_class=argparse.RawDescriptionHelpFormatter,
-                                          help='put object to repository (debug)')
-        subparser.set_defaults(func=self.do_debug_put_obj)
-        subparser.add_argument('location', metavar='REPOSITORY',
-                               type=location_validator(archive=False),
-                               help='repository to use')
-        subparser.add_argument('paths', metavar='PATH', nargs='+', type=str,
-                               help='file(s) to read and create object(s) from')
-
-        debug_delete_obj_epilog = process_epilog("""
-        This command deletes objects from the repository.
-        """)
-        subparser = debug_parsers.add_parser('delete-obj', parents=[common_parser], add_help=False,
-                                          description=self.do_debug_delete_obj.__doc__,
-                                          epilog=debug_delete_obj_epilog,
-                                          formatter_class=argparse.RawDescriptionHelpFormatter,
-                                          help='delete object from repository (debug)')
-        subparser.set_defaults(func=self.do_debug_delete_obj)
-        subparser.add_argument('location', metavar='REPOSITORY',
-                               type=location_validator(archive=False),
-                               help='repository to use')
-        subparser.add_argument('ids', metavar='IDs', nargs='+', type=str,
-                               help='hex object ID(s) to delete from the repo')
-
-        debug_refcount_obj_epilog = process_epilog("""
-        This command displays the reference count for objects from the repository.
-        """)
-        subparser = debug_parsers.add_parser('refcount-obj', parents=[common_parser], add_help=False,
-                                          description=self.do_debug_refcount_obj.__doc__,
-                                          epilog=debug_refcount_obj_epilog,
-                                          formatter_class=argparse.RawDescriptionHelpFormatter,
-                                          help='show refcount for object from repository (debug)')
-        subparser.set_defaults(func=self.do_debug_refcount_obj)
-        subparser.add_argument('location', metavar='REPOSITORY',
-                               type=location_validator(archive=False),
-                               help='repository to use')
-        subparser.add_argument('ids', metavar='IDs', nargs='+', type=str,
-                               help='hex object ID(s) to show refcounts for')
-
-        debug_dump_hints_epilog = process_epilog("""
-        This command dumps the repository hints data.
-        """)
-        subparser = debug_parsers.add_parser('dump-hints', parents=[common_parser], add_help=False,
-                                          description=self.do_debug_dump_hints.__doc__,
-                                          epilog=debug_dump_hints_epilog,
-                                          formatter_class=argparse.RawDescriptionHelpFormatter,
-                                          help='dump repo hints (debug)')
-        subparser.set_defaults(func=self.do_debug_dump_hints)
-        subparser.add_argument('location', metavar='REPOSITORY',
-                               type=location_validator(archive=False),
-                               help='repository to dump')
-        subparser.add_argument('path', metavar='PATH', type=str,
-                               help='file to dump data into')
-
-        debug_convert_profile_epilog = process_epilog("""
-        Convert a Borg profile to a Python cProfile compatible profile.
-        """)
-        subparser = debug_parsers.add_parser('convert-profile', parents=[common_parser], add_help=False,
-                                          description=self.do_debug_convert_profile.__doc__,
-                                          epilog=debug_convert_profile_epilog,
-                                          formatter_class=argparse.RawDescriptionHelpFormatter,
-                                          help='convert Borg profile to Python profile (debug)')
-        subparser.set_defaults(func=self.do_debug_convert_profile)
-        subparser.add_argument('input', metavar='INPUT', type=argparse.FileType('rb'),
-                               help='Borg profile')
-        subparser.add_argument('output', metavar='OUTPUT', type=argparse.FileType('wb'),
-                               help='Output file')
+        @subparsers.lazy_parser('debug', parents=[mid_common_parser], add_help=False,
+                                description='debugging command (not intended for normal use)',
+                                epilog=process_epilog(DEBUG_EPILOG),
+                                formatter_class=argparse.RawDescriptionHelpFormatter,
+                                help='debugging command (not intended for normal use)')
+        def define_borg_debug(subparser):
+            debug_parsers = subparser.add_subparsers(title='required arguments', metavar='<command>',
+                                                     action=LazySubParsersAction)
+            subparser.set_defaults(fallback_func=functools.partial(self.do_subcommand_help, subparser))
+
+            @debug_parsers.lazy_parser('info', parents=[common_parser], add_help=False,
+                                    func=self.do_debug_info,
+                                    epilog=process_epilog(DEBUG_INFO_EPILOG),
+                                    formatter_class=argparse.RawDescriptionHelpFormatter,
+                                    help='show system infos for debugging / bug reports (debug)')
+            def define_borg_debug_info(subparser):
+                pass  # only the common options
+
+            @debug_parsers.lazy_parser('dump-archive-items', parents=[common_parser], add_help=False,
+                                    func=self.do_debug_dump_archive_items,
+                                    epilog=process_epilog(DEBUG_DUMP_ARCHIVE_ITEMS_EPILOG),
+                                    formatter_class=argparse.RawDescriptionHelpFormatter,
+                                    help='dump archive items (metadata) (debug)')
+            def define_borg_debug_dump_archive_items(subparser):
+                subparser.add_argument('location', metavar='ARCHIVE',
+                                       type=location_validator(archive=True),
+                                       help='archive to dump')
+
+            @debug_parsers.lazy_parser('dump-archive', parents=[common_parser], add_help=False,
+                                    func=self.do_debug_dump_archive,
+                                    epilog=process_epilog(DEBUG_DUMP_ARCHIVE_EPILOG),
+                                    formatter_class=argparse.RawDescriptionHelpFormatter,
+                                    help='dump decoded archive metadata (debug)')
+            def define_borg_debug_dump_archive(subparser):
+                subparser.add_argument('location', metavar='ARCHIVE',
+                                       type=location_validator(archive=True),
+                                       help='archive to dump')
+                subparser.add_argument('path', metavar='PATH', type=str,
+                                       help='file to dump data into')
+
+            @debug_parsers.lazy_parser('dump-manifest', parents=[common_parser], add_help=False,
+                                    func=self.do_debug_dump_manifest,
+                                    epilog=process_epilog(DEBUG_DUMP_MANIFEST_EPILOG),
+                                    formatter_class=argparse.RawDescriptionHelpFormatter,
+                                    help='dump decoded repository metadata (debug)')
+            def define_borg_debug_dump_manifest(subparser):
+                subparser.add_argument('location', metavar='REPOSITORY',
+                                       type=location_validator(archive=False),
+                                       help='repository to dump')
+                subparser.add_argument('path', metavar='PATH', type=str,
+                                       help='file to dump data into')
+
+            @debug_parsers.lazy_parser('dump-repo-objs', parents=[common_parser], add_help=False,
+                                    func=self.do_debug_dump_repo_objs,
+                                    epilog=process_epilog(DEBUG_DUMP_REPO_OBJS_EPILOG),
+                                    formatter_class=argparse.RawDescriptionHelpFormatter,
+                                    help='dump repo objects (debug)')
+            def define_borg_debug_dump_repo_objs(subparser):
+                subparser.add_argument('location', metavar='REPOSITORY',
+                                       type=location_validator(archive=False),
+                                       help='repository to dump')
+                subparser.add_argument('--ghost', dest='ghost', action='store_true',
+                                       help='dump all segment file contents, including deleted/uncommitted objects and commits.')
+
+            @debug_parsers.lazy_parser('search-repo-objs', parents=[common_parser], add_help=False,
+                                    func=self.do_debug_search_repo_objs,
+                                    epilog=process_epilog(DEBUG_SEARCH_REPO_OBJS_EPILOG),
+                                    formatter_class=argparse.RawDescriptionHelpFormatter,
+                                    help='search repo objects (debug)')
+            def define_borg_debug_search_repo_objs(subparser):
+                subparser.add_argument('location', metavar='REPOSITORY',
+                                       type=location_validator(archive=False),
+                                       help='repository to search')
+                subparser.add_argument('wanted', metavar='WANTED', type=str,
+                                       help='term to search the repo for, either 0x1234abcd hex term or a string')
+
+            @debug_parsers.lazy_parser('get-obj', parents=[common_parser], add_help=False,
+                                    func=self.do_debug_get_obj,
+                                    epilog=process_epilog(DEBUG_GET_OBJ_EPILOG),
+                                    formatter_class=argparse.RawDescriptionHelpFormatter,
+                                    help='get object from repository (debug)')
+            def define_borg_debug_get_obj(subparser):
+                subparser.add_argument('location', metavar='REPOSITORY',
+                                       type=location_validator(archive=False),
+                                       help='repository to use')
+                subparser.add_argument('id', metavar='ID', type=str,
+                                       help='hex object ID to get from the repo')
+                subparser.add_argument('path', metavar='PATH', type=str,
+                                       help='file to write object data into')
+
+            @debug_parsers.lazy_parser('put-obj', parents=[common_parser], add_help=False,
+                                    func=self.do_debug_put_obj,
+                                    epilog=process_epilog(DEBUG_PUT_OBJ_EPILOG),
+                                    formatter_class=argparse.RawDescriptionHelpFormatter,
+                                    help='put object to repository (debug)')
+            def define_borg_debug_put_obj(subparser):
+                subparser.add_argument('location', metavar='REPOSITORY',
+                                       type=location_validator(archive=False),
+                                       help='repository to use')
+                subparser.add_argument('paths', metavar='PATH', nargs='+', type=str,
+                                       help='file(s) to read and create object(s) from')
+
+            @debug_parsers.lazy_parser('delete-obj', parents=[common_parser], add_help=False,
+                                    func=self.do_debug_delete_obj,
+                                    epilog=process_epilog(DEBUG_DELETE_OBJ_EPILOG),
+                                    formatter_class=argparse.RawDescriptionHelpFormatter,
+                                    help='delete object from repository (debug)')
+            def define_borg_debug_delete_obj(subparser):
+                subparser.add_argument('location', metavar='REPOSITORY',
+                                       type=location_validator(archive=False),
+                                       help='repository to use')
+                subparser.add_argument('ids', metavar='IDs', nargs='+', type=str,
+                                       help='hex object ID(s) to delete from the repo')
+
+            @debug_parsers.lazy_parser('refcount-obj', parents=[common_parser], add_help=False,
+                                    func=self.do_debug_refcount_obj,
+                                    epilog=process_epilog(DEBUG_REFCOUNT_OBJ_EPILOG),
+                                    formatter_class=argparse.RawDescriptionHelpFormatter,
+                                    help='show refcount for object from repository (debug)')
+            def define_borg_debug_refcount_obj(subparser):
+                subparser.add_argument('location', metavar='REPOSITORY',
+                                       type=location_validator(archive=False),
+                                       help='repository to use')
+                subparser.add_argument('ids', metavar='IDs', nargs='+', type=str,
+                                       help='hex object ID(s) to show refcounts for')
+
+            @debug_parsers.lazy_parser('dump-hints', parents=[common_parser], add_help=False,
+                                    func=self.do_debug_dump_hints,
+                                    epilog=process_epilog(DEBUG_DUMP_HINTS_EPILOG),
+                                    formatter_class=argparse.RawDescriptionHelpFormatter,
+                                    help='dump repo hints (debug)')
+            def define_borg_debug_dump_hints(subparser):
+                subparser.add_argument('location', metavar='REPOSITORY',
+                                       type=location_validator(archive=False),
+                                       help='repository to dump')
+                subparser.add_argument('path', metavar='PATH', type=str,
+                                       help='file to dump data into')
+
+            @debug_parsers.lazy_parser('convert-profile', parents=[common_parser], add_help=False,
+                                    func=self.do_debug_convert_profile,
+                                    epilog=process_epilog(DEBUG_CONVERT_PROFILE_EPILOG),
+                                    formatter_class=argparse.RawDescriptionHelpFormatter,
+                                    help='convert Borg profile to Python profile (debug)')
+            def define_borg_debug_convert_profile(subparser):
+                subparser.add_argument('input', metavar='INPUT', type=argparse.FileType('rb'),
+                                       help='Borg profile')
+                subparser.add_argument('output', metavar='OUTPUT', type=argparse.FileType('wb'),
+                                       help='Output file')
 
         # borg delete
-        delete_epilog = process_epilog("""
-        This command deletes an archive from the repository or the complete repository.
-
-        Important: When deleting archives, repository disk space is **not** freed until
-        you run ``borg compact``.
-
-        When you delete a complete repository, the security info and local cache for it
-        (if any) are also deleted. Alternatively, you can delete just the local cache
-        with the ``--cache-only`` option, or keep the security info with the
-        ``--keep-security-info`` option.
-
-        When in doubt, use ``--dry-run --list`` to see what would be deleted.
-
-        When using ``--stats``, you will get some statistics about how much data was
-        deleted - the "Deleted data" deduplicated size there is most interesting as
-        that is how much your repository will shrink.
-        Please note that the "All archives" stats refer to the state after deletion.
-
-        You can delete multiple archives by specifying their common prefix, if they
-        have one, using the ``--prefix PREFIX`` option. You can also specify a shell
-        pattern to match multiple archives using the ``--glob-archives GLOB`` option
-        (for more info on these patterns, see :ref:`borg_patterns`). Note that these
-        two options are mutually exclusive.
-
-        To avoid accidentally deleting archives, especially when using glob patterns,
-        it might be helpful to use the ``--dry-run`` to test out the command without
-        actually making any changes to the repository.
-        """)
-        subparser = subparsers.add_parser('delete', parents=[common_parser], add_help=False,
-                                          description=self.do_delete.__doc__,
-                                          epilog=delete_epilog,
-                                          formatter_class=argparse.RawDescriptionHelpFormatter,
-                                          help='delete archive')
-        subparser.set_defaults(func=self.do_delete)
-        subparser.add_argument('-n', '--dry-run', dest='dry_run', action='store_true',
-                               help='do not change repository')
-        subparser.add_argument('--list', dest='output_list', action='store_true',
-                               help='output verbose list of archives')
-        subparser.add_argument('-s', '--stats', dest='stats', action='store_true',
-                               help='print statistics for the deleted archive')
-        subparser.add_argument('--cache-only', dest='cache_only', action='store_true',
-                               help='delete only the local cache for the given repository')
-        subparser.add_argument('--force', dest='forced', action='count', default=0,
-                               help='force deletion of corrupted archives, '
-                                    'use ``--force --force`` in case ``--force`` does not work.')
-        subparser.add_argument('--keep-security-info', dest='keep_security_info', action='store_true',
-                               help='keep the local security info when deleting a repository')
-        subparser.add_argument('--save-space', dest='save_space', action='store_true',
-                               help='work slower, but using less space')
-        subparser.add_argument('location', metavar='REPOSITORY_OR_ARCHIVE', nargs='?', default='',
-                               type=location_validator(),
-                               help='repository or archive to delete')
-        subparser.add_argument('archives', metavar='ARCHIVE', nargs='*',
-                               help='archives to delete')
-        define_archive_filters_group(subparser)
+        @subparsers.lazy_parser('delete', parents=[common_parser], add_help=False,
+                                func=self.do_delete,
+                                epilog=process_epilog(DELETE_EPILOG),
+                                formatter_class=argparse.RawDescriptionHelpFormatter,
+                                help='delete archive')
+        def define_borg_delete(subparser):
+            subparser.add_argument('-n', '--dry-run', dest='dry_run', action='store_true',
+                                   help='do not change repository')
+            subparser.add_argument('--list', dest='output_list', action='store_true',
+                                   help='output verbose list of archives')
+            subparser.add_argument('-s', '--stats', dest='stats', action='store_true',
+                                   help='print statistics for the deleted archive')
+            subparser.add_argument('--cache-only', dest='cache_only', action='store_true',
+                                   help='delete only the local cache for the given repository')
+            subparser.add_argument('--force', dest='forced', action='count', default=0,
+                                   help='force deletion of corrupted archives, '
+                                        'use ``--force --force`` in case ``--force`` does not work.')
+            subparser.add_argument('--keep-security-info', dest='keep_security_info', action='store_true',
+                                   help='keep the local security info when deleting a repository')
+            subparser.add_argument('--save-space', dest='save_space', action='store_true',
+                                   help='work slower, but using less space')
+            subparser.add_argument('location', metavar='REPOSITORY_OR_ARCHIVE', nargs='?', default='',
+                                   type=location_validator(),
+                                   help='repository or archive to delete')
+            subparser.add_argument('archives', metavar='ARCHIVE', nargs='*',
+                                   help='archives to delete')
+            define_archive_filters_group(subparser)
 
         # borg diff
-        diff_epilog = process_epilog("""
-            This command finds differences (file contents, user/group/mode) between archives.
-
-            A repository location and an archive name must be specified for REPO::ARCHIVE1.
-            ARCHIVE2 is just another archive name in same repository (no repository location
-            allowed).
-
-            For archives created with Borg 1.1 or newer diff automatically detects whether
-            the archives are created with the same chunker params. If so, only chunk IDs
-            are compared, which is very fast.
-
-            For archives prior to Borg 1.1 chunk contents are compared by default.
-            If you did not create the archives with different chunker params,
-            pass ``--same-chunker-params``.
-            Note that the chunker params changed from Borg 0.xx to 1.0.
-
-            For more help on include/exclude patterns, see the :ref:`borg_patterns` command output.
-            """)
-        subparser = subparsers.add_parser('diff', parents=[common_parser], add_help=False,
-                                          description=self.do_diff.__doc__,
-                                          epilog=diff_epilog,
-                                          formatter_class=argparse.RawDescriptionHelpFormatter,
-                                          help='find differences in archive contents')
-        subparser.set_defaults(func=self.do_diff)
-        subparser.add_argument('--numeric-owner', dest='numeric_ids', action='store_true',
-                               help='deprecated, use ``--numeric-ids`` instead')
-        subparser.add_argument('--numeric-ids', dest='numeric_ids', action='store_true',
-                               help='only consider numeric user and group identifiers')
-        subparser.add_argument('--same-chunker-params', dest='same_chunker_params', action='store_true',
-                               help='Override check of chunker parameters.')
-        subparser.add_argument('--sort', dest='sort', action='store_true',
-                               help='Sort the output lines by file path.')
-        subparser.add_argument('--json-lines', action='store_true',
-                               help='Format output as JSON Lines. ')
-        subparser.add_argument('location', metavar='REPO::ARCHIVE1',
-                               type=location_validator(archive=True),
-                               help='repository location and ARCHIVE1 name')
-        subparser.add_argument('archive2', metavar='ARCHIVE2',
-                               type=archivename_validator(),
-                               help='ARCHIVE2 name (no repository location allowed)')
-        subparser.add_argument('paths', metavar='PATH', nargs='*', type=str,
-                               help='paths of items inside the archives to compare; patterns are supported')
-        define_exclusion_group(subparser)
+        @subparsers.lazy_parser('diff', parents=[common_parser], add_help=False,
+                                func=self.do_diff,
+                                epilog=process_epilog(DIFF_EPILOG),
+                                formatter_class=argparse.RawDescriptionHelpFormatter,
+                                help='find differences in archive contents')
+        def define_borg_diff(subparser):
+            define_numeric_ids_options(subparser.add_argument,
+                                       help='only consider numeric user and group identifiers')
+            subparser.add_argument('--same-chunker-params', dest='same_chunker_params', action='store_true',
+                                   help='Override check of chunker parameters.')
+            subparser.add_argument('--sort', dest='sort', action='store_true',
+                                   help='Sort the output lines by file path.')
+            subparser.add_argument('--json-lines', action='store_true',
+                                   help='Format output as JSON Lines. ')
+            subparser.add_argument('location', metavar='REPO::ARCHIVE1',
+                                   type=location_validator(archive=True),
+                                   help='repository location and ARCHIVE1 name')
+            subparser.add_argument('archive2', metavar='ARCHIVE2',
+                                   type=archivename_validator(),
+                                   help='ARCHIVE2 name (no repository location allowed)')
+            subparser.add_argument('paths', metavar='PATH', nargs='*', type=str,
+                                   help='paths of items inside the archives to compare; patterns are supported')
+            define_exclusion_group(subparser)
 
         # borg export-tar
-        export_tar_epilog = process_epilog("""
-        This command creates a tarball from an archive.
-
-        When giving '-' as the output FILE, Borg will write a tar stream to standard output.
-
-        By default (``--tar-filter=auto``) Borg will detect whether the FILE should be compressed
-        based on its file extension and pipe the tarball through an appropriate filter
-        before writing it to FILE:
-
-        - .tar.gz or .tgz: gzip
-        - .tar.bz2 or .tbz: bzip2
-        - .tar.xz or .txz: xz
-        - .tar.zstd: zstd
-        - .tar.lz4: lz4
-
-        Alternatively, a ``--tar-filter`` program may be explicitly specified. It should
-        read the uncompressed tar stream from stdin and write a compressed/filtered
-        tar stream to stdout.
-
-        The generated tarball uses the GNU tar format.
-
-        export-tar is a lossy conversion:
-        BSD flags, ACLs, extended attributes (xattrs), atime and ctime are not exported.
-        Timestamp resolution is limited to whole seconds, not the nanosecond resolution
-        otherwise supported by Borg.
-
-        A ``--sparse`` option (as found in borg extract) is not supported.
-
-        By default the entire archive is extracted but a subset of files and directories
-        can be selected by passing a list of ``PATHs`` as arguments.
-        The file selection can further be restricted by using the ``--exclude`` option.
-
-        For more help on include/exclude patterns, see the :ref:`borg_patterns` command output.
-
-        ``--progress`` can be slower than no progress display, since it makes one additional
-        pass over the archive metadata.
-        """)
-        subparser = subparsers.add_parser('export-tar', parents=[common_parser], add_help=False,
-                                          description=self.do_export_tar.__doc__,
-                                          epilog=export_tar_epilog,
-                                          formatter_class=argparse.RawDescriptionHelpFormatter,
-                                          help='create tarball from archive')
-        subparser.set_defaults(func=self.do_export_tar)
-        subparser.add_argument('--tar-filter', dest='tar_filter', default='auto',
-                               help='filter program to pipe data through')
-        subparser.add_argument('--list', dest='output_list', action='store_true',
-                               help='output verbose list of items (files, dirs, ...)')
-        subparser.add_argument('location', metavar='ARCHIVE',
-                               type=location_validator(archive=True),
-                               help='archive to export')
-        subparser.add_argument('tarfile', metavar='FILE',
-                               help='output tar file. "-" to write to stdout instead.')
-        subparser.add_argument('paths', metavar='PATH', nargs='*', type=str,
-                               help='paths to extract; patterns are supported')
-        define_exclusion_group(subparser, strip_components=True)
+        @subparsers.lazy_parser('export-tar', parents=[common_parser], add_help=False,
+                                func=self.do_export_tar,
+                                epilog=process_epilog(EXPORT_TAR_EPILOG),
+                                formatter_class=argparse.RawDescriptionHelpFormatter,
+                                help='create tarball from archive')
+        def define_borg_export_tar(subparser):
+            subparser.add_argument('--tar-filter', dest='tar_filter', default='auto',
+                                   help='filter program to pipe data through')
+            subparser.add_argument('--list', dest='output_list', action='store_true',
+                                   help='output verbose list of items (files, dirs, ...)')
+            subparser.add_argument('location', metavar='ARCHIVE',
+                                   type=location_validator(archive=True),
+                                   help='archive to export')
+            subparser.add_argument('tarfile', metavar='FILE',
+                                   help='output tar file. "-" to write to stdout instead.')
+            subparser.add_argument('paths', metavar='PATH', nargs='*', type=str,
+                                   help='paths to extract; patterns are supported')
+            define_exclusion_group(subparser, strip_components=True)
 
         # borg extract
-        extract_epilog = process_epilog("""
-        This command extracts the contents of an archive. By default the entire
-        archive is extracted but a subset of files and directories can be selected
-        by passing a list of ``PATHs`` as arguments. The file selection can further
-        be restricted by using the ``--exclude`` option.
-
-        For more help on include/exclude patterns, see the :ref:`borg_patterns` command output.
-
-        By using ``--dry-run``, you can do all extraction steps except actually writing the
-        output data: reading metadata and data chunks from the repo, checking the hash/hmac,
-        decrypting, decompressing.
-
-        ``--progress`` can be slower than no progress display, since it makes one additional
-        pass over the archive metadata.
-
-        .. note::
-
-            Currently, extract always writes into the current working directory ("."),
-            so make sure you ``cd`` to the right place before calling ``borg extract``.
-
-            When parent directories are not extracted (because of using file/directory selection
-            or any other reason), borg can not restore parent directories' metadata, e.g. owner,
-            group, permission, etc.
-        """)
-        subparser = subparsers.add_parser('extract', parents=[common_parser], add_help=False,
-                                          description=self.do_extract.__doc__,
-                                          epilog=extract_epilog,
-                                          formatter_class=argparse.RawDescriptionHelpFormatter,
-                                          help='extract archive contents')
-        subparser.set_defaults(func=self.do_extract)
-        subparser.add_argument('--list', dest='output_list', action='store_true',
-                               help='output verbose list of items (files, dirs, ...)')
-        subparser.add_argument('-n', '--dry-run', dest='dry_run', action='store_true',
-                               help='do not actually change any files')
-        subparser.add_argument('--numeric-owner', dest='numeric_ids', action='store_true',
-                               help='deprecated, use ``--numeric-ids`` instead')
-        subparser.add_argument('--numeric-ids', dest='numeric_ids', action='store_true',
-                               help='only obey numeric user and group identifiers')
-        subparser.add_argument('--nobsdflags', dest='nobsdflags', action='store_true',
-                               help='deprecated, use ``--noflags`` instead')
-        subparser.add_argument('--noflags', dest='noflags', action='store_true',
-                               help='do not extract/set flags (e.g. NODUMP, IMMUTABLE)')
-        subparser.add_argument('--noacls', dest='noacls', action='store_true',
-                               help='do not extract/set ACLs')
-        subparser.add_argument('--noxattrs', dest='noxattrs', action='store_true',
-                               help='do not extract/set xattrs')
-        subparser.add_argument('--stdout', dest='stdout', action='store_true',
-                               help='write all extracted data to stdout')
-        subparser.add_argument('--sparse', dest='sparse', action='store_true',
-                               help='create holes in output sparse file from all-zero chunks')
-        subparser.add_argument('location', metavar='ARCHIVE',
-                               type=location_validator(archive=True),
-                               help='archive to extract')
-        subparser.add_argument('paths', metavar='PATH', nargs='*', type=str,
-                               help='paths to extract; patterns are supported')
-        define_exclusion_group(subparser, strip_components=True)
+        @subparsers.lazy_parser('extract', parents=[common_parser], add_help=False,
+                                func=self.do_extract,
+                                epilog=process_epilog(EXTRACT_EPILOG),
+                                formatter_class=argparse.RawDescriptionHelpFormatter,
+                                help='extract archive contents')
+        def define_borg_extract(subparser):
+            subparser.add_argument('--list', dest='output_list', action='store_true',
+                                   help='output verbose list of items (files, dirs, ...)')
+            subparser.add_argument('-n', '--dry-run', dest='dry_run', action='store_true',
+                                   help='do not actually change any files')
+            define_numeric_ids_options(subparser.add_argument,
+                                       help='only obey numeric user and group identifiers')
+            define_noflags_options(subparser.add_argument,
+                                   help='do not extract/set flags (e.g. NODUMP, IMMUTABLE)')
+            subparser.add_argument('--noacls', dest='noacls', action='store_true',
+                                   help='do not extract/set ACLs')
+            subparser.add_argument('--noxattrs', dest='noxattrs', action='store_true',
+                                   help='do not extract/set xattrs')
+            subparser.add_argument('--stdout', dest='stdout', action='store_true',
+                                   help='write all extracted data to stdout')
+            subparser.add_argument('--sparse', dest='sparse', action='store_true',
+                                   help='create holes in output sparse file from all-zero chunks')
+            subparser.add_argument('location', metavar='ARCHIVE',
+                                   type=location_validator(archive=True),
+                                   help='archive to extract')
+            subparser.add_argument('paths', metavar='PATH', nargs='*', type=str,
+                                   help='paths to extract; patterns are supported')
+            define_exclusion_group(subparser, strip_components=True)
 
         # borg help
-        subparser = subparsers.add_parser('help', parents=[common_parser], add_help=False,
-                                          description='Extra help')
-        subparser.add_argument('--epilog-only', dest='epilog_only', action='store_true')
-        subparser.add_argument('--usage-only', dest='usage_only', action='store_true')
-        subparser.set_defaults(func=functools.partial(self.do_help, parser, subparsers.choices))
-        subparser.add_argument('topic', metavar='TOPIC', type=str, nargs='?',
-                               help='additional help on TOPIC')
+        @subparsers.lazy_parser('help', parents=[common_parser], add_help=False,
+                                description='Extra help')
+        def define_borg_help(subparser):
+            subparser.add_argument('--epilog-only', dest='epilog_only', action='store_true')
+            subparser.add_argument('--usage-only', dest='usage_only', action='store_true')
+            subparser.set_defaults(func=functools.partial(self.do_help, parser, subparsers.choices))
+            subparser.add_argument('topic', metavar='TOPIC', type=str, nargs='?',
+                                   help='additional help on TOPIC')
 
         # borg info
-        info_epilog = process_epilog("""
-        This command displays detailed information about the specified archive or repository.
-
-        Please note that the deduplicated sizes of the individual archives do not add
-        up to the deduplicated size of the repository ("all archives"), because the two
-        are meaning different things:
-
-        This archive / deduplicated size = amount of data stored ONLY for this archive
-        = unique chunks of this archive.
-        All archives / deduplicated size = amount of data stored in the repo
-        = all chunks in the repository.
-
-        Borg archives can only contain a limited amount of file metadata.
-        The size of an archive relative to this limit depends on a number of factors,
-        mainly the number of files, the lengths of paths and other metadata stored for files.
-        This is shown as *utilization of maximum supported archive size*.
-        """)
-        subparser = subparsers.add_parser('info', parents=[common_parser], add_help=False,
-                                          description=self.do_info.__doc__,
-                                          epilog=info_epilog,
-                                          formatter_class=argparse.RawDescriptionHelpFormatter,
-                                          help='show repository or archive information')
-        subparser.set_defaults(func=self.do_info)
-        subparser.add_argument('location', metavar='REPOSITORY_OR_ARCHIVE', nargs='?', default='',
-                               type=location_validator(),
-                               help='repository or archive to display information about')
-        subparser.add_argument('--json', action='store_true',
-                               help='format output as JSON')
-        define_archive_filters_group(subparser)
+        @subparsers.lazy_parser('info', parents=[common_parser], add_help=False,
+                                func=self.do_info,
+                                epilog=process_epilog(INFO_EPILOG),
+                                formatter_class=argparse.RawDescriptionHelpFormatter,
+                                help='show repository or archive information')
+        def define_borg_info(subparser):
+            subparser.add_argument('location', metavar='REPOSITORY_OR_ARCHIVE', nargs='?', default='',
+                                   type=location_validator(),
+                                   help='repository or archive to display information about')
+            subparser.add_argument('--json', action='store_true',
+                                   help='format output as JSON')
+            define_archive_filters_group(subparser)
 
         # borg init
-        init_epilog = process_epilog("""
-        This command initializes an empty repository. A repository is a filesystem
-        directory containing the deduplicated data from zero or more archives.
-
-        Encryption mode TLDR
-        ++++++++++++++++++++
-
-        The encryption mode can only be configured when creating a new repository -
-        you can neither configure it on a per-archive basis nor change the
-        encryption mode of an existing repository.
-
-        Use ``repokey``::
-
-            borg init --encryption repokey /path/to/repo
-
-        Or ``repokey-blake2`` depending on which is faster on your client machines (see below)::
-
-            borg init --encryption repokey-blake2 /path/to/repo
-
-        Borg will:
-
-        1. Ask you to come up with a passphrase.
-        2. Create a borg key (which contains 3 random secrets. See :ref:`key_files`).
-        3. Encrypt the key with your passphrase.
-        4. Store the encrypted borg key inside the repository directory (in the repo config).
-           This is why it is essential to use a secure passphrase.
-        5. Encrypt and sign your backups to prevent anyone from reading or forging them unless they
-           have the key and know the passphrase. Make sure to keep a backup of
-           your key **outside** the repository - do not lock yourself out by
-           "leaving your keys inside your car" (see :ref:`borg_key_export`).
-           For remote backups the encryption is done locally - the remote machine
-           never sees your passphrase, your unencrypted key or your unencrypted files.
-           Chunking and id generation are also based on your key to improve
-           your privacy.
-        6. Use the key when extracting files to decrypt them and to verify that the contents of
-           the backups have not been accidentally or maliciously altered.
-
-        Picking a passphrase
-        ++++++++++++++++++++
-
-        Make sure you use a good passphrase. Not too short, not too simple. The real
-        encryption / decryption key is encrypted with / locked by your passphrase.
-        If an attacker gets your key, he can't unlock and use it without knowing the
-        passphrase.
-
-        Be careful with special or non-ascii characters in your passphrase:
-
-        - Borg processes the passphrase as unicode (and encodes it as utf-8),
-          so it does not have problems dealing with even the strangest characters.
-        - BUT: that does not necessarily apply to your OS / VM / keyboard configuration.
-
-        So better use a long passphrase made from simple ascii chars than one that
-        includes non-ascii stuff or characters that are hard/impossible to enter on
-        a different keyboard layout.
-
-        You can change your passphrase for existing repos at any time, it won't affect
-        the encryption/decryption key or other secrets.
-
-        More encryption modes
-        +++++++++++++++++++++
-
-        Only use ``--encryption none`` if you are OK with anyone who has access to
-        your repository being able to read your backups and tamper with their
-        contents without you noticing.
-
-        If you want "passphrase and having-the-key" security, use ``--encryption keyfile``.
-        The key will be stored in your home directory (in ``~/.config/borg/keys``).
-
-        If you do **not** want to encrypt the contents of your backups, but still
-        want to detect malicious tampering use ``--encryption authenticated``.
-
-        If ``BLAKE2b`` is faster than ``SHA-256`` on your hardware, use ``--encryption authenticated-blake2``,
-        ``--encryption repokey-blake2`` or ``--encryption keyfile-blake2``. Note: for remote backups
-        the hashing is done on your local machine.
-
-        .. nanorst: inline-fill
-
-        +----------+---------------+------------------------+--------------------------+
-        | Hash/MAC | Not encrypted | Not encrypted,         | Encrypted (AEAD w/ AES)  |
-        |          | no auth       | but authenticated      | and authenticated        |
-        +----------+---------------+------------------------+--------------------------+
-        | SHA-256  | none          | `authenticated`        | repokey                  |
-        |          |               |                        | keyfile                  |
-        +----------+---------------+------------------------+--------------------------+
-        | BLAKE2b  | n/a           | `authenticated-blake2` | `repokey-blake2`         |
-        |          |               |                        | `keyfile-blake2`         |
-        +----------+---------------+------------------------+--------------------------+
-
-        .. nanorst: inline-replace
-
-        Modes `marked like this` in the above table are new in Borg 1.1 and are not
-        backwards-compatible with Borg 1.0.x.
-
-        On modern Intel/AMD CPUs (except very cheap ones), AES is usually
-        hardware-accelerated.
-        BLAKE2b is faster than SHA256 on Intel/AMD 64-bit CPUs
-        (except AMD Ryzen and future CPUs with SHA extensions),
-        which makes `authenticated-blake2` faster than `none` and `authenticated`.
-
-        On modern ARM CPUs, NEON provides hardware acceleration for SHA256 making it faster
-        than BLAKE2b-256 there. NEON accelerates AES as well.
-
-        Hardware acceleration is always used automatically when available.
-
-        `repokey` and `keyfile` use AES-CTR-256 for encryption and HMAC-SHA256 for
-        authentication in an encrypt-then-MAC (EtM) construction. The chunk ID hash
-        is HMAC-SHA256 as well (with a separate key).
-        These modes are compatible with Borg 1.0.x.
-
-        `repokey-blake2` and `keyfile-blake2` are also authenticated encryption modes,
-        but use BLAKE2b-256 instead of HMAC-SHA256 for authentication. The chunk ID
-        hash is a keyed BLAKE2b-256 hash.
-        These modes are new and *not* compatible with Borg 1.0.x.
-
-        `authenticated` mode uses no encryption, but authenticates repository contents
-        through the same HMAC-SHA256 hash as the `repokey` and `keyfile` modes (it uses it
-        as the chunk ID hash). The key is stored like `repokey`.
-        This mode is new and *not* compatible with Borg 1.0.x.
-
-        `authenticated-blake2` is like `authenticated`, but uses the keyed BLAKE2b-256 hash
-        from the other blake2 modes.
-        This mode is new and *not* compatible with Borg 1.0.x.
-
-        `none` mode uses no encryption and no authentication. It uses SHA256 as chunk
-        ID hash. This mode is not recommended, you should rather consider using an authenticated
-        or authenticated/encrypted mode. This mode has possible denial-of-service issues
-        when running ``borg create`` on contents controlled by an attacker.
-        Use it only for new repositories where no encryption is wanted **and** when compatibility
-        with 1.0.x is important. If compatibility with 1.0.x is not important, use
-        `authenticated-blake2` or `authenticated` instead.
-        This mode is compatible with Borg 1.0.x.
-        """)
-        subparser = subparsers.add_parser('init', parents=[common_parser], add_help=False,
-                                          description=self.do_init.__doc__, epilog=init_epilog,
-                                          formatter_class=argparse.RawDescriptionHelpFormatter,
-                                          help='initialize empty repository')
-        subparser.set_defaults(func=self.do_init)
-        subparser.add_argument('location', metavar='REPOSITORY', nargs='?', default='',
-                               type=location_validator(archive=False),
-                               help='repository to create')
-        subparser.add_argument('-e', '--encryption', metavar='MODE', dest='encryption', required=True,
-                               choices=key_argument_names(),
-                               help='select encryption key mode **(required)**')
-        subparser.add_argument('--append-only', dest='append_only', action='store_true',
-                               help='create an append-only mode repository. Note that this only affects '
-                                    'the low level structure of the repository, and running `delete` '
-                                    'or `prune` will still be allowed. See :ref:`append_only_mode` in '
-                                    'Additional Notes for more details.')
-        subparser.add_argument('--storage-quota', metavar='QUOTA', dest='storage_quota', default=None,
-                               type=parse_storage_quota,
-                               help='Set storage quota of the new repository (e.g. 5G, 1.5T). Default: no quota.')
-        subparser.add_argument('--make-parent-dirs', dest='make_parent_dirs', action='store_true',
-                               help='create the parent directories of the repository directory, if they are missing.')
+        @subparsers.lazy_parser('init', parents=[common_parser], add_help=False,
+                                func=self.do_init, epilog=process_epilog(INIT_EPILOG),
+                                formatter_class=argparse.RawDescriptionHelpFormatter,
+                                help='initialize empty repository')
+        def define_borg_init(subparser):
+            subparser.add_argument('location', metavar='REPOSITORY', nargs='?', default='',
+                                   type=location_validator(archive=False),
+                                   help='repository to create')
+            subparser.add_argument('-e', '--encryption', metavar='MODE', dest='encryption', required=True,
+                                   choices=key_argument_names(),
+                                   help='select encryption key mode **(required)**')
+            subparser.add_argument('--append-only', dest='append_only', action='store_true',
+                                   help='create an append-only mode repository. Note that this only affects '
+                                        'the low level structure of the repository, and running `delete` '
+                                        'or `prune` will still be allowed. See :ref:`append_only_mode` in '
+                                        'Additional Notes for more details.')
+            subparser.add_argument('--storage-quota', metavar='QUOTA', dest='storage_quota', default=None,
+                                   type=parse_storage_quota,
+                                   help='Set storage quota of the new repository (e.g. 5G, 1.5T). Default: no quota.')
+            subparser.add_argument('--make-parent-dirs', dest='make_parent_dirs', action='store_true',
+                                   help='create the parent directories of the repository directory, if they are missing.')
 
         # borg key
-        subparser = subparsers.add_parser('key', parents=[mid_common_parser], add_help=False,
-                                          description="Manage a keyfile or repokey of a repository",
-                                          epilog="",
-                                          formatter_class=argparse.RawDescriptionHelpFormatter,
-                                          help='manage repository key')
-
-        key_parsers = subparser.add_subparsers(title='required arguments', metavar='<command>')
-        subparser.set_defaults(fallback_func=functools.partial(self.do_subcommand_help, subparser))
-
-        key_export_epilog = process_epilog("""
-        If repository encryption is used, the repository is inaccessible
-        without the key. This command allows one to backup this essential key.
-        Note that the backup produced does not include the passphrase itself
-        (i.e. the exported key stays encrypted). In order to regain access to a
-        repository, one needs both the exported key and the original passphrase.
-
-        There are three backup formats. The normal backup format is suitable for
-        digital storage as a file. The ``--paper`` backup format is optimized
-        for printing and typing in while importing, with per line checks to
-        reduce problems with manual input. The ``--qr-html`` creates a printable
-        HTML template with a QR code and a copy of the ``--paper``-formatted key.
-
-        For repositories using keyfile encryption the key is saved locally
-        on the system that is capable of doing backups. To guard against loss
-        of this key, the key needs to be backed up independently of the main
-        data backup.
-
-        For repositories using the repokey encryption the key is saved in the
-        repository in the config file. A backup is thus not strictly needed,
-        but guards against the repository becoming inaccessible if the file
-        is damaged for some reason.
-
-        Examples::
-
-            borg key export /path/to/repo > encrypted-key-backup
-            borg key export --paper /path/to/repo > encrypted-key-backup.txt
-            borg key export --qr-html /path/to/repo > encrypted-key-backup.html
-            # Or pass the output file as an argument instead of redirecting stdout:
-            borg key export /path/to/repo encrypted-key-backup
-            borg key export --paper /path/to/repo encrypted-key-backup.txt
-            borg key export --qr-html /path/to/repo encrypted-key-backup.html
-
-
-        """)
-        subparser = key_parsers.add_parser('export', parents=[common_parser], add_help=False,
-                                          description=self.do_key_export.__doc__,
-                                          epilog=key_export_epilog,
-                                          formatter_class=argparse.RawDescriptionHelpFormatter,
-                                          help='export repository key for backup')
-        subparser.set_defaults(func=self.do_key_export)
-        subparser.add_argument('location', metavar='REPOSITORY', nargs='?', default='',
-                               type=location_validator(archive=False))
-        subparser.add_argument('path', metavar='PATH', nargs='?', type=str,
-                               help='where to store the backup')
-        subparser.add_argument('--paper', dest='paper', action='store_true',
-                               help='Create an export suitable for printing and later type-in')
-        subparser.add_argument('--qr-html', dest='qr', action='store_true',
-                               help='Create an html file suitable for printing and later type-in or qr scan')
-
-        key_import_epilog = process_epilog("""
-        This command restores a key previously backed up with the export command.
-
-        If the ``--paper`` option is given, the import will be an interactive
-        process in which each line is checked for plausibility before
-        proceeding to the next line. For this format PATH must not be given.
-
-        For repositories using keyfile encryption, the key file which ``borg key
-        import`` writes to depends on several factors. If the ``BORG_KEY_FILE``
-        environment variable is set and non-empty, ``borg key import`` creates
-        or overwrites that file named by ``$BORG_KEY_FILE``. Otherwise, ``borg
-        key import`` searches in the ``$BORG_KEYS_DIR`` directory for a key file
-        associated with the repository. If a key file is found in
-        ``$BORG_KEYS_DIR``, ``borg key import`` overwrites it; otherwise, ``borg
-        key import`` creates a new key file in ``$BORG_KEYS_DIR``.
-        """)
-        subparser = key_parsers.add_parser('import', parents=[common_parser], add_help=False,
-                                          description=self.do_key_import.__doc__,
-                                          epilog=key_import_epilog,
-                                          formatter_class=argparse.RawDescriptionHelpFormatter,
-                                          help='import repository key from backup')
-        subparser.set_defaults(func=self.do_key_import)
-        subparser.add_argument('location', metavar='REPOSITORY', nargs='?', default='',
-                               type=location_validator(archive=False))
-        subparser.add_argument('path', metavar='PATH', nargs='?', type=str,
-                               help='path to the backup (\'-\' to read from stdin)')
-        subparser.add_argument('--paper', dest='paper', action='store_true',
-                               help='interactively import from a backup done with ``--paper``')
-
-        change_passphrase_epilog = process_epilog("""
-        The key files used for repository encryption are optionally passphrase
-        protected. This command can be used to change this passphrase.
-
-        Please note that this command only changes the passphrase, but not any
-        secret protected by it (like e.g. encryption/MAC keys or chunker seed).
-        Thus, changing the passphrase after passphrase and borg key got compromised
-        does not protect future (nor past) backups to the same repository.
-        """)
-        subparser = key_parsers.add_parser('change-passphrase', parents=[common_parser], add_help=False,
-                                          description=self.do_change_passphrase.__doc__,
-                                          epilog=change_passphrase_epilog,
-                                          formatter_class=argparse.RawDescriptionHelpFormatter,
-                                          help='change repository passphrase')
-        subparser.set_defaults(func=self.do_change_passphrase)
-        subparser.add_argument('location', metavar='REPOSITORY', nargs='?', default='',
-                               type=location_validator(archive=False))
-
-        change_location_epilog = process_epilog("""
-        Change the location of a borg key. The key can be stored at different locations:
-
-        keyfile: locally, usually in the home directory
-        repokey: inside the repo (in the repo config)
-
-        Note: this command does NOT change the crypto algorithms, just the key location,
-              thus you must ONLY give the key location (keyfile or repokey).
-        """)
-        subparser = key_parsers.add_parser('change-location', parents=[common_parser], add_help=False,
-                                          description=self.do_change_location.__doc__,
-                                          epilog=change_location_epilog,
-                                          formatter_class=argparse.RawDescriptionHelpFormatter,
-                                          help='change key location')
-        subparser.set_defaults(func=self.do_change_location)
-        subparser.add_argument('location', metavar='REPOSITORY', nargs='?', default='',
-                               type=location_validator(archive=False))
-        subparser.add_argument('key_mode', metavar='KEY_LOCATION', choices=('repokey', 'keyfile'),
-                               help='select key location')
-        subparser.add_argument('--keep', dest='keep', action='store_true',
-                               help='keep the key also at the current location (default: remove it)')
+        @subparsers.lazy_parser('key', parents=[mid_common_parser], add_help=False,
+                                description="Manage a keyfile or repokey of a repository",
+                                epilog="",
+                                formatter_class=argparse.RawDescriptionHelpFormatter,
+                                help='manage repository key')
+        def define_borg_key(subparser):
+            key_parsers = subparser.add_subparsers(title='required arguments', metavar='<command>',
+                                                   action=LazySubParsersAction)
+            subparser.set_defaults(fallback_func=functools.partial(self.do_subcommand_help, subparser))
+
+            @key_parsers.lazy_parser('export', parents=[common_parser], add_help=False,
+                                    func=self.do_key_export,
+                                    epilog=process_epilog(KEY_EXPORT_EPILOG),
+                                    formatter_class=argparse.RawDescriptionHelpFormatter,
+                                    help='export repository key for backup')
+            def define_borg_key_export(subparser):
+                subparser.add_argument('location', metavar='REPOSITORY', nargs='?', default='',
+                                       type=location_validator(archive=False))
+                subparser.add_argument('path', metavar='PATH', nargs='?', type=str,
+                                       help='where to store the backup')
+                subparser.add_argument('--paper', dest='paper', action='store_true',
+                                       help='Create an export suitable for printing and later type-in')
+                subparser.add_argument('--qr-html', dest='qr', action='store_true',
+                                       help='Create an html file suitable for printing and later type-in or qr scan')
+
+            @key_parsers.lazy_parser('import', parents=[common_parser], add_help=False,
+                                    func=self.do_key_import,
+                                    epilog=process_epilog(KEY_IMPORT_EPILOG),
+                                    formatter_class=argparse.RawDescriptionHelpFormatter,
+                                    help='import repository key from backup')
+            def define_borg_key_import(subparser):
+                subparser.add_argument('location', metavar='REPOSITORY', nargs='?', default='',
+                                       type=location_validator(archive=False))
+                subparser.add_argument('path', metavar='PATH', nargs='?', type=str,
+                                       help='path to the backup (\'-\' to read from stdin)')
+                subparser.add_argument('--paper', dest='paper', action='store_true',
+                                       help='interactively import from a backup done with ``--paper``')
+
+            @key_parsers.lazy_parser('change-passphrase', parents=[common_parser], add_help=False,
+                                    func=self.do_change_passphrase,
+                                    epilog=process_epilog(KEY_CHANGE_PASSPHRASE_EPILOG),
+                                    formatter_class=argparse.RawDescriptionHelpFormatter,
+                                    help='change repository passphrase')
+            def define_borg_key_change_passphrase(subparser):
+                subparser.add_argument('location', metavar='REPOSITORY', nargs='?', default='',
+                                       type=location_validator(archive=False))
+
+            @key_parsers.lazy_parser('change-location', parents=[common_parser], add_help=False,
+                                    func=self.do_change_location,
+                                    epilog=process_epilog(KEY_CHANGE_LOCATION_EPILOG),
+                                    formatter_class=argparse.RawDescriptionHelpFormatter,
+                                    help='change key location')
+            def define_borg_key_change_location(subparser):
+                subparser.add_argument('location', metavar='REPOSITORY', nargs='?', default='',
+                                       type=location_validator(archive=False))
+                subparser.add_argument('key_mode', metavar='KEY_LOCATION', choices=('repokey', 'keyfile'),
+                                       help='select key location')
+                subparser.add_argument('--keep', dest='keep', action='store_true',
+                                       help='keep the key also at the current location (default: remove it)')
 
         # borg list
-        list_epilog = process_epilog("""
-        This command lists the contents of a repository or an archive.
-
-        For more help on include/exclude patterns, see the :ref:`borg_patterns` command output.
-
-        .. man NOTES
-
-        The FORMAT specifier syntax
-        +++++++++++++++++++++++++++
-
-        The ``--format`` option uses python's `format string syntax
-        <https://docs.python.org/3.9/library/string.html#formatstrings>`_.
-
-        Examples:
-        ::
-
-            $ borg list --format '{archive}{NL}' /path/to/repo
-            ArchiveFoo
-            ArchiveBar
-            ...
-
-            # {VAR:NUMBER} - pad to NUMBER columns.
-            # Strings are left-aligned, numbers are right-aligned.
-            # Note: time columns except ``isomtime``, ``isoctime`` and ``isoatime`` cannot be padded.
-            $ borg list --format '{archive:36} {time} [{id}]{NL}' /path/to/repo
-            ArchiveFoo                           Thu, 2021-12-09 10:22:28 [0b8e9a312bef3f2f6e2d0fc110c196827786c15eba0188738e81697a7fa3b274]
-            $ borg list --format '{mode} {user:6} {group:6} {size:8} {mtime} {path}{extra}{NL}' /path/to/repo::ArchiveFoo
-            -rw-rw-r-- user   user       1024 Thu, 2021-12-09 10:22:17 file-foo
-            ...
-
-            # {VAR:<NUMBER} - pad to NUMBER columns left-aligned.
-            # {VAR:>NUMBER} - pad to NUMBER columns right-aligned.
-            $ borg list --format '{mode} {user:>6} {group:>6} {size:<8} {mtime} {path}{extra}{NL}' /path/to/repo::ArchiveFoo
-            -rw-rw-r--   user   user 1024     Thu, 2021-12-09 10:22:17 file-foo
-            ...
-
-        The following keys are always available:
-
-
-        """) + BaseFormatter.keys_help() + textwrap.dedent("""
-
-        Keys available only when listing archives in a repository:
-
-        """) + ArchiveFormatter.keys_help() + textwrap.dedent("""
-
-        Keys available only when listing files in an archive:
-
-        """) + ItemFormatter.keys_help()
-        subparser = subparsers.add_parser('list', parents=[common_parser], add_help=False,
-                                          description=self.do_list.__doc__,
-                                          epilog=list_epilog,
-                                          formatter_class=argparse.RawDescriptionHelpFormatter,
-                                          help='list archive or repository contents')
-        subparser.set_defaults(func=self.do_list)
-        subparser.add_argument('--consider-checkpoints', action='store_true', dest='consider_checkpoints',
-                help='Show checkpoint archives in the repository contents list (default: hidden).')
-        subparser.add_argument('--short', dest='short', action='store_true',
-                               help='only print file/directory names, nothing else')
-        subparser.add_argument('--format', metavar='FORMAT', dest='format',
-                               help='specify format for file or archive listing '
-                                    '(default for files: "{mode} {user:6} {group:6} {size:8} {mtime} {path}{extra}{NL}"; '
-                                    'for archives: "{archive:<36} {time} [{id}]{NL}")')
-        subparser.add_argument('--json', action='store_true',
-                               help='Only valid for listing repository contents. Format output as JSON. '
-                                    'The form of ``--format`` is ignored, '
-                                    'but keys used in it are added to the JSON output. '
-                                    'Some keys are always present. Note: JSON can only represent text. '
-                                    'A "barchive" key is therefore not available.')
-        subparser.add_argument('--json-lines', action='store_true',
-                               help='Only valid for listing archive contents. Format output as JSON Lines. '
-                                    'The form of ``--format`` is ignored, '
-                                    'but keys used in it are added to the JSON output. '
-                                    'Some keys are always present. Note: JSON can only represent text. '
-                                    'A "bpath" key is therefore not available.')
-        subparser.add_argument('location', metavar='REPOSITORY_OR_ARCHIVE', nargs='?', default='',
-                               type=location_validator(),
-                               help='repository or archive to list contents of')
-        subparser.add_argument('paths', metavar='PATH', nargs='*', type=str,
-                               help='paths to list; patterns are supported')
-        define_archive_filters_group(subparser)
-        define_exclusion_group(subparser)
-
-        subparser = subparsers.add_parser('mount', parents=[common_parser], add_help=False,
-                                        description=self.do_mount.__doc__,
-                                        epilog=mount_epilog,
-                                        formatter_class=argparse.RawDescriptionHelpFormatter,
-                                        help='mount repository')
-        define_borg_mount(subparser)
+        @subparsers.lazy_parser('list', parents=[common_parser], add_help=False,
+                                func=self.do_list,
+                                formatter_class=argparse.RawDescriptionHelpFormatter,
+                                help='list archive or repository contents')
+        def define_borg_list(subparser):
+            # unlike the other epilogs, this one gets rendered when it is assembled (and the keys
+            # help is generated), so only do that when the list parser is actually built.
+            subparser.epilog = process_epilog(LIST_EPILOG) + BaseFormatter.keys_help() + """
+
+Keys available only when listing archives in a repository:
+
+""" + ArchiveFormatter.keys_help() + """
+
+Keys available only when listing files in an archive:
+
+""" + ItemFormatter.keys_help()
+
+            subparser.add_argument('--consider-checkpoints', action='store_true', dest='consider_checkpoints',
+                    help='Show checkpoint archives in the repository contents list (default: hidden).')
+            subparser.add_argument('--short', dest='short', action='store_true',
+                                   help='only print file/directory names, nothing else')
+            subparser.add_argument('--format', metavar='FORMAT', dest='format',
+                                   help='specify format for file or archive listing '
+                                        '(default for files: "{mode} {user:6} {group:6} {size:8} {mtime} {path}{extra}{NL}"; '
+                                        'for archives: "{archive:<36} {time} [{id}]{NL}")')
+            subparser.add_argument('--json', action='store_true',
+                                   help='Only valid for listing repository contents. Format output as JSON. '
+                                        'The form of ``--format`` is ignored, '
+                                        'but keys used in it are added to the JSON output. '
+                                        'Some keys are always present. Note: JSON can only represent text. '
+                                        'A "barchive" key is therefore not available.')
+            subparser.add_argument('--json-lines', action='store_true',
+                                   help='Only valid for listing archive contents. Format output as JSON Lines. '
+                                        'The form of ``--format`` is ignored, '
+                                        'but keys used in it are added to the JSON output. '
+                                        'Some keys are always present. Note: JSON can only represent text. '
+                                        'A "bpath" key is therefore not available.')
+            subparser.add_argument('location', metavar='REPOSITORY_OR_ARCHIVE', nargs='?', default='',
+                                   type=location_validator(),
+                                   help='repository or archive to list contents of')
+            subparser.add_argument('paths', metavar='PATH', nargs='*', type=str,
+                                   help='paths to list; patterns are supported')
+            define_archive_filters_group(subparser)
+            define_exclusion_group(subparser)
+
+        # borg mount
+        subparsers.lazy_parser('mount', parents=[common_parser], add_help=False,
+                               description=self.do_mount.__doc__,
+                               epilog=process_epilog(MOUNT_EPILOG),
+                               formatter_class=argparse.RawDescriptionHelpFormatter,
+                               help='mount repository')(define_borg_mount)
 
         # borg prune
-        prune_epilog = process_epilog("""
-        The prune command prunes a repository by deleting all archives not matching
-        any of the specified retention options.
-
-        Important: Repository disk space is **not** freed until you run ``borg compact``.
-
-        This command is normally used by automated backup scripts wanting to keep a
-        certain number of historic backups. This retention policy is commonly referred to as
-        `GFS <https://en.wikipedia.org/wiki/Backup_rotation_scheme#Grandfather-father-son>`_
-        (Grandfather-father-son) backup rotation scheme.
-
-        Also, prune automatically removes checkpoint archives (incomplete archives left
-        behind by interrupted backup runs) except if the checkpoint is the latest
-        archive (and thus still needed). Checkpoint archives are not considered when
-        comparing archive counts against the retention limits (``--keep-X``).
-
-        If a prefix is set with -P, then only archives that start with the prefix are
-        considered for deletion and only those archives count towards the totals
-        specified by the rules.
-        Otherwise, *all* archives in the repository are candidates for deletion!
-        There is no automatic distinction between archives representing different
-        contents. These need to be distinguished by specifying matching prefixes.
-
-        If you have multiple sequences of archives with different data sets (e.g.
-        from different machines) in one shared repository, use one prune call per
-        data set that matches only the respective archives using the -P option.
-
-        The ``--keep-within`` option takes an argument of the form "<int><char>",
-        where char is "H", "d", "w", "m", "y". For example, ``--keep-within 2d`` means
-        to keep all archives that were created within the past 48 hours.
-        "1m" is taken to mean "31d". The archives kept with this option do not
-        count towards the totals specified by any other options.
-
-        A good procedure is to thin out more and more the older your backups get.
-        As an example, ``--keep-daily 7`` means to keep the latest backup on each day,
-        up to 7 most recent days with backups (days without backups do not count).
-        The rules are applied from secondly to yearly, and backups selected by previous
-        rules do not count towards those of later rules. The time that each backup
-        starts is used for pruning purposes. Dates and times are interpreted in
-        the local timezone, and weeks go from Monday to Sunday. Specifying a
-        negative number of archives to keep means that there is no limit. As of borg
-        1.2.0, borg will retain the oldest archive if any of the secondly, minutely,
-        hourly, daily, weekly, monthly, or yearly rules was not otherwise able to meet
-        its retention target. This enables the first chronological archive to continue
-        aging until it is replaced by a newer archive that meets the retention criteria.
-
-        The ``--keep-last N`` option is doing the same as ``--keep-secondly N`` (and it will
-        keep the last N archives under the assumption that you do not create more than one
-        backup archive in the same second).
-
-        When using ``--stats``, you will get some statistics about how much data was
-        deleted - the "Deleted data" deduplicated size there is most interesting as
-        that is how much your repository will shrink.
-        Please note that the "All archives" stats refer to the state after pruning.
-        """)
-        subparser = subparsers.add_parser('prune', parents=[common_parser], add_help=False,
-                                          description=self.do_prune.__doc__,
-                                          epilog=prune_epilog,
-                                          formatter_class=argparse.RawDescriptionHelpFormatter,
-                                          help='prune archives')
-        subparser.set_defaults(func=self.do_prune)
-        subparser.add_argument('-n', '--dry-run', dest='dry_run', action='store_true',
-                               help='do not change repository')
-        subparser.add_argument('--force', dest='forced', action='store_true',
-                               help='force pruning of corrupted archives, '
-                                    'use ``--force --force`` in case ``--force`` does not work.')
-        subparser.add_argument('-s', '--stats', dest='stats', action='store_true',
-                               help='print statistics for the deleted archive')
-        subparser.add_argument('--list', dest='output_list', action='store_true',
-                               help='output verbose list of archives it keeps/prunes')
-        subparser.add_argument('--keep-within', metavar='INTERVAL', dest='within', type=interval,
-                               help='keep all archives within this time interval')
-        subparser.add_argument('--keep-last', '--keep-secondly', dest='secondly', type=int, default=0,
-                               help='number of secondly archives to keep')
-        subparser.add_argument('--keep-minutely', dest='minutely', type=int, default=0,
-                               help='number of minutely archives to keep')
-        subparser.add_argument('-H', '--keep-hourly', dest='hourly', type=int, default=0,
-                               help='number of hourly archives to keep')
-        subparser.add_argument('-d', '--keep-daily', dest='daily', type=int, default=0,
-                               help='number of daily archives to keep')
-        subparser.add_argument('-w', '--keep-weekly', dest='weekly', type=int, default=0,
-                               help='number of weekly archives to keep')
-        subparser.add_argument('-m', '--keep-monthly', dest='monthly', type=int, default=0,
-                               help='number of monthly archives to keep')
-        subparser.add_argument('-y', '--keep-yearly', dest='yearly', type=int, default=0,
-                               help='number of yearly archives to keep')
-        define_archive_filters_group(subparser, sort_by=False, first_last=False)
-        subparser.add_argument('--save-space', dest='save_space', action='store_true',
-                               help='work slower, but using less space')
-        subparser.add_argument('location', metavar='REPOSITORY', nargs='?', default='',
-                               type=location_validator(archive=False),
-                               help='repository to prune')
+        @subparsers.lazy_parser('prune', parents=[common_parser], add_help=False,
+                                func=self.do_prune,
+                                epilog=process_epilog(PRUNE_EPILOG),
+                                formatter_class=argparse.RawDescriptionHelpFormatter,
+                                help='prune archives')
+        def define_borg_prune(subparser):
+            subparser.add_argument('-n', '--dry-run', dest='dry_run', action='store_true',
+                                   help='do not change repository')
+            subparser.add_argument('--force', dest='forced', action='store_true',
+                                   help='force pruning of corrupted archives, '
+                                        'use ``--force --force`` in case ``--force`` does not work.')
+            subparser.add_argument('-s', '--stats', dest='stats', action='store_true',
+                                   help='print statistics for the deleted archive')
+            subparser.add_argument('--list', dest='output_list', action='store_true',
+                                   help='output verbose list of archives it keeps/prunes')
+            subparser.add_argument('--keep-within', metavar='INTERVAL', dest='within', type=interval,
+                                   help='keep all archives within this time interval')
+            subparser.add_argument('--keep-last', '--keep-secondly', dest='secondly', type=int, default=0,
+                                   help='number of secondly archives to keep')
+            subparser.add_argument('--keep-minutely', dest='minutely', type=int, default=0,
+                                   help='number of minutely archives to keep')
+            subparser.add_argument('-H', '--keep-hourly', dest='hourly', type=int, default=0,
+                                   help='number of hourly archives to keep')
+            subparser.add_argument('-d', '--keep-daily', dest='daily', type=int, default=0,
+                                   help='number of daily archives to keep')
+            subparser.add_argument('-w', '--keep-weekly', dest='weekly', type=int, default=0,
+                                   help='number of weekly archives to keep')
+            subparser.add_argument('-m', '--keep-monthly', dest='monthly', type=int, default=0,
+                                   help='number of monthly archives to keep')
+            subparser.add_argument('-y', '--keep-yearly', dest='yearly', type=int, default=0,
+                                   help='number of yearly archives to keep')
+            define_archive_filters_group(subparser, sort_by=False, first_last=False)
+            subparser.add_argument('--save-space', dest='save_space', action='store_true',
+                                   help='work slower, but using less space')
+            subparser.add_argument('location', metavar='REPOSITORY', nargs='?', default='',
+                                   type=location_validator(archive=False),
+                                   help='repository to prune')
 
         # borg recreate
-        recreate_epilog = process_epilog("""
-        Recreate the contents of existing archives.
-
-        recreate is a potentially dangerous function and might lead to data loss
-        (if used wrongly). BE VERY CAREFUL!
-
-        Important: Repository disk space is **not** freed until you run ``borg compact``.
-
-        ``--exclude``, ``--exclude-from``, ``--exclude-if-present``, ``--keep-exclude-tags``
-        and PATH have the exact same semantics as in "borg create", but they only check
-        for files in the archives and not in the local file system. If PATHs are specified,
-        the resulting archives will only contain files from these PATHs.
-
-        Note that all paths in an archive are relative, therefore absolute patterns/paths
-        will *not* match (``--exclude``, ``--exclude-from``, PATHs).
-
-        ``--recompress`` allows one to change the compression of existing data in archives.
-        Due to how Borg stores compressed size information this might display
-        incorrect information for archives that were not recreated at the same time.
-        There is no risk of data loss by this.
-
-        ``--chunker-params`` will re-chunk all files in the archive, this can be
-        used to have upgraded Borg 0.xx or Attic archives deduplicate with
-        Borg 1.x archives.
-
-        **USE WITH CAUTION.**
-        Depending on the PATHs and patterns given, recreate can be used to permanently
-        delete files from archives.
-        When in doubt, use ``--dry-run --verbose --list`` to see how patterns/PATHS are
-        interpreted. See :ref:`list_item_flags` in ``borg create`` for details.
-
-        The archive being recreated is only removed after the operation completes. The
-        archive that is built during the operation exists at the same time at
-        "<ARCHIVE>.recreate". The new archive will have a different archive ID.
-
-        With ``--target`` the original archive is not replaced, instead a new archive is created.
-
-        When rechunking (or recompressing), space usage can be substantial - expect
-        at least the entire deduplicated size of the archives using the previous
-        chunker (or compression) params.
-
-        If you recently ran borg check --repair and it had to fix lost chunks with all-zero
-        replacement chunks, please first run another backup for the same data and re-run
-        borg check --repair afterwards to heal any archives that had lost chunks which are
-        still generated from the input data.
-
-        Important: running borg recreate to re-chunk will remove the chunks_healthy
-        metadata of all items with replacement chunks, so healing will not be possible
-        any more after re-chunking (it is also unlikely it would ever work: due to the
-        change of chunking parameters, the missing chunk likely will never be seen again
-        even if you still have the data that produced it).
-        """)
-        subparser = subparsers.add_parser('recreate', parents=[common_parser], add_help=False,
-                                          description=self.do_recreate.__doc__,
-                                          epilog=recreate_epilog,
-                                          formatter_class=argparse.RawDescriptionHelpFormatter,
-                                          help=self.do_recreate.__doc__)
-        subparser.set_defaults(func=self.do_recreate)
-        subparser.add_argument('--list', dest='output_list', action='store_true',
-                               help='output verbose list of items (files, dirs, ...)')
-        subparser.add_argument('--filter', metavar='STATUSCHARS', dest='output_filter', action=Highlander,
-                               help='only display items with the given status characters (listed in borg create --help)')
-        subparser.add_argument('-n', '--dry-run', dest='dry_run', action='store_true',
-                               help='do not change anything')
-        subparser.add_argument('-s', '--stats', dest='stats', action='store_true',
-                               help='print statistics at end')
-
-        define_exclusion_group(subparser, tag_files=True)
-
-        archive_group = subparser.add_argument_group('Archive options')
-        archive_group.add_argument('--target', dest='target', metavar='TARGET', default=None,
-                                   type=archivename_validator(),
-                                   help='create a new archive with the name ARCHIVE, do not replace existing archive '
-                                        '(only applies for a single archive)')
-        archive_group.add_argument('-c', '--checkpoint-interval', dest='checkpoint_interval',
-                                   type=int, default=1800, metavar='SECONDS',
-                                   help='write checkpoint every SECONDS seconds (Default: 1800)')
-        archive_group.add_argument('--comment', dest='comment', metavar='COMMENT', type=CommentSpec, default=None,
-                                   help='add a comment text to the archive')
-        archive_group.add_argument('--timestamp', metavar='TIMESTAMP', dest='timestamp',
-                                   type=timestamp, default=None,
-                                   help='manually specify the archive creation date/time (UTC, yyyy-mm-ddThh:mm:ss format). '
-                                        'alternatively, give a reference file/directory.')
-        archive_group.add_argument('-C', '--compression', metavar='COMPRESSION', dest='compression',
-                                   type=CompressionSpec, default=CompressionSpec('lz4'),
-                                   help='select compression algorithm, see the output of the '
-                                        '"borg help compression" command for details.')
-        archive_group.add_argument('--recompress', metavar='MODE', dest='recompress', nargs='?',
-                                   default='never', const='if-different', choices=('never', 'if-different', 'always'),
-                                   help='recompress data chunks according to `MODE` and ``--compression``. '
-                                        'Possible modes are '
-                                        '`if-different`: recompress if current compression is with a different '
-                                        'compression algorithm (the level is not considered); '
-                                        '`always`: recompress even if current compression is with the same '
-                                        'compression algorithm (use this to change the compression level); and '
-                                        '`never`: do not recompress (use this option to explicitly prevent '
-                                        'recompression). '
-                                        'If no MODE is given, `if-different` will be used. '
-                                        'Not passing --recompress is equivalent to "--recompress never".')
-        archive_group.add_argument('--chunker-params', metavar='PARAMS', dest='chunker_params', action=Highlander,
-                                   type=ChunkerParams, default=CHUNKER_PARAMS,
-                                   help='specify the chunker parameters (ALGO, CHUNK_MIN_EXP, CHUNK_MAX_EXP, '
-                                        'HASH_MASK_BITS, HASH_WINDOW_SIZE) or `default` to use the current defaults. '
-                                        'default: %s,%d,%d,%d,%d' % CHUNKER_PARAMS)
-
-        subparser.add_argument('location', metavar='REPOSITORY_OR_ARCHIVE', nargs='?', default='',
-                               type=location_validator(),
-                               help='repository or archive to recreate')
-        subparser.add_argument('paths', metavar='PATH', nargs='*', type=str,
-                               help='paths to recreate; patterns are supported')
+        @subparsers.lazy_parser('recreate', parents=[common_parser], add_help=False,
+                                func=self.do_recreate,
+                                epilog=process_epilog(RECREATE_EPILOG),
+                                formatter_class=argparse.RawDescriptionHelpFormatter,
+                                help=self.do_recreate.__doc__)
+        def define_borg_recreate(subparser):
+            subparser.add_argument('--list', dest='output_list', action='store_true',
+                                   help='output verbose list of items (files, dirs, ...)')
+            subparser.add_argument('--filter', metavar='STATUSCHARS', dest='output_filter', action=Highlander,
+                                   help='only display items with the given status characters (listed in borg create --help)')
+            subparser.add_argument('-n', '--dry-run', dest='dry_run', action='store_true',
+                                   help='do not change anything')
+            subparser.add_argument('-s', '--stats', dest='stats', action='store_true',
+                                   help='print statistics at end')
+
+            define_exclusion_group(subparser, tag_files=True)
+
+            archive_group = subparser.add_argument_group('Archive options')
+            archive_group.add_argument('--target', dest='target', metavar='TARGET', default=None,
+                                       type=archivename_validator(),
+                                       help='create a new archive with the name ARCHIVE, do not replace existing archive '
+                                            '(only applies for a single archive)')
+            archive_group.add_argument('-c', '--checkpoint-interval', dest='checkpoint_interval',
+                                       type=int, default=1800, metavar='SECONDS',
+                                       help='write checkpoint every SECONDS seconds (Default: 1800)')
+            archive_group.add_argument('--comment', dest='comment', metavar='COMMENT', type=CommentSpec, default=None,
+                                       help='add a comment text to the archive')
+            archive_group.add_argument('--timestamp', metavar='TIMESTAMP', dest='timestamp',
+                                       type=timestamp, default=None,
+                                       help='manually specify the archive creation date/time (UTC, yyyy-mm-ddThh:mm:ss format). '
+                                            'alternatively, give a reference file/directory.')
+            archive_group.add_argument('-C', '--compression', metavar='COMPRESSION', dest='compression',
+                                       type=CompressionSpec, default=CompressionSpec('lz4'),
+                                       help='select compression algorithm, see the output of the '
+                                            '"borg help compression" command for details.')
+            archive_group.add_argument('--recompress', metavar='MODE', dest='recompress', nargs='?',
+                                       default='never', const='if-different', choices=('never', 'if-different', 'always'),
+                                       help='recompress data chunks according to `MODE` and ``--compression``. '
+                                            'Possible modes are '
+                                            '`if-different`: recompress if current compression is with a different '
+                                            'compression algorithm (the level is not considered); '
+                                            '`always`: recompress even if current compression is with the same '
+                                            'compression algorithm (use this to change the compression level); and '
+                                            '`never`: do not recompress (use this option to explicitly prevent '
+                                            'recompression). '
+                                            'If no MODE is given, `if-different` will be used. '
+                                            'Not passing --recompress is equivalent to "--recompress never".')
+            archive_group.add_argument('--chunker-params', metavar='PARAMS', dest='chunker_params', action=Highlander,
+                                       type=ChunkerParams, default=CHUNKER_PARAMS,
+                                       help='specify the chunker parameters (ALGO, CHUNK_MIN_EXP, CHUNK_MAX_EXP, '
+                                            'HASH_MASK_BITS, HASH_WINDOW_SIZE) or `default` to use the current defaults. '
+                                            'default: %s,%d,%d,%d,%d' % CHUNKER_PARAMS)
+
+            subparser.add_argument('location', metavar='REPOSITORY_OR_ARCHIVE', nargs='?', default='',
+                                   type=location_validator(),
+                                   help='repository or archive to recreate')
+            subparser.add_argument('paths', metavar='PATH', nargs='*', type=str,
+                                   help='paths to recreate; patterns are supported')
 
         # borg rename
-        rename_epilog = process_epilog("""
-        This command renames an archive in the repository.
-
-        This results in a different archive ID.
-        """)
-        subparser = subparsers.add_parser('rename', parents=[common_parser], add_help=False,
-                                          description=self.do_rename.__doc__,
-                                          epilog=rename_epilog,
-                                          formatter_class=argparse.RawDescriptionHelpFormatter,
-                                          help='rename archive')
-        subparser.set_defaults(func=self.do_rename)
-        subparser.add_argument('location', metavar='ARCHIVE',
-                               type=location_validator(archive=True),
-                               help='archive to rename')
-        subparser.add_argument('name', metavar='NEWNAME',
-                               type=archivename_validator(),
-                               help='the new archive name to use')
+        @subparsers.lazy_parser('rename', parents=[common_parser], add_help=False,
+                                func=self.do_rename,
+                                epilog=process_epilog(RENAME_EPILOG),
+                                formatter_class=argparse.RawDescriptionHelpFormatter,
+                                help='rename archive')
+        def define_borg_rename(subparser):
+            subparser.add_argument('location', metavar='ARCHIVE',
+                                   type=location_validator(archive=True),
+                                   help='archive to rename')
+            subparser.add_argument('name', metavar='NEWNAME',
+                                   type=archivename_validator(),
+                                   help='the new archive name to use')
 
         # borg serve
-        serve_epilog = process_epilog("""
-        This command starts a repository server process. This command is usually not used manually.
-        """)
-        subparser = subparsers.add_parser('serve', parents=[common_parser], add_help=False,
-                                          description=self.do_serve.__doc__, epilog=serve_epilog,
-                                          formatter_class=argparse.RawDescriptionHelpFormatter,
-                                          help='start repository server process')
-        subparser.set_defaults(func=self.do_serve)
-        subparser.add_argument('--restrict-to-path', metavar='PATH', dest='restrict_to_paths', action='append',
-                               help='restrict repository access to PATH. '
-                                    'Can be specified multiple times to allow the client access to several directories. '
-                                    'Access to all sub-directories is granted implicitly; PATH doesn\'t need to directly point to a repository.')
-        subparser.add_argument('--restrict-to-repository', metavar='PATH', dest='restrict_to_repositories', action='append',
-                                help='restrict repository access. Only the repository located at PATH '
-                                     '(no sub-directories are considered) is accessible. '
-                                     'Can be specified multiple times to allow the client access to several repositories. '
-                                     'Unlike ``--restrict-to-path`` sub-directories are not accessible; '
-                                     'PATH needs to directly point at a repository location. '
-                                     'PATH may be an empty directory or the last element of PATH may not exist, in which case '
-                                     'the client may initialize a repository there.')
-        subparser.add_argument('--append-only', dest='append_only', action='store_true',
-                               help='only allow appending to repository segment files. Note that this only '
-                                    'affects the low level structure of the repository, and running `delete` '
-                                    'or `prune` will still be allowed. See :ref:`append_only_mode` in Additional '
-                                    'Notes for more details.')
-        subparser.add_argument('--storage-quota', metavar='QUOTA', dest='storage_quota',
-                               type=parse_storage_quota, default=None,
-                               help='Override storage quota of the repository (e.g. 5G, 1.5T). '
-                                    'When a new repository is initialized, sets the storage quota on the new '
-                                    'repository as well. Default: no quota.')
+        @subparsers.lazy_parser('serve', parents=[common_parser], add_help=False,
+                                func=self.do_serve, epilog=process_epilog(SERVE_EPILOG),
+                                formatter_class=argparse.RawDescriptionHelpFormatter,
+                                help='start repository server process')
+        def define_borg_serve(subparser):
+            subparser.add_argument('--restrict-to-path', metavar='PATH', dest='restrict_to_paths', action='append',
+                                   help='restrict repository access to PATH. '
+                                        'Can be specified multiple times to allow the client access to several directories. '
+                                        'Access to all sub-directories is granted implicitly; PATH doesn\'t need to directly point to a repository.')
+            subparser.add_argument('--restrict-to-repository', metavar='PATH', dest='restrict_to_repositories', action='append',
+                                    help='restrict repository access. Only the repository located at PATH '
+                                         '(no sub-directories are considered) is accessible. '
+                                         'Can be specified multiple times to allow the client access to several repositories. '
+                                         'Unlike ``--restrict-to-path`` sub-directories are not accessible; '
+                                         'PATH needs to directly point at a repository location. '
+                                         'PATH may be an empty directory or the last element of PATH may not exist, in which case '
+                                         'the client may initialize a repository there.')
+            subparser.add_argument('--append-only', dest='append_only', action='store_true',
+                                   help='only allow appending to repository segment files. Note that this only '
+                                        'affects the low level structure of the repository, and running `delete` '
+                                        'or `prune` will still be allowed. See :ref:`append_only_mode` in Additional '
+                                        'Notes for more details.')
+            subparser.add_argument('--storage-quota', metavar='QUOTA', dest='storage_quota',
+                                   type=parse_storage_quota, default=None,
+                                   help='Override storage quota of the repository (e.g. 5G, 1.5T). '
+                                        'When a new repository is initialized, sets the storage quota on the new '
+                                        'repository as well. Default: no quota.')
 
         # borg umount
-        umount_epilog = process_epilog("""
-        This command un-mounts a FUSE filesystem that was mounted with ``borg mount``.
-
-        This is a convenience wrapper that just calls the platform-specific shell
-        command - usually this is either umount or fusermount -u.
-        """)
-        subparser = subparsers.add_parser('umount', parents=[common_parser], add_help=False,
-                                          description=self.do_umount.__doc__,
-                                          epilog=umount_epilog,
-                                          formatter_class=argparse.RawDescriptionHelpFormatter,
-                                          help='umount repository')
-        subparser.set_defaults(func=self.do_umount)
-        subparser.add_argument('mountpoint', metavar='MOUNTPOINT', type=str,
-                               help='mountpoint of the filesystem to umount')
+        @subparsers.lazy_parser('umount', parents=[common_parser], add_help=False,
+                                func=self.do_umount,
+                                epilog=process_epilog(UMOUNT_EPILOG),
+                                formatter_class=argparse.RawDescriptionHelpFormatter,
+                                help='umount repository')
+        def define_borg_umount(subparser):
+            subparser.add_argument('mountpoint', metavar='MOUNTPOINT', type=str,
+                                   help='mountpoint of the filesystem to umount')
 
         # borg upgrade
-        upgrade_epilog = process_epilog("""
-        Upgrade an existing, local Borg repository.
-
-        When you do not need borg upgrade
-        +++++++++++++++++++++++++++++++++
-
-        Not every change requires that you run ``borg upgrade``.
-
-        You do **not** need to run it when:
-
-        - moving your repository to a different place
-        - upgrading to another point release (like 1.0.x to 1.0.y),
-          except when noted otherwise in the changelog
-        - upgrading from 1.0.x to 1.1.x,
-          except when noted otherwise in the changelog
-
-        Borg 1.x.y upgrades
-        +++++++++++++++++++
-
-        Use ``borg upgrade --tam REPO`` to require manifest authentication
-        introduced with Borg 1.0.9 to address security issues. This means
-        that modifying the repository after doing this with a version prior
-        to 1.0.9 will raise a validation error, so only perform this upgrade
-        after updating all clients using the repository to 1.0.9 or newer.
-
-        This upgrade should be done on each client for safety reasons.
-
-        If a repository is accidentally modified with a pre-1.0.9 client after
-        this upgrade, use ``borg upgrade --tam --force REPO`` to remedy it.
-
-        If you routinely do this you might not want to enable this upgrade
-        (which will leave you exposed to the security issue). You can
-        reverse the upgrade by issuing ``borg upgrade --disable-tam REPO``.
-
-        See
-        https://borgbackup.readthedocs.io/en/stable/changes.html#pre-1-0-9-manifest-spoofing-vulnerability
-        for details.
-
-        Attic and Borg 0.xx to Borg 1.x
-        +++++++++++++++++++++++++++++++
-
-        This currently supports converting an Attic repository to Borg and also
-        helps with converting Borg 0.xx to 1.0.
-
-        Currently, only LOCAL repositories can be upgraded (issue #465).
-
-        Please note that ``borg create`` (since 1.0.0) uses bigger chunks by
-        default than old borg or attic did, so the new chunks won't deduplicate
-        with the old chunks in the upgraded repository.
-        See ``--chunker-params`` option of ``borg create`` and ``borg recreate``.
-
-        ``borg upgrade`` will change the magic strings in the repository's
-        segments to match the new Borg magic strings. The keyfiles found in
-        $ATTIC_KEYS_DIR or ~/.attic/keys/ will also be converted and
-        copied to $BORG_KEYS_DIR or ~/.config/borg/keys.
-
-        The cache files are converted, from $ATTIC_CACHE_DIR or
-        ~/.cache/attic to $BORG_CACHE_DIR or ~/.cache/borg, but the
-        cache layout between Borg and Attic changed, so it is possible
-        the first backup after the conversion takes longer than expected
-        due to the cache resync.
-
-        Upgrade should be able to resume if interrupted, although it
-        will still iterate over all segments. If you want to start
-        from scratch, use `borg delete` over the copied repository to
-        make sure the cache files are also removed::
-
-            borg delete borg
-
-        Unless ``--inplace`` is specified, the upgrade process first creates a backup
-        copy of the repository, in REPOSITORY.before-upgrade-DATETIME, using hardlinks.
-        This requires that the repository and its parent directory reside on same
-        filesystem so the hardlink copy can work.
-        This takes longer than in place upgrades, but is much safer and gives
-        progress information (as opposed to ``cp -al``). Once you are satisfied
-        with the conversion, you can safely destroy the backup copy.
-
-        WARNING: Running the upgrade in place will make the current
-        copy unusable with older version, with no way of going back
-        to previous versions. This can PERMANENTLY DAMAGE YOUR
-        REPOSITORY!  Attic CAN NOT READ BORG REPOSITORIES, as the
-        magic strings have changed. You have been warned.""")
-        subparser = subparsers.add_parser('upgrade', parents=[common_parser], add_help=False,
-                                          description=self.do_upgrade.__doc__,
-                                          epilog=upgrade_epilog,
-                                          formatter_class=argparse.RawDescriptionHelpFormatter,
-                                          help='upgrade repository format')
-        subparser.set_defaults(func=self.do_upgrade)
-        subparser.add_argument('-n', '--dry-run', dest='dry_run', action='store_true',
-                               help='do not change repository')
-        subparser.add_argument('--inplace', dest='inplace', action='store_true',
-                               help='rewrite repository in place, with no chance of going back '
-                                    'to older versions of the repository.')
-        subparser.add_argument('--force', dest='force', action='store_true',
-                               help='Force upgrade')
-        subparser.add_argument('--tam', dest='tam', action='store_true',
-                               help='Enable manifest authentication (in key and cache) (Borg 1.0.9 and later).')
-        subparser.add_argument('--disable-tam', dest='disable_tam', action='store_true',
-                               help='Disable manifest authentication (in key and cache).')
-        subparser.add_argument('location', metavar='REPOSITORY', nargs='?', default='',
-                               type=location_validator(archive=False),
-                               help='path to the repository to be upgraded')
+        @subparsers.lazy_parser('upgrade', parents=[common_parser], add_help=False,
+                                func=self.do_upgrade,
+                                epilog=process_epilog(UPGRADE_EPILOG),
+                                formatter_class=argparse.RawDescriptionHelpFormatter,
+                                help='upgrade repository format')
+        def define_borg_upgrade(subparser):
+            subparser.add_argument('-n', '--dry-run', dest='dry_run', action='store_true',
+                                   help='do not change repository')
+            subparser.add_argument('--inplace', dest='inplace', action='store_true',
+                                   help='rewrite repository in place, with no chance of going back '
+                                        'to older versions of the repository.')
+            subparser.add_argument('--force', dest='force', action='store_true',
+                                   help='Force upgrade')
+            subparser.add_argument('--tam', dest='tam', action='store_true',
+                                   help='Enable manifest authentication (in key and cache) (Borg 1.0.9 and later).')
+            subparser.add_argument('--disable-tam', dest='disable_tam', action='store_true',
+                                   help='Disable manifest authentication (in key and cache).')
+            subparser.add_argument('location', metavar='REPOSITORY', nargs='?', default='',
+                                   type=location_validator(archive=False),
+                                   help='path to the repository to be upgraded')
 
         # borg with-lock
-        with_lock_epilog = process_epilog("""
-        This command runs a user-specified command while the repository lock is held.
-
-        It will first try to acquire the lock (make sure that no other operation is
-        running in the repo), then execute the given command as a subprocess and wait
-        for its termination, release the lock and return the user command's return
-        code as borg's return code.
-
-        .. note::
-
-            If you copy a repository with the lock held, the lock will be present in
-            the copy. Thus, before using borg on the copy from a different host,
-            you need to use "borg break-lock" on the copied repository, because
-            Borg is cautious and does not automatically remove stale locks made by a different host.
-        """)
-        subparser = subparsers.add_parser('with-lock', parents=[common_parser], add_help=False,
-                                          description=self.do_with_lock.__doc__,
-                                          epilog=with_lock_epilog,
-                                          formatter_class=argparse.RawDescriptionHelpFormatter,
-                                          help='run user command with lock held')
-        subparser.set_defaults(func=self.do_with_lock)
-        subparser.add_argument('location', metavar='REPOSITORY',
-                               type=location_validator(archive=False),
-                               help='repository to lock')
-        subparser.add_argument('command', metavar='COMMAND',
-                               help='command to run')
-        subparser.add_argument('args', metavar='ARGS', nargs=argparse.REMAINDER,
-                               help='command arguments')
+        @subparsers.lazy_parser('with-lock', parents=[common_parser], add_help=False,
+                                func=self.do_with_lock,
+                                epilog=process_epilog(WITH_LOCK_EPILOG),
+                                formatter_class=argparse.RawDescriptionHelpFormatter,
+                                help='run user command with lock held')
+        def define_borg_with_lock(subparser):
+            subparser.add_argument('location', metavar='REPOSITORY',
+                                   type=location_validator(archive=False),
+                                   help='repository to lock')
+            subparser.add_argument('command', metavar='COMMAND',
+                                   help='command to run')
+            subparser.add_argument('args', metavar='ARGS', nargs=argparse.REMAINDER,
+                                   help='command arguments')
 
         # borg import-tar
-        import_tar_epilog = process_epilog("""
-        This command creates a backup archive from a tarball.
-
-        When giving '-' as path, Borg will read a tar stream from standard input.
-
-        By default (--tar-filter=auto) Borg will detect whether the file is compressed
-        based on its file extension and pipe the file through an appropriate filter:
-
-        - .tar.gz or .tgz: gzip -d
-        - .tar.bz2 or .tbz: bzip2 -d
-        - .tar.xz or .txz: xz -d
-        - .tar.zstd: zstd -d
-        - .tar.lz4: lz4 -d
-
-        Alternatively, a --tar-filter program may be explicitly specified. It should
-        read compressed data from stdin and output an uncompressed tar stream on
-        stdout.
-
-        Most documentation of borg create applies. Note that this command does not
-        support excluding files.
-
-        import-tar is a lossy conversion:
-        BSD flags, ACLs, extended attributes (xattrs), atime and ctime are not exported.
-        Timestamp resolution is limited to whole seconds, not the nanosecond resolution
-        otherwise supported by Borg.
-
-        A ``--sparse`` option (as found in borg create) is not supported.
-
-        import-tar reads POSIX.1-1988 (ustar), POSIX.1-2001 (pax), GNU tar, UNIX V7 tar
-        and SunOS tar with extended attributes.
-        """)
-        subparser = subparsers.add_parser('import-tar', parents=[common_parser], add_help=False,
-                                          description=self.do_import_tar.__doc__,
-                                          epilog=import_tar_epilog,
-                                          formatter_class=argparse.RawDescriptionHelpFormatter,
-                                          help=self.do_import_tar.__doc__)
-        subparser.set_defaults(func=self.do_import_tar)
-        subparser.add_argument('--tar-filter', dest='tar_filter', default='auto', action=Highlander,
-                               help='filter program to pipe data through')
-        subparser.add_argument('-s', '--stats', dest='stats',
-                               action='store_true', default=False,
-                               help='print statistics for the created archive')
-        subparser.add_argument('--list', dest='output_list',
-                               action='store_true', default=False,
-                               help='output verbose list of items (files, dirs, ...)')
-        subparser.add_argument('--filter', dest='output_filter', metavar='STATUSCHARS', action=Highlander,
-                               help='only display items with the given status characters')
-        subparser.add_argument('--json', action='store_true',
-                               help='output stats as JSON (implies --stats)')
-
-        archive_group = subparser.add_argument_group('Archive options')
-        archive_group.add_argument('--comment', dest='comment', metavar='COMMENT', default='',
-                                   help='add a comment text to the archive')
-        archive_group.add_argument('--timestamp', dest='timestamp',
-                                   type=timestamp, default=None,
-                                   metavar='TIMESTAMP',
-                                   help='manually specify the archive creation date/time (UTC, yyyy-mm-ddThh:mm:ss format). '
-                                        'alternatively, give a reference file/directory.')
-        archive_group.add_argument('-c', '--checkpoint-interval', dest='checkpoint_interval',
-                                   type=int, default=1800, metavar='SECONDS',
-                                   help='write checkpoint every SECONDS seconds (Default: 1800)')
-        archive_group.add_argument('--chunker-params', dest='chunker_params', action=Highlander,
-                                   type=ChunkerParams, default=CHUNKER_PARAMS,
-                                   metavar='PARAMS',
-                                   help='specify the chunker parameters (ALGO, CHUNK_MIN_EXP, CHUNK_MAX_EXP, '
-                                        'HASH_MASK_BITS, HASH_WINDOW_SIZE). default: %s,%d,%d,%d,%d' % CHUNKER_PARAMS)
-        archive_group.add_argument('-C', '--compression', metavar='COMPRESSION', dest='compression',
-                                   type=CompressionSpec, default=CompressionSpec('lz4'),
-                                   help='select compression algorithm, see the output of the '
-                                        '"borg help compression" command for details.')
-
-        subparser.add_argument('location', metavar='ARCHIVE',
-                               type=location_validator(archive=True),
-                               help='name of archive to create (must be also a valid directory name)')
-        subparser.add_argument('tarfile', metavar='TARFILE',
-                               help='input tar file. "-" to read from stdin instead.')
+        @subparsers.lazy_parser('import-tar', parents=[common_parser], add_help=False,
+                                func=self.do_import_tar,
+                                epilog=process_epilog(IMPORT_TAR_EPILOG),
+                                formatter_class=argparse.RawDescriptionHelpFormatter,
+                                help=self.do_import_tar.__doc__)
+        def define_borg_import_tar(subparser):
+            subparser.add_argument('--tar-filter', dest='tar_filter', default='auto', action=Highlander,
+                                   help='filter program to pipe data through')
+            subparser.add_argument('-s', '--stats', dest='stats',
+                                   action='store_true', default=False,
+                                   help='print statistics for the created archive')
+            subparser.add_argument('--list', dest='output_list',
+                                   action='store_true', default=False,
+                                   help='output verbose list of items (files, dirs, ...)')
+            subparser.add_argument('--filter', dest='output_filter', metavar='STATUSCHARS', action=Highlander,
+                                   help='only display items with the given status characters')
+            subparser.add_argument('--json', action='store_true',
+                                   help='output stats as JSON (implies --stats)')
+
+            archive_group = subparser.add_argument_group('Archive options')
+            archive_group.add_argument('--comment', dest='comment', metavar='COMMENT', default='',
+                                       help='add a comment text to the archive')
+            archive_group.add_argument('--timestamp', dest='timestamp',
+                                       type=timestamp, default=None,
+                                       metavar='TIMESTAMP',
+                                       help='manually specify the archive creation date/time (UTC, yyyy-mm-ddThh:mm:ss format). '
+                                            'alternatively, give a reference file/directory.')
+            archive_group.add_argument('-c', '--checkpoint-interval', dest='checkpoint_interval',
+                                       type=int, default=1800, metavar='SECONDS',
+                                       help='write checkpoint every SECONDS seconds (Default: 1800)')
+            archive_group.add_argument('--chunker-params', dest='chunker_params', action=Highlander,
+                                       type=ChunkerParams, default=CHUNKER_PARAMS,
+                                       metavar='PARAMS',
+                                       help='specify the chunker parameters (ALGO, CHUNK_MIN_EXP, CHUNK_MAX_EXP, '
+                                            'HASH_MASK_BITS, HASH_WINDOW_SIZE). default: %s,%d,%d,%d,%d' % CHUNKER_PARAMS)
+            archive_group.add_argument('-C', '--compression', metavar='COMPRESSION', dest='compression',
+                                       type=CompressionSpec, default=CompressionSpec('lz4'),
+                                       help='select compression algorithm, see the output of the '
+                                            '"borg help compression" command for details.')
+
+            subparser.add_argument('location', metavar='ARCHIVE',
+                                   type=location_validator(archive=True),
+                                   help='name of archive to create (must be also a valid directory name)')
+            subparser.add_argument('tarfile', metavar='TARFILE',
+                                   help='input tar file. "-" to read from stdin instead.')
         return parser
 
     def get_args(self, argv, cmd):
@@ -5090,6 +5234,8 @@ def prerun_checks(self, logger, is_serve):
             # this is the borg *client*, we need to check the python:
             check_python()
         check_extension_modules()
+        # Import only when needed - the selftest pulls in parts of the testsuite
+        from .selftest import selftest
         selftest(logger)
 
     def _setup_implied_logging(self, args):
@@ -5175,8 +5321,11 @@ def run(self, args):
 def sig_info_handler(sig_no, stack):  # pragma: no cover
     """search the stack for infos about the currently processed file and print them"""
     with signal_handler(sig_no, signal.SIG_IGN):
-        for frame in inspect.getouterframes(stack):
-            func, loc = frame[3], frame[0].f_locals
+        # walk the frame chain directly, inspect.getouterframes would also read the source code lines
+        frame = stack
+        while frame is not None:
+            func, loc = frame.f_code.co_name, frame.f_locals
+            frame = frame.f_back
             if func in ('process_file', '_rec_walk', ):  # create op
                 path = loc['path']
                 try:
@@ -11,7 +11,7 @@
 from binascii import hexlify
 from collections import Counter, OrderedDict
 from datetime import datetime, timezone
-from functools import partial
+from functools import partial, lru_cache
 from string import Formatter
 
 from ..logger import create_logger
@@ -503,7 +503,9 @@ def omit_archive(self):
         return loc
 
 
+@lru_cache(maxsize=None)
 def location_validator(archive=None, proto=None):
+    # the validators are stateless, so all arguments with the same parameters share one.
     def validator(text):
         try:
             loc = Location(text)
@@ -522,6 +524,7 @@ def validator(text):
     return validator
 
 
+@lru_cache(maxsize=None)
 def archivename_validator():
     def validator(text):
         text = replace_placeholders(text)
@@ -301,6 +301,11 @@ def prepare_subprocess_env(system, env=None):
     return env
 
 
+# buffer size of our end of the pipe to / from a filter process. tarfile reads and writes in small
+# records (10kiB), a bigger buffer saves most of the read / write syscalls on the pipe.
+FILTER_PIPE_BUFSIZE = 1024 * 1024
+
+
 @contextlib.contextmanager
 def create_filter_process(cmd, stream, stream_close, inbound=True):
     if cmd:
@@ -315,10 +320,10 @@ def create_filter_process(cmd, stream, stream_close, inbound=True):
         # for us to do something while we block on the process for something different.
         if inbound:
             proc = popen_with_error_handling(cmd, stdout=subprocess.PIPE, stdin=filter_stream,
-                                             log_prefix='filter-process: ', env=env)
+                                             log_prefix='filter-process: ', env=env, bufsize=FILTER_PIPE_BUFSIZE)
         else:
             proc = popen_with_error_handling(cmd, stdin=subprocess.PIPE, stdout=filter_stream,
-                                             log_prefix='filter-process: ', env=env)
+                                             log_prefix='filter-process: ', env=env, bufsize=FILTER_PIPE_BUFSIZE)
         if not proc:
             raise Error(f'filter {cmd}: process creation failed')
         stream = proc.stdout if inbound else proc.stdin
@@ -111,6 +111,13 @@ def _add(self, pattern, cmd):
         if isinstance(pattern, PathFullPattern):
             key = pattern.pattern  # full, normalized path
             self._path_full_patterns[key] = cmd
+        elif isinstance(pattern, (PathPrefixPattern, FnmatchPattern, ShellPattern)):
+            # consecutive prefix patterns (e.g. the paths given to borg extract) and consecutive
+            # glob patterns are grouped, so a path is matched against all of them at once.
+            group_class = PathPrefixPatterns if isinstance(pattern, PathPrefixPattern) else GlobPatterns
+            if not self._items or type(self._items[-1][0]) is not group_class or self._items[-1][0].is_full():
+                self._items.append((group_class(), None))
+            self._items[-1][0].add(pattern, cmd)
         else:
             self._items.append((pattern, cmd))
 
@@ -159,9 +166,15 @@ def match(self, path):
 
         # this is the slow way, if we have many patterns in self._items:
         for (pattern, cmd) in self._items:
-            if pattern.match(path, normalize=False):
-                self.recurse_dir = pattern.recurse_dir
-                return self.is_include_cmd[cmd]
+            if cmd is None:
+                # a group of PathPrefixPatterns or GlobPatterns, see _add()
+                pattern, cmd = pattern.match(path)
+                if pattern is None:
+                    continue
+            elif not pattern.match(path, normalize=False):
+                continue
+            self.recurse_dir = pattern.recurse_dir
+            return self.is_include_cmd[cmd]
 
         # by default we will recurse if there is no match
         self.recurse_dir = self.recurse_dir_default
@@ -247,6 +260,42 @@ def _match(self, path):
         return (path + os.path.sep).startswith(self.pattern)
 
 
+class PathPrefixPatterns:
+    """Consecutive PathPrefixPatterns, matched by looking up the prefixes of a path
+    instead of trying each pattern in turn.
+    """
+    def __init__(self):
+        self._prefixes = {}  # normalized pattern -> (position, pattern, cmd)
+
+    def is_full(self):
+        # looking up the prefixes of a path does not get slower with more patterns
+        return False
+
+    def add(self, pattern, cmd):
+        # like for a linear scan, the first pattern added for a prefix wins
+        self._prefixes.setdefault(pattern.pattern, (len(self._prefixes), pattern, cmd))
+
+    def match(self, path):
+        """Return (pattern, cmd) of the first added pattern matching *path* or (None, None).
+
+        *path* must already be normalized, see PatternMatcher.match().
+        """
+        sep = os.path.sep
+        path += sep
+        found = self._prefixes.get('')
+        end = path.find(sep)
+        while end != -1:
+            entry = self._prefixes.get(path[:end + 1])
+            if entry is not None and (found is None or entry[0] < found[0]):
+                found = entry
+            end = path.find(sep, end + 1)
+        if found is None:
+            return None, None
+        _, pattern, cmd = found
+        pattern.match_count += 1
+        return pattern, cmd
+
+
 class FnmatchPattern(PatternBase):
     """Shell glob patterns to exclude.  A trailing slash means to
     exclude the contents of a directory, but not the directory itself.
@@ -290,6 +339,56 @@ def _match(self, path):
         return (self.regex.match(path + os.path.sep) is not None)
 
 
+class GlobPatterns:
+    """Consecutive FnmatchPatterns and ShellPatterns, matched using a single regular expression
+    made of the alternation of their regular expressions.
+    """
+    # matching a regex with many alternatives gets slower than trying the patterns one by one,
+    # so a group only takes this many patterns.
+    MAX_PATTERNS = 64
+
+    def __init__(self):
+        self._entries = []  # (pattern, cmd)
+        self._regex = None
+        self._groups = None  # regex group index -> (pattern, cmd)
+
+    def is_full(self):
+        return len(self._entries) >= self.MAX_PATTERNS
+
+    def add(self, pattern, cmd):
+        self._entries.append((pattern, cmd))
+        self._regex = None
+
+    def _compile(self):
+        alternatives = []
+        self._groups = {}
+        index = 1
+        for pattern, cmd in self._entries:
+            regex = pattern.regex.pattern
+            if regex.startswith('(?ms)'):
+                # global flags are only allowed at the start, the combined regex is compiled with them
+                regex = regex[5:]
+            alternatives.append('(%s)' % regex)
+            self._groups[index] = (pattern, cmd)
+            index += 1 + pattern.regex.groups
+        self._regex = re.compile('|'.join(alternatives), re.M | re.S)
+
+    def match(self, path):
+        """Return (pattern, cmd) of the first added pattern matching *path* or (None, None).
+
+        *path* must already be normalized, see PatternMatcher.match().
+        """
+        if self._regex is None:
+            self._compile()
+        m = self._regex.match(path + os.path.sep)
+        if m is None:
+            return None, None
+        # the group of the matching alternative encloses all other groups in it, so it is closed last
+        pattern, cmd = self._groups[m.lastindex]
+        pattern.match_count += 1
+        return pattern, cmd
+
+
 class RegexPattern(PatternBase):
     """Regular expression to exclude.
     """
@@ -317,6 +416,10 @@ def _match(self, path):
 
 _PATTERN_CLASS_BY_PREFIX = {i.PREFIX: i for i in _PATTERN_CLASSES}
 
+# maps the full "xx:" style selector to the pattern class, so a single dict lookup
+# on pattern[:3] resolves all known styles.
+_PATTERN_CLASS_BY_SELECTOR = {i.PREFIX + ':': i for i in _PATTERN_CLASSES}
+
 CmdTuple = namedtuple('CmdTuple', 'val cmd')
 
 
@@ -346,9 +449,12 @@ def parse_pattern(pattern, fallback=FnmatchPattern, recurse_dir=True):
     """Read pattern from string and return an instance of the appropriate implementation class.
 
     """
-    if len(pattern) > 2 and pattern[2] == ":" and pattern[:2].isalnum():
-        (style, pattern) = (pattern[:2], pattern[3:])
-        cls = get_pattern_class(style)
+    cls = _PATTERN_CLASS_BY_SELECTOR.get(pattern[:3])
+    if cls is not None:
+        pattern = pattern[3:]
+    elif len(pattern) > 2 and pattern[2] == ":" and pattern[:2].isalnum():
+        # looks like a style selector, but is not a known one
+        cls = get_pattern_class(pattern[:2])
     else:
         cls = fallback
     return cls(pattern, recurse_dir)
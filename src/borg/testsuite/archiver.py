@@ -14,6 +14,7 @@
 import subprocess
 import sys
 import tempfile
+import textwrap
 import time
 import unittest
 from binascii import unhexlify, b2a_base64
@@ -31,7 +32,7 @@
 import borg.helpers.errors
 from .. import xattr, helpers, platform
 from ..archive import Archive, ChunkBuffer
-from ..archiver import Archiver, parse_storage_quota, PURE_PYTHON_MSGPACK_WARNING
+from ..archiver import Archiver, LazySubParsersAction, parse_storage_quota, process_epilog, PURE_PYTHON_MSGPACK_WARNING
 from ..cache import Cache, LocalCache
 from ..chunker import has_seek_hole
 from ..constants import *  # NOQA
@@ -4565,6 +4566,80 @@ def test_parse_storage_quota():
         parse_storage_quota('5M')
 
 
+def test_lazy_subparsers():
+    archiver = Archiver(prog='borg')
+    parser = archiver.build_parser()
+    commands = [action for action in parser._actions if isinstance(action, LazySubParsersAction)][0].choices
+    args = parser.parse_args(['break-lock', '/tmp/repo'])
+    assert args.func == archiver.do_break_lock
+    # only the parser of the given subcommand was built
+    built = [name for name in commands if isinstance(dict.__getitem__(commands, name), argparse.ArgumentParser)]
+    assert built == ['break-lock']
+    assert 'create' in commands
+    assert commands['create'].prog == 'borg create'
+
+
+def test_lazy_subparsers_unknown_command(capsys):
+    parser = Archiver(prog='borg').build_parser()
+    with pytest.raises(SystemExit):
+        parser.parse_args(['no-such-command'])
+    err = capsys.readouterr().err
+    assert "invalid choice: 'no-such-command'" in err
+    assert 'break-lock' in err and 'with-lock' in err
+
+
+def test_lazy_subparsers_help(capsys):
+    archiver = Archiver(prog='borg')
+    args = archiver.parse_args(['help', 'prune'])
+    args.func(args)
+    out = capsys.readouterr().out
+    assert out.startswith('usage: borg prune')
+    assert 'The prune command prunes a repository' in out
+    args = archiver.parse_args(['help', 'no-such-command'])
+    with pytest.raises(SystemExit):
+        args.func(args)
+    assert 'No help available on no-such-command.' in capsys.readouterr().err
+
+
+def test_lazy_subparsers_add_parser():
+    parser = argparse.ArgumentParser(prog='test')
+    subparsers = parser.add_subparsers(action=LazySubParsersAction)
+    built = []
+
+    @subparsers.lazy_parser('lazy', aliases=['alias'], help='lazy command')
+    def define_lazy(subparser):
+        built.append(subparser)
+        subparser.add_argument('--foo')
+
+    eager = subparsers.add_parser('eager')
+    assert isinstance(eager, argparse.ArgumentParser)
+    assert not built
+    assert 'lazy command' in parser.format_help()
+    assert parser.parse_args(['alias', '--foo', 'bar']).foo == 'bar'
+    assert subparsers.choices['lazy'] is subparsers.choices['alias'] is built[0]
+    assert built[0].prog == 'test lazy'
+    with pytest.raises(argparse.ArgumentError):
+        subparsers.lazy_parser('eager')(define_lazy)
+    with pytest.raises(argparse.ArgumentError):
+        subparsers.lazy_parser('other', aliases=['alias'])(define_lazy)
+
+
+def test_common_options_shared():
+    def common_actions(parser):
+        return [action for group in parser._action_groups if group.title == 'Common options'
+                for action in group._group_actions]
+
+    parser = Archiver(prog='borg').build_parser()
+    commands = [action for action in parser._actions if isinstance(action, LazySubParsersAction)][0].choices
+    create_actions = common_actions(commands['create'])
+    assert create_actions
+    # subcommands of the same level share the action objects of the common options
+    for command in 'extract', 'list', 'prune':
+        assert all(a is b for a, b in zip(common_actions(commands[command]), create_actions))
+    # different levels use different actions (they have different dest suffixes)
+    assert not set(map(id, common_actions(parser))) & set(map(id, create_actions))
+
+
 def get_all_parsers():
     """
     Return dict mapping command to parser.
@@ -4598,6 +4673,42 @@ def test_help_formatting(command, parser):
         assert parser.epilog.rst
 
 
+def test_process_epilog():
+    epilog = process_epilog('Some *text*.\n\n.. man NOTES\n\nMore text.')
+    assert '.. man' not in str(epilog)
+    # processed once, then reused whenever the parser gets built again
+    assert process_epilog('Some *text*.\n\n.. man NOTES\n\nMore text.') is epilog
+
+
 @pytest.mark.parametrize('topic, helptext', list(Archiver.helptext.items()))
 def test_help_formatting_helptexts(topic, helptext):
     assert str(rst_to_terminal(helptext))
+
+
+@pytest.mark.parametrize('topic, helptext', list(Archiver.helptext.items()))
+def test_helptexts_dedented_at_source(topic, helptext):
+    # help texts are stored without indentation, so no dedent is needed at runtime
+    assert textwrap.dedent(helptext) == helptext
+
+
+def get_all_raw_epilogs():
+    """
+    Return dict mapping command to its epilog, as given in the source.
+    """
+    # in build_man mode, process_epilog() returns the epilog unchanged
+    borg.doc_mode = 'build_man'
+    try:
+        return {command: parser.epilog for command, parser in get_all_parsers().items() if parser.epilog}
+    finally:
+        del borg.doc_mode
+
+
+@pytest.mark.parametrize('command, epilog', list(get_all_raw_epilogs().items()))
+def test_epilogs_dedented_at_source(command, epilog):
+    # epilogs are stored without indentation, so no dedent is needed at runtime
+    assert textwrap.dedent(epilog) == epilog
+
+
+def test_process_epilog_keeps_indentation(monkeypatch):
+    monkeypatch.setattr(borg, 'doc_mode', 'build_man', raising=False)
+    assert process_epilog('    indented\n  text') == '    indented\n  text'
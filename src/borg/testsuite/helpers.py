@@ -13,7 +13,7 @@
 
 from .. import platform
 from ..constants import MAX_DATA_SIZE
-from ..helpers import Location
+from ..helpers import Location, location_validator
 from ..helpers import Buffer
 from ..helpers import partial_format, format_file_size, parse_file_size, format_timedelta, format_line, PlaceholderError, replace_placeholders
 from ..helpers import make_path_safe, clean_lines
@@ -327,6 +327,16 @@ def test_no_slashes(self, monkeypatch):
             Location('::archive_name_with/slashes/is_invalid')
 
 
+def test_location_validator():
+    validator = location_validator(archive=False)
+    assert validator is location_validator(archive=False)
+    assert validator('/some/repo').path == '/some/repo'
+    with pytest.raises(ArgumentTypeError):
+        validator('/some/repo::archive')
+    with pytest.raises(ArgumentTypeError):
+        location_validator(archive=True)('/some/repo')
+
+
 class FormatTimedeltaTestCase(BaseTestCase):
 
     def test(self):
@@ -7,7 +7,7 @@
 
 from ..patterns import PathFullPattern, PathPrefixPattern, FnmatchPattern, ShellPattern, RegexPattern
 from ..patterns import load_exclude_file, load_pattern_file
-from ..patterns import parse_pattern, PatternMatcher
+from ..patterns import parse_pattern, PatternMatcher, GlobPatterns
 
 
 def check_patterns(files, pattern, expected):
@@ -478,3 +478,65 @@ def test_pattern_matcher():
     assert pm.match("z") == "B"
 
     assert PatternMatcher(fallback="hey!").fallback == "hey!"
+
+
+def test_pattern_matcher_prefix_patterns():
+    pm = PatternMatcher(fallback="none")
+
+    for target in ["A", "B", "C"]:
+        pm.is_include_cmd[target] = target
+
+    prefixes = [PathPrefixPattern(p) for p in ["/home/user", "/home", "/home/user/docs", "/srv"]]
+    pm.add(prefixes[:2], "A")
+    pm.add(prefixes[2:], "B")
+    pm.add([RegexPattern("^home/other")], "C")
+    pm.add([PathPrefixPattern("/")], "A")
+
+    # the first pattern added wins, not the longest prefix
+    assert pm.match("/home/user/docs/x") == "A"
+    assert pm.match("/home/other") == "A"
+    assert pm.match("/srv/www") == "B"
+    assert pm.match("/srv") == "B"
+    assert pm.match("/srvx") == "A"  # "/" matches everything
+    assert [p.match_count for p in prefixes] == [1, 1, 0, 2]
+
+
+def test_pattern_matcher_glob_patterns():
+    pm = PatternMatcher(fallback="none")
+
+    for target in ["A", "B"]:
+        pm.is_include_cmd[target] = target
+
+    globs = [FnmatchPattern("*.tmp"), ShellPattern("home/*/.cache"),
+             FnmatchPattern("home/[ab]*"), ShellPattern("**/*.tmp")]
+    pm.add(globs[:2], "A")
+    pm.add(globs[2:], "B")
+
+    assert pm.match("/home/user/.cache/x.tmp") == "A"
+    assert pm.match("/home/bob/x.tmp") == "A"
+    assert pm.match("/home/bob/x") == "B"
+    assert pm.match("/srv/.cache") == "none"
+    assert [p.match_count for p in globs] == [2, 0, 1, 0]
+
+
+def test_pattern_matcher_glob_patterns_many():
+    pm = PatternMatcher(fallback="none")
+
+    for target in ["A", "B"]:
+        pm.is_include_cmd[target] = target
+
+    count = 2 * GlobPatterns.MAX_PATTERNS + 1
+    globs = [ShellPattern("**/cache%d" % i) for i in range(count)]
+    pm.add(globs[:-1], "A")
+    pm.add(globs[-1:] + [ShellPattern("**/cache0/x")], "B")
+    # the patterns are split into groups of at most MAX_PATTERNS
+    assert len(pm._items) == 3
+
+    assert pm.match("/home/cache0") == "A"
+    assert pm.match("/home/cache%d" % GlobPatterns.MAX_PATTERNS) == "A"
+    assert pm.match("/home/cache%d" % (count - 2)) == "A"
+    assert pm.match("/home/cache%d/x" % (count - 1)) == "B"
+    assert pm.match("/home/cache0/x") == "A"
+    assert pm.match("/home/cachex") == "none"
+    assert globs[0].match_count == 2
+    assert globs[GlobPatterns.MAX_PATTERNS].match_count == 1